@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Compare the NNLS solvers: the NNLS matrix and rhs of the first model are
+# constructed once, then each solver (scipy, cvxopt if installed, the
+# active set solver used for warm starts, and fista for several KKT
+# tolerances) solves the same problem. The chi2 of each solution is compared
+# to scipy's.
+# Then the warm start (weight solver setting warm_start) is timed: models of
+# the same orbit library with other ml values are solved with scipy and with
+# the active set solver starting from the first model's weights. The cold
+# iterations are those of the active set solver starting from zero.
+# The number of BLAS threads used by fista can be set with e.g.
+# OMP_NUM_THREADS.
+# Usage: python benchmark_nnls_solvers.py [config_file]
+
+import os
+import sys
+import time
+import logging
+
+# Set matplotlib backend to 'Agg' (compatible when X11 is not running
+# e.g., on a cluster). Note that the backend can only be set BEFORE
+# matplotlib is used or even submodules are imported!
+import matplotlib
+matplotlib.use('Agg')
+
+import numpy as np
+from scipy import optimize
+import dynamite as dyn
+
+# fista_kkt_tol, fista_chi2_rtol is the default
+FISTA_KKT_TOLERANCES = [1e-7, 1e-9, 1e-11]
+# ml of the warm-started models in units of the first model's ml
+WARM_START_ML_FACTORS = [0.5, 0.8, 0.95, 1.05, 1.25, 2.]
+
+def min_time(solve, n_repeat):
+    t_solve = []
+    for i in range(n_repeat):
+        t = time.perf_counter()
+        result = solve()
+        t_solve.append(time.perf_counter() - t)
+    return result, min(t_solve)
+
+def run_nnls_benchmark(fname='user_test_config.yaml', n_repeat=3):
+
+    logging.info(f'Using DYNAMITE version: {dyn.__version__}')
+    logging.info(f'Located at: {dyn.__path__}')
+
+    c = dyn.config_reader.Configuration(fname, reset_logging=False)
+    parset = c.parspace.get_parset()
+    model = dyn.model.Model(config=c, parset=parset)
+    model.setup_directories()
+    orblib = model.get_orblib()  # does nothing if the orblib exists
+    orblib.read_losvd_histograms()
+    weight_solver = dyn.weight_solvers.NNLS(config=c,
+                                            directory_with_ml=model.directory,
+                                            nnls_solver='scipy')
+    A, b = weight_solver.construct_nnls_matrix_and_rhs(orblib)
+
+    solvers = [('scipy', lambda: optimize.nnls(A, b)[0])]
+    try:
+        import cvxopt  # noqa: F401
+        solvers.append(('cvxopt',
+                        lambda: dyn.weight_solvers.CvxoptNonNegSolver(
+                            P=np.dot(A.T, A), q=-np.dot(A.T, b)).beta))
+    except ImportError:
+        logging.warning('cvxopt not installed, skipping it.')
+    solvers.append(('activeset',
+                    lambda: dyn.weight_solvers.ActiveSetNonNegSolver(A,
+                                                                     b).beta))
+    for kkt_tol in FISTA_KKT_TOLERANCES:
+        solvers.append((f'fista {kkt_tol:.0e}',
+                        lambda kkt_tol=kkt_tol:
+                        dyn.weight_solvers.FistaNonNegSolver(
+                            A, b, kkt_tol=kkt_tol).beta))
+
+    results = []
+    for name, solve in solvers:
+        weights, t_solve = min_time(solve, n_repeat)
+        chi2 = np.sum((np.dot(A, weights) - b)**2)
+        results.append((name, chi2, np.count_nonzero(weights > 0), t_solve))
+    chi2_ref = results[0][1]
+
+    # we want to print to the console regardless of the logging level
+    print(f'NNLS problem of {model.directory}: {A.shape[0]} constraints, '
+          f'{A.shape[1]} orbits.')
+    print(f'{"solver":>12} {"chi2":>16} {"rel. diff":>10} {"n_pos":>6} '
+          f'{"time [s]":>9}')
+    for name, chi2, n_pos, t_solve in results:
+        print(f'{name:>12} {chi2:16.6f} {(chi2 - chi2_ref) / chi2_ref:10.1e} '
+              f'{n_pos:6} {t_solve:9.3f}')
+
+    x0 = optimize.nnls(A, b)[0]
+    print(f'Warm starts from the weights of ml={parset["ml"]}:')
+    print(f'{"ml":>8} {"rel. diff":>10} {"n_pos":>6} {"it. cold":>9} '
+          f'{"it. warm":>9} {"scipy [s]":>10} {"warm [s]":>9}')
+    for ml_factor in WARM_START_ML_FACTORS:
+        orblib_ml = dyn.orblib.LegacyOrbitLibrary(
+            config=c,
+            mod_dir=model.directory_noml,
+            parset=parset)
+        orblib_ml.velocity_scaling_factor = np.sqrt(ml_factor)
+        orblib_ml.read_losvd_histograms()
+        A_ml, b_ml = weight_solver.construct_nnls_matrix_and_rhs(orblib_ml)
+        weights, t_scipy = min_time(lambda: optimize.nnls(A_ml, b_ml)[0],
+                                    n_repeat)
+        warm, t_warm = min_time(
+            lambda: dyn.weight_solvers.ActiveSetNonNegSolver(A_ml, b_ml,
+                                                             x0=x0),
+            n_repeat)
+        cold = dyn.weight_solvers.ActiveSetNonNegSolver(A_ml, b_ml)
+        if not warm.success:
+            raise AssertionError('Warm-started NNLS did not converge.')
+        chi2 = np.sum((np.dot(A_ml, weights) - b_ml)**2)
+        chi2_warm = np.sum((np.dot(A_ml, warm.beta) - b_ml)**2)
+        print(f'{parset["ml"] * ml_factor:8.3f} '
+              f'{(chi2_warm - chi2) / chi2:10.1e} '
+              f'{np.count_nonzero(warm.beta):6} {cold.n_iter:9} '
+              f'{warm.n_iter:9} {t_scipy:10.3f} {t_warm:9.3f}')
+        results.append((f'warm start ml*{ml_factor}', chi2_warm,
+                        np.count_nonzero(warm.beta), t_warm))
+
+    return results
+
+if __name__ == '__main__':
+
+    logging.basicConfig(level=logging.WARNING)
+    if '__file__' in globals():
+        file_dir = os.path.dirname(__file__)
+        if file_dir:
+            os.chdir(file_dir)
+    fname = sys.argv[1] if len(sys.argv) > 1 else 'user_test_config.yaml'
+    run_nnls_benchmark(fname)
+
+# end
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Compare the orbit library compression codecs: for each codec, the orbit
+# library of the first model is re-compressed with the same shell command
+# DYNAMITE uses after orbit integration, then the time to read the LOSVDs
+# and 3D grid masses (without any caches) is measured.
+# Usage: python benchmark_orblib_compression.py [config_file]
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+import subprocess
+import logging
+
+# Set matplotlib backend to 'Agg' (compatible when X11 is not running
+# e.g., on a cluster). Note that the backend can only be set BEFORE
+# matplotlib is used or even submodules are imported!
+import matplotlib
+matplotlib.use('Agg')
+
+import numpy as np
+import dynamite as dyn
+
+# (codec, compression level), None meaning the program's default
+CODECS = [('bz2', None),
+          ('bz2', 1),
+          ('gzip', 1),
+          ('gzip', None),
+          ('lzma', None),
+          ('lzma', 1),
+          ('none', None)]
+
+def run_compression_benchmark(fname='user_test_config.yaml', n_repeat=3):
+
+    logging.info(f'Using DYNAMITE version: {dyn.__version__}')
+    logging.info(f'Located at: {dyn.__path__}')
+
+    c = dyn.config_reader.Configuration(fname, reset_logging=False)
+    parset = c.parspace.get_parset()
+    model = dyn.model.Model(config=c, parset=parset)
+    model.setup_directories()
+    orblib = model.get_orblib()  # does nothing if the orblib exists
+    # measure the files' decoding only
+    c.settings.orblib_settings['cache_losvds'] = False
+    c.settings.orblib_settings['losvd_memory_cache_mb'] = 0
+    dyn.orblib.orblib_cache.clear()
+
+    work_dir = tempfile.mkdtemp(prefix='orblib_benchmark_') + '/'
+    raw_files = []
+    for fileroot in 'orblib', 'orblibbox':
+        for f in '_qgrid', '_losvd_hist', '_pops':
+            f_name = dyn.orblib.find_orblib_file(
+                f'{orblib.mod_dir}datfil/{fileroot}{f}.dat')
+            if f_name is not None:
+                raw_files.append(f'{work_dir}{fileroot}{f}.dat')
+                with dyn.orblib.open_orblib_file(f_name) as f_in, \
+                        open(raw_files[-1], 'wb') as f_out:
+                    shutil.copyfileobj(f_in, f_out)
+    raw_size = sum(os.path.getsize(f) for f in raw_files)
+
+    results = []
+    reference = None
+    for codec, level in CODECS:
+        mod_dir = f'{work_dir}{codec}_{level}/'
+        os.makedirs(mod_dir + 'datfil')
+        c.settings.orblib_settings['compression'] = codec
+        c.settings.orblib_settings['compression_level'] = level
+        orblib_c = dyn.orblib.LegacyOrbitLibrary(config=c,
+                                                 mod_dir=mod_dir,
+                                                 parset=parset)
+        compress, ext = orblib_c._get_compression()
+        t = time.perf_counter()
+        for raw_file in raw_files:
+            out_file = f'{mod_dir}datfil/{os.path.basename(raw_file)}{ext}'
+            subprocess.run(f'{compress} {raw_file} > {out_file}',
+                           shell=True,
+                           check=True)
+        t_write = time.perf_counter() - t
+        disk_size = sum(os.path.getsize(f'{mod_dir}datfil/{f}')
+                        for f in os.listdir(mod_dir + 'datfil'))
+        t_read = []
+        for i in range(n_repeat):
+            t = time.perf_counter()
+            orblib_c.read_losvd_histograms()
+            t_read.append(time.perf_counter() - t)
+        losvds = orblib_c.losvd_histograms[0].y
+        if hasattr(losvds, 'toarray'):  # sparse_losvds: True
+            losvds = losvds.toarray()
+        if reference is None:
+            reference = losvds
+        elif not np.array_equal(losvds, reference):
+            raise ValueError(f'Codec {codec} changed the orbit library.')
+        results.append((codec, level, disk_size, t_write, min(t_read)))
+        shutil.rmtree(mod_dir)
+    shutil.rmtree(work_dir)
+
+    # we want to print to the console regardless of the logging level
+    print(f'Orbit library {orblib.mod_dir}: '
+          f'{raw_size / 2**20:.1f} MB uncompressed.')
+    print(f'{"codec":>6} {"level":>7} {"disk [MB]":>10} {"ratio":>6} '
+          f'{"compress [s]":>13} {"read [s]":>9} {"read [MB/s]":>12}')
+    for codec, level, disk_size, t_write, t_read in results:
+        print(f'{codec:>6} {str(level):>7} {disk_size / 2**20:10.1f} '
+              f'{raw_size / disk_size:6.2f} {t_write:13.2f} '
+              f'{t_read:9.3f} {raw_size / 2**20 / t_read:12.1f}')
+
+    return results
+
+if __name__ == '__main__':
+
+    logging.basicConfig(level=logging.WARNING)
+    if '__file__' in globals():
+        file_dir = os.path.dirname(__file__)
+        if file_dir:
+            os.chdir(file_dir)
+    fname = sys.argv[1] if len(sys.argv) > 1 else 'user_test_config.yaml'
+    run_compression_benchmark(fname)
+
+# end
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Shared setup of the dev_tests scripts test_losvd_parser.py,
+# test_sparse_losvds.py, test_losvd_memory_cache.py, test_low_fidelity.py and
+# test_nnls_solvers.py: the matplotlib backend, the first model of the
+# parameter space with its orbit library, and the scripts' __main__ block.
+# Tests that need to integrate orbit libraries are skipped with a message if
+# the compiled legacy Fortran programs are missing.
+
+import os
+import sys
+import logging
+import unittest
+
+# Set matplotlib backend to 'Agg' (compatible when X11 is not running
+# e.g., on a cluster). Note that the backend can only be set BEFORE
+# matplotlib is used or even submodules are imported!
+import matplotlib
+matplotlib.use('Agg')
+
+import dynamite as dyn
+
+def check_legacy_programs(c):
+    """Skip the test if the legacy programs are not compiled
+
+    Parameters
+    ----------
+    c : a ``dyn.config_reader.Configuration`` object
+
+    Raises
+    ------
+    unittest.SkipTest
+        If a program needed to integrate orbit libraries is missing in the
+        legacy_settings directory.
+
+    """
+    legacy_directory = c.settings.legacy_settings['directory']
+    if c.system.is_bar_disk_system():
+        programs = ['orbitstart_bar', 'orblib_bar', 'triaxmass_bar',
+                    'triaxmassbin_bar']
+    else:
+        programs = ['orbitstart', 'orblib_new_mirror', 'triaxmass',
+                    'triaxmassbin']
+    missing = [p for p in programs
+               if not os.path.isfile(f'{legacy_directory}/{p}')]
+    if missing:
+        raise unittest.SkipTest(f'legacy program(s) {", ".join(missing)} '
+                                f'not found in {legacy_directory}: compile '
+                                'the legacy Fortran code to integrate the '
+                                'orbit library.')
+
+def get_first_model(fname):
+    """Set up the first model of the parameter space and its orbit library
+
+    The orbit library is integrated unless it exists already.
+
+    Parameters
+    ----------
+    fname : str
+        The configuration file.
+
+    Raises
+    ------
+    unittest.SkipTest
+        If the orbit library does not exist and cannot be integrated
+        because the legacy programs are not compiled.
+
+    Returns
+    -------
+    tuple
+        The ``Configuration``, the parameter set, the ``Model`` and its
+        ``LegacyOrbitLibrary`` object.
+
+    """
+    c = dyn.config_reader.Configuration(fname, reset_logging=False)
+    parset = c.parspace.get_parset()
+    model = dyn.model.Model(config=c, parset=parset)
+    model.setup_directories()
+    if dyn.orblib.get_orblib_layout(model.directory_noml + 'datfil/') is None:
+        check_legacy_programs(c)
+    orblib = model.get_orblib()  # does nothing if the orblib exists
+    return c, parset, model, orblib
+
+def main(run_test):
+    """Run a dev test script
+
+    Changes to the dev_tests directory and calls run_test with the
+    configuration file given on the command line (default:
+    user_test_config.yaml). A skipped test is reported, not failed.
+
+    Parameters
+    ----------
+    run_test : callable
+        The test function, called with the configuration file name.
+
+    """
+    logging.basicConfig(level=logging.WARNING)
+    file_dir = os.path.dirname(__file__)
+    if file_dir:
+        os.chdir(file_dir)
+    fname = sys.argv[1] if len(sys.argv) > 1 else 'user_test_config.yaml'
+    logging.info(f'Using DYNAMITE version: {dyn.__version__}')
+    logging.info(f'Located at: {dyn.__path__}')
+    try:
+        run_test(fname)
+    except unittest.SkipTest as e:
+        # we want to print to the console regardless of the logging level
+        print(f'SKIPPED {run_test.__name__}: {e}')
+
+# end
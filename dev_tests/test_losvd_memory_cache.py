@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Check the process-local orbit library memory cache (orblib setting
+# losvd_memory_cache_mb) for the first model's orbit library: data read from
+# the cache must be identical to data read from the orbit library files,
+# also after a weight solver has changed the LOSVDs of an earlier read (copy
+# on write), and cache hits must share the LOSVD values instead of copying
+# them. Dense and sparse LOSVDs are tested.
+# Usage: python test_losvd_memory_cache.py [config_file]
+
+# the test setup sets the matplotlib backend, import it before dynamite
+from dev_test_setup import get_first_model, main
+import numpy as np
+import dynamite as dyn
+
+def get_values(histogram):
+    if histogram.sparse is not None:
+        return histogram.sparse.values
+    return histogram.y
+
+def read_orblib(c, model, parset):
+    orblib = dyn.orblib.LegacyOrbitLibrary(config=c,
+                                           mod_dir=model.directory_noml,
+                                           parset=parset)
+    orblib.read_losvd_histograms()
+    return orblib
+
+def compare(name, reference, orblib):
+    for i, (ref, hist) in enumerate(zip(reference.losvd_histograms,
+                                        orblib.losvd_histograms)):
+        if (ref.sparse is None) != (hist.sparse is None) \
+                or not np.array_equal(ref.y, hist.y) \
+                or not np.array_equal(ref.xedg, hist.xedg):
+            raise AssertionError(f'{name}: LOSVDs of kinematic set {i} '
+                                 'differ.')
+    if not np.array_equal(reference.intrinsic_masses,
+                          orblib.intrinsic_masses) \
+            or not all(np.array_equal(p_ref, p) for p_ref, p in
+                       zip(reference.projected_masses,
+                           orblib.projected_masses)):
+        raise AssertionError(f'{name}: masses differ.')
+    # we want to print to the console regardless of the logging level
+    print(f'{name}: identical to the orbit library files.')
+
+def run_losvd_memory_cache_test(fname='user_test_config.yaml'):
+
+    c, parset, model, _ = get_first_model(fname)
+    settings = c.settings.orblib_settings
+    settings['cache_losvds'] = False  # read the orbit library files
+    for sparse in False, True:
+        print(f'sparse_losvds: {sparse}')
+        settings['sparse_losvds'] = sparse
+        settings['losvd_memory_cache_mb'] = 0
+        reference = read_orblib(c, model, parset)
+        settings['losvd_memory_cache_mb'] = 10000
+        dyn.orblib.orblib_cache.clear()
+        first = read_orblib(c, model, parset)  # decodes, fills the cache
+        if dyn.orblib.orblib_cache.n_bytes == 0:
+            raise AssertionError('The orbit library was not cached.')
+        compare('Read from files', reference, first)
+        # the weight solver changes the LOSVDs in place
+        weight_solver = dyn.weight_solvers.NNLS(
+            config=c,
+            directory_with_ml=model.directory,
+            nnls_solver='scipy')
+        A_first, b_first = weight_solver.construct_nnls_matrix_and_rhs(first)
+        hit = read_orblib(c, model, parset)
+        compare('Cache hit after solving', reference, hit)
+        again = read_orblib(c, model, parset)
+        for hist, hist_again in zip(hit.losvd_histograms,
+                                    again.losvd_histograms):
+            if not np.shares_memory(get_values(hist),
+                                    get_values(hist_again)):
+                raise AssertionError('Cache hits copy the LOSVDs.')
+        print('Cache hits share the LOSVD values.')
+        A_hit, b_hit = weight_solver.construct_nnls_matrix_and_rhs(hit)
+        if not (np.array_equal(A_first, A_hit)
+                and np.array_equal(b_first, b_hit)):
+            raise AssertionError('The NNLS problems differ.')
+        print('NNLS problems from files and from the cache are identical.')
+        compare('Cache hit after solving twice', reference, again)
+    dyn.orblib.orblib_cache.clear()
+
+    return 0
+
+if __name__ == '__main__':
+    main(run_losvd_memory_cache_test)
+
+# end
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Check the vectorized losvd_hist parser (LegacyOrbitLibrary.
+# _read_losvd_hist_file) bit for bit against the record-by-record loop over
+# scipy's FortranFile it replaced: (i) for the losvd_hist files of the first
+# model's orbit library and (ii) for a synthetic file whose histogram values
+# contain the word pattern of (ivmin, ivmax) records, which the parser must
+# skip as it walks from record to record.
+# Usage: python test_losvd_parser.py [config_file]
+
+import os
+import shutil
+import tempfile
+
+# the test setup sets the matplotlib backend, import it before dynamite
+from dev_test_setup import get_first_model, main
+import numpy as np
+from scipy.io import FortranFile
+import dynamite as dyn
+
+def read_losvd_hist_loop(file_name, norb, hist_bins, n_apertures):
+    # the loop of DYNAMITE 4.3 and earlier, reading an uncompressed losvd_hist file
+    orblib_in = FortranFile(file_name, 'r')
+    _ = orblib_in.read_record(np.int32, np.int32, float)
+    kin_idx_per_ap = np.concatenate([np.zeros(n_apertures[i], dtype=int) + i
+                                     for i in range(len(n_apertures))])
+    idx_ap_reset = np.concatenate(([0], np.cumsum(n_apertures)[:-1]))
+    velhist0 = [np.zeros((norb, nv, na))
+                for (nv, na) in zip(hist_bins, n_apertures)]
+    for j in range(norb):
+        for i_ap, kin_idx in enumerate(kin_idx_per_ap):
+            i_ap0 = i_ap - idx_ap_reset[kin_idx]
+            ivmin, ivmax = orblib_in.read_ints(np.int32)
+            if ivmin <= ivmax:
+                nv0 = int((hist_bins[kin_idx]-1)/2)
+                tmp = orblib_in.read_reals(float)
+                velhist0[kin_idx][j, ivmin+nv0:ivmax+nv0+1, i_ap0] = tmp
+    orblib_in.close()
+    return velhist0
+
+def write_synthetic_losvd_hist(file_name, norb, hist_bins, n_apertures, rng):
+    # random histograms, some of them with values whose words look like
+    # (ivmin, ivmax) records: 8, x, y, 8, including the payload records of
+    # histograms with a single value
+    f = FortranFile(file_name, 'w')
+    f.write_record(np.array([sum(n_apertures), (hist_bins[0]-1)//2],
+                            dtype=np.int32),
+                   np.array([1.], dtype=float))
+    n_false = 0
+    for j in range(norb):
+        for nv, na in zip(hist_bins, n_apertures):
+            for i_ap in range(na):
+                nv0 = (nv - 1) // 2
+                ivmin = rng.integers(-nv0, nv0 + 1)
+                ivmax = ivmin + rng.integers(-1, 6)
+                ivmax = min(ivmax, nv0)
+                f.write_record(np.array([ivmin, ivmax], dtype=np.int32))
+                if ivmin <= ivmax:
+                    values = rng.random(ivmax - ivmin + 1)
+                    if len(values) >= 2 and rng.random() < 0.3:
+                        words = values.view(np.uint32)
+                        words[0] = 8
+                        words[1:3] = rng.integers(-3 * nv0, 3 * nv0, 2)
+                        words[3] = 8
+                        n_false += 1
+                    elif len(values) == 1 and rng.random() < 0.1:
+                        # the payload record looks like a record (8, x, x, 8)
+                        # of a single value histogram
+                        words = values.view(np.uint32)
+                        words[1] = words[0]
+                        n_false += 1
+                    f.write_record(values)
+    f.write_record(np.array([0], dtype=np.int32))  # trailing record
+    f.close()
+    return n_false
+
+def compare(name, reference, orblib, file_name, norb, hist_bins, n_apertures):
+    for sparse in False, True:
+        velhist0 = orblib._read_losvd_hist_file(file_name,
+                                                norb,
+                                                hist_bins,
+                                                n_apertures,
+                                                sparse=sparse)
+        for i, (ref, velhist) in enumerate(zip(reference, velhist0)):
+            if sparse:
+                velhist = velhist.toarray()
+            if velhist.shape != ref.shape \
+                    or ref.tobytes() != velhist.tobytes():
+                raise AssertionError(f'{name}, kinematic set {i}, '
+                                     f'sparse={sparse}: the vectorized '
+                                     'parser differs from the loop.')
+    # we want to print to the console regardless of the logging level
+    print(f'{name}: identical to the loop.')
+
+def run_losvd_parser_test(fname='user_test_config.yaml'):
+
+    c, parset, model, orblib = get_first_model(fname)
+    stars = c.system.get_unique_triaxial_visible_component()
+    hist_bins = [k.hist_bins for k in stars.kinematic_data]
+    n_apertures = [k.n_spatial_bins for k in stars.kinematic_data]
+    s = c.settings.orblib_settings
+    norb = s['nE'] * s['nI2'] * s['nI3']
+
+    work_dir = tempfile.mkdtemp(prefix='losvd_parser_test_') + '/'
+    for fileroot in 'orblib', 'orblibbox':
+        file_name = f'datfil/{fileroot}_losvd_hist.dat'
+        raw_file = f'{work_dir}{fileroot}_losvd_hist.dat'
+        with dyn.orblib.open_orblib_file(
+                orblib._find_orblib_file(file_name)) as f_in, \
+                open(raw_file, 'wb') as f_out:
+            shutil.copyfileobj(f_in, f_out)
+        reference = read_losvd_hist_loop(raw_file, norb, hist_bins,
+                                         n_apertures)
+        compare(f'{orblib.mod_dir}{file_name}', reference, orblib,
+                file_name, norb, hist_bins, n_apertures)
+
+    # a synthetic orbit library in work_dir
+    os.makedirs(work_dir + 'datfil')
+    orblib_s = dyn.orblib.LegacyOrbitLibrary(config=c,
+                                             mod_dir=work_dir,
+                                             parset=parset)
+    rng = np.random.default_rng(42)
+    norb_s, hist_bins_s, n_apertures_s = 50, [11, 7], [5, 3]
+    file_name = 'datfil/synthetic_losvd_hist.dat'
+    n_false = write_synthetic_losvd_hist(f'{work_dir}{file_name}.raw',
+                                         norb_s,
+                                         hist_bins_s,
+                                         n_apertures_s,
+                                         rng)
+    reference = read_losvd_hist_loop(f'{work_dir}{file_name}.raw',
+                                     norb_s,
+                                     hist_bins_s,
+                                     n_apertures_s)
+    compare(f'Synthetic file with {n_false} record-like histograms',
+            reference, orblib_s, file_name, norb_s, hist_bins_s,
+            n_apertures_s)
+    shutil.rmtree(work_dir)
+
+    return 0
+
+if __name__ == '__main__':
+    main(run_losvd_parser_test)
+
+# end
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Check the low-fidelity screening of new orbit libraries (orblib setting
+# low_fidelity): run the models of a config file with low-fidelity screening,
+# restart from the all_models table and run one more iteration. Screened
+# models must survive the restart with their low-fidelity models, and an
+# orbit library must be promoted to full resolution if and only if its
+# low-fidelity chi2 lies within the threshold of the best low-fidelity chi2
+# of all models screened so far, including those of the first run. Screened
+# models must not be selected by chi2, e.g. as the best models. Finally, if
+# all low-fidelity models fail, all orbit libraries must be promoted.
+# Note that the output directory of the config file will be reset.
+# Usage: python test_low_fidelity.py [config_file]
+
+import os
+
+# the test setup sets the matplotlib backend, import it before dynamite
+from dev_test_setup import check_legacy_programs, main
+import numpy as np
+import dynamite as dyn
+
+def get_config(fname, threshold, reset_existing_output):
+    c = dyn.config_reader.Configuration(
+        fname,
+        reset_logging=False,
+        reset_existing_output=reset_existing_output)
+    settings = c.settings.orblib_settings
+    settings['low_fidelity'] = {'nE': settings['nE'],
+                                'nI2': 4,
+                                'nI3': settings['nI3'],
+                                'orbital_periods': 20,
+                                'threshold_del_chi2_abs': threshold}
+    c.set_threshold_del_chi2(settings['low_fidelity'])
+    stopping_criteria = c.settings.parameter_space_settings[
+                                                        'stopping_criteria']
+    stopping_criteria['n_max_iter'] = 1
+    stopping_criteria['n_max_mods'] = 1000
+    return c
+
+def check_screening(c, threshold):
+    t = c.all_models.table
+    model_dir = c.settings.io_settings['model_directory']
+    for row in t:
+        orblib_dir = model_dir + row['directory'][:row['directory'][:-1].
+                                                   rindex('/')+1]
+        if not os.path.isdir(orblib_dir + dyn.model.LOW_FIDELITY_DIRECTORY):
+            raise AssertionError(f'Low-fidelity model of {row["directory"]} '
+                                 'missing.')
+        # models of iterations 0 and 1 are screened together
+        earlier = t['which_iter'] <= max(row['which_iter'], 1)
+        best_chi2 = np.nanmin(t['low_fidelity_chi2'][earlier])
+        promoted = row['low_fidelity_chi2'] <= best_chi2 + threshold
+        if row['screened'] == promoted:
+            raise AssertionError(f'Model {row["directory"]}: low-fidelity '
+                                 f'chi2 {row["low_fidelity_chi2"]}, best '
+                                 f'{best_chi2}, but screened is '
+                                 f'{row["screened"]}.')
+        if row['screened'] and (row['orblib_done'] or row['all_done']
+                                or not np.isnan(row['chi2'])):
+            raise AssertionError(f'Screened model {row["directory"]} has '
+                                 'results.')
+        if not row['screened'] and not row['all_done']:
+            raise AssertionError(f'Promoted model {row["directory"]} is not '
+                                 'done.')
+    # screened models must not be used where chi2 values are compared
+    screened = np.flatnonzero(t['screened'])
+    all_models = c.all_models
+    if any(i in screened for i in all_models.get_best_n_models_idx(len(t))) \
+            or any(all_models.get_best_n_models(n=-3)['screened']) \
+            or any(all_models.get_mods_within_chi2_thresh(delta=-1.)
+                   ['screened']):
+        raise AssertionError('Screened models selected by chi2.')
+    # we want to print to the console regardless of the logging level
+    print(f'{len(t)} models, {sum(t["screened"])} screened: ok.')
+
+def fail_low_fidelity_model(self, data_input):
+    return np.nan
+
+def check_all_failed(c):
+    t = c.all_models.table
+    if any(t['screened']) or not all(t['all_done']) \
+            or not all(np.isnan(t['low_fidelity_chi2'])):
+        raise AssertionError('Models not promoted although all '
+                             'low-fidelity models failed.')
+    print(f'All low-fidelity models failed, {len(t)} models promoted: ok.')
+
+def run_low_fidelity_test(fname='user_test_config.yaml', threshold=0.):
+
+    c = get_config(fname, threshold, reset_existing_output=True)
+    check_legacy_programs(c)  # all orbit libraries are integrated
+    dyn.model_iterator.ModelIterator(config=c, plots=False)
+    check_screening(c, threshold)
+    table_before = c.all_models.table.copy()
+
+    # restart: the all_models table is read and updated
+    c = get_config(fname, threshold, reset_existing_output=False)
+    columns = ['directory', 'screened', 'low_fidelity_chi2']
+    if len(c.all_models.table) != len(table_before) \
+            or any(any(c.all_models.table[name] != table_before[name])
+                   for name in columns[:-1]) \
+            or not np.array_equal(c.all_models.table[columns[-1]],
+                                  table_before[columns[-1]],
+                                  equal_nan=True):
+        raise AssertionError('The restart changed the screened models.')
+    print('Screened models unchanged by the restart.')
+    dyn.model_iterator.ModelIterator(config=c, plots=False)
+    check_screening(c, threshold)
+    c.all_models.table[columns + ['which_iter', 'all_done']].pprint(
+                                                    max_lines=-1, max_width=-1)
+
+    # all low-fidelity models fail: nothing to compare with, promote all
+    run_low_fidelity_model = \
+        dyn.model_iterator.ModelInnerIterator.run_low_fidelity_model
+    dyn.model_iterator.ModelInnerIterator.run_low_fidelity_model = \
+        fail_low_fidelity_model
+    try:
+        c = get_config(fname, threshold, reset_existing_output=True)
+        dyn.model_iterator.ModelIterator(config=c, plots=False)
+    finally:
+        dyn.model_iterator.ModelInnerIterator.run_low_fidelity_model = \
+            run_low_fidelity_model
+    check_all_failed(c)
+
+    return 0
+
+if __name__ == '__main__':
+    main(run_low_fidelity_test)
+
+# end
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Check the NNLS solvers against scipy.optimize.nnls: the active set solver
+# used for warm starts (weight solver setting warm_start), started from zero
+# and from the weights of other ml models, for the NNLS problems of the
+# first model's orbit library and for random problems with linearly
+# dependent columns, and the fista solver for the first model's NNLS
+# problem, also with a zero, negative, or doubled total mass. The chi2 of
+# the solutions must agree with scipy's.
+# Usage: python test_nnls_solvers.py [config_file]
+
+# the test setup sets the matplotlib backend, import it before dynamite
+from dev_test_setup import get_first_model, main
+import numpy as np
+from scipy import optimize
+import dynamite as dyn
+
+def compare(name, A, b, weights, rtol):
+    chi2_ref = np.sum((np.dot(A, optimize.nnls(A, b)[0]) - b)**2)
+    chi2 = np.sum((np.dot(A, weights) - b)**2)
+    rel_diff = (chi2 - chi2_ref) / chi2_ref
+    if np.any(weights < 0) or abs(rel_diff) > rtol:
+        raise AssertionError(f'{name}: chi2 {chi2} differs from scipy\'s '
+                             f'{chi2_ref} by {rel_diff:.1e}.')
+    # we want to print to the console regardless of the logging level
+    print(f'{name:>36}: ok, rel. chi2 difference {rel_diff:8.1e}')
+
+def run_active_set(name, A, b, x0=None):
+    solver = dyn.weight_solvers.ActiveSetNonNegSolver(A, b, x0=x0)
+    if not solver.success:
+        raise AssertionError(f'{name}: no convergence in {solver.n_iter} '
+                             'iterations.')
+    return solver.beta
+
+def run_nnls_solver_test(fname='user_test_config.yaml', rtol=1e-9):
+
+    c, parset, model, _ = get_first_model(fname)
+    weight_solver = dyn.weight_solvers.NNLS(config=c,
+                                            directory_with_ml=model.directory,
+                                            nnls_solver='scipy')
+    problems = {}
+    for ml_factor in 1., 0.8, 1.05, 2.:
+        orblib = dyn.orblib.LegacyOrbitLibrary(config=c,
+                                               mod_dir=model.directory_noml,
+                                               parset=parset)
+        orblib.velocity_scaling_factor = np.sqrt(ml_factor)
+        orblib.read_losvd_histograms()
+        problems[ml_factor] = \
+            weight_solver.construct_nnls_matrix_and_rhs(orblib)
+    A, b = problems[1.]
+    compare('active set from zero', A, b, run_active_set('cold', A, b), rtol)
+    x0 = optimize.nnls(A, b)[0]
+    for ml_factor, (A_ml, b_ml) in problems.items():
+        name = f'active set from ml*1 for ml*{ml_factor}'
+        compare(name, A_ml, b_ml, run_active_set(name, A_ml, b_ml, x0), rtol)
+
+    # fista minimizes the same chi2 as scipy, also for other total masses
+    fista = dyn.weight_solvers.FistaNonNegSolver(A, b)
+    if not fista.success:
+        raise AssertionError('fista did not converge.')
+    compare('fista', A, b, fista.beta, rtol)
+    for mass_factor in 0., -1., 2.:
+        b_mass = np.array(b)
+        b_mass[0] *= mass_factor
+        fista = dyn.weight_solvers.FistaNonNegSolver(A, b_mass)
+        compare(f'fista for total mass * {mass_factor}', A, b_mass,
+                fista.beta, rtol)
+
+    # random problems, some columns are linearly dependent
+    rng = np.random.default_rng(42)
+    for i in range(5):
+        m, n = 200, 120
+        A = rng.random((m, n))
+        A[:, 1::10] = A[:, ::10] + A[:, 2::10]
+        A[:, 3::10] = A[:, 4::10]
+        b = rng.random(m) * 2 - 0.5
+        x0 = np.where(rng.random(n) < 0.3, rng.random(n), 0.)
+        name = f'random problem {i}'
+        compare(f'{name} from zero', A, b, run_active_set(name, A, b), rtol)
+        compare(f'{name} from random x0', A, b,
+                run_active_set(name, A, b, x0), rtol)
+    print('The NNLS solvers agree with scipy.')
+
+    return 0
+
+if __name__ == '__main__':
+    main(run_nnls_solver_test)
+
+# end
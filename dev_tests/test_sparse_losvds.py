@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Check the sparse LOSVD storage (orblib setting sparse_losvds) against the
+# dense LOSVDs of the first model's orbit library: the histogram values,
+# their normalisation, mean, sigma, Gauss Hermite coefficients, rebinning,
+# flipping, and orbit selection must agree, and changing the dense copy y of
+# sparse LOSVDs in place must fail.
+# Usage: python test_sparse_losvds.py [config_file]
+
+# the test setup sets the matplotlib backend, import it before dynamite
+from dev_test_setup import get_first_model, main
+import numpy as np
+import dynamite as dyn
+
+def compare(name, dense, sparse, rtol=1e-12):
+    dense, sparse = np.asarray(dense), np.asarray(sparse)
+    if dense.shape != sparse.shape:
+        raise AssertionError(f'{name}: shapes {dense.shape} and '
+                             f'{sparse.shape} differ.')
+    scale = np.nanmax(np.abs(dense)) if dense.size else 0.
+    diff = np.nanmax(np.abs(dense - sparse)) if dense.size else 0.
+    if not np.array_equal(np.isnan(dense), np.isnan(sparse)) \
+            or diff > rtol * scale:
+        raise AssertionError(f'{name}: sparse and dense differ by {diff} '
+                             f'(scale {scale}).')
+    # we want to print to the console regardless of the logging level
+    print(f'{name:>24}: ok, max. abs. difference {diff:.1e}')
+
+def run_sparse_losvd_test(fname='user_test_config.yaml'):
+
+    c, parset, model, _ = get_first_model(fname)
+    # read the orbit library files, not the caches
+    c.settings.orblib_settings['cache_losvds'] = False
+    c.settings.orblib_settings['losvd_memory_cache_mb'] = 0
+    losvds = {}
+    for sparse in False, True:
+        c.settings.orblib_settings['sparse_losvds'] = sparse
+        orblib = dyn.orblib.LegacyOrbitLibrary(config=c,
+                                               mod_dir=model.directory_noml,
+                                               parset=parset)
+        orblib.read_losvd_histograms()
+        losvds[sparse] = orblib.losvd_histograms
+
+    stars = c.system.get_unique_triaxial_visible_component()
+    rng = np.random.default_rng(42)
+    for kins, dense, sparse in zip(stars.kinematic_data,
+                                   losvds[False],
+                                   losvds[True]):
+        print(f'Kinematic set {kins.name}, shape {dense.shape}:')
+        if dense.sparse is not None or sparse.sparse is None:
+            raise AssertionError('Unexpected LOSVD storage.')
+        compare('values', dense.y, sparse.y, rtol=0)
+        if sparse.sparse is None:
+            raise AssertionError('Reading y changed the sparse storage.')
+        try:
+            sparse.y[0] *= 2.
+        except ValueError:
+            print(f'{"y in place":>24}: ok, read-only for sparse storage')
+        else:
+            raise AssertionError('Changing y in place did not fail.')
+        compare('from_dense', dense.y,
+                dyn.kinematics.SparseHistogramValues.from_dense(
+                    dense.y).toarray(), rtol=0)
+        compare('normalisation', dense.get_normalisation(),
+                sparse.get_normalisation())
+        compare('sum', dense.get_sum(), sparse.get_sum())
+        weights = rng.random(dense.shape[0])
+        compare('weighted sum', dense.get_weighted_sum(weights),
+                sparse.get_weighted_sum(weights))
+        compare('mean', dense.get_mean(), sparse.get_mean())
+        compare('sigma', dense.get_sigma(), sparse.get_sigma())
+        if isinstance(kins, dyn.kinematics.GaussHermite):
+            v_mu, v_sig = kins.data['v'], kins.data['sigma']
+            compare('GH coefficients',
+                    kins.get_gh_expansion_coefficients(v_mu=v_mu,
+                                                       v_sig=v_sig,
+                                                       vel_hist=dense,
+                                                       max_order=6),
+                    kins.get_gh_expansion_coefficients(v_mu=v_mu,
+                                                       v_sig=v_sig,
+                                                       vel_hist=sparse,
+                                                       max_order=6))
+        # rebinning onto 3 bins per 5 bins, as BayesLOSVD does
+        n_bins = dense.shape[1]
+        f = np.zeros((n_bins * 3 // 5 + 1, n_bins))
+        f[np.arange(n_bins) * 3 // 5, np.arange(n_bins)] = rng.random(n_bins)
+        compare('rebin', np.einsum('ijk,lj->ilk', dense.y, f),
+                sparse.sparse.rebin(f))
+        compare('flip', dense.y[:, ::-1, :], sparse.sparse.flip().toarray(),
+                rtol=0)
+        orbits = rng.permutation(dense.shape[0])[:dense.shape[0] // 3]
+        apertures = np.arange(dense.shape[2])[::2]
+        compare('take_orbits', dense.y[orbits][:, :, apertures],
+                sparse.sparse.take_orbits(orbits, apertures).toarray(),
+                rtol=0)
+        normalised = sparse.copy()
+        normalised.normalise()
+        dense.normalise()
+        compare('normalise', dense.y, normalised.y)
+    print('Sparse and dense LOSVDs agree.')
+
+    return 0
+
+if __name__ == '__main__':
+    main(run_sparse_losvd_test)
+
+# end
@@ -83,10 +83,11 @@ class Decomposition:
                          f'{stars.kinematic_data[kin_set].name}')
         # Get losvd_histograms and projected_masses
         self.orblib = self.model.get_orblib()
-        self.orblib.read_losvd_histograms()
+        self.orblib.read_losvd_histograms(kin_sets=[self.kin_set],
+                                          read_intrinsic_masses=False)
         self.losvd_histograms = self.orblib.losvd_histograms[self.kin_set]
         self.proj_mass = self.orblib.projected_masses[self.kin_set]
-        self.logger.debug(f'{self.losvd_histograms.y.shape=}, '
+        self.logger.debug(f'{self.losvd_histograms.shape=}, '
                           f'{self.proj_mass.shape=}.')
         # Get orbit weights and store them in self.model.weights
         _ = self.model.get_weights(self.orblib)
@@ -377,7 +378,7 @@ class Decomposition:
         self.logger.info('Calculating flux, v, and sigma for components '
                          f'{self.decomp.meta["comps"]}, {v_sigma_option=}.')
         comp_flux_v_sigma = astropy.table.Table(
-                            {'ap_id':range(self.losvd_histograms.y.shape[-1])},
+                            {'ap_id':range(self.losvd_histograms.shape[-1])},
                             dtype=[int],
                             meta={'v_sigma_option':v_sigma_option})
         for comp in self.decomp.meta['comps']:
@@ -386,8 +387,8 @@ class Decomposition:
             orb_sel = np.array([f'|{comp}|' in s for s in self.decomp['component']],
                                dtype=bool)
             flux=np.dot(self.proj_mass[orb_sel].T, self.model.weights[orb_sel])
-            losvd = np.dot(self.losvd_histograms.y[orb_sel,:,:].T,
-                           self.model.weights[orb_sel]).T
+            losvd = self.losvd_histograms.get_weighted_sum(
+                np.where(orb_sel, self.model.weights, 0.))
             losvd = losvd[np.newaxis]
             self.logger.debug(f'{comp}: {np.count_nonzero(orb_sel)} orbits, '
                               f'{flux.shape=}, {losvd.shape=}.')
@@ -642,11 +643,13 @@ class Analysis:
             _ = model.get_weights(orblib)
             weights = model.weights
         # get losvd_histograms and projected masses:
-        orblib.read_losvd_histograms()
-        # get all orbits' losvds; orbits_losvd.shape = n_orb,n_vbin,n_aperture
-        orbits_losvd = orblib.losvd_histograms[kin_set].y[:,:,]
-        # weighted sum of orbits_losvd; model_losvd.shape = 1,n_vbin,n_aperture
-        model_losvd = np.dot(orbits_losvd.T, weights).T[np.newaxis]
+        orblib.read_losvd_histograms(kin_sets=[kin_set],
+                                     read_intrinsic_masses=False)
+        # weighted sum of all orbits' losvds (shape n_orb,n_vbin,n_aperture);
+        # model_losvd.shape = 1,n_vbin,n_aperture
+        model_losvd = \
+            orblib.losvd_histograms[kin_set].get_weighted_sum(weights)
+        model_losvd = model_losvd[np.newaxis]
         #model_losvd /= np.sum(model_losvd, 0) # normalisation not necessary
         model_proj_masses = np.dot(orblib.projected_masses[kin_set].T,
                                    weights) # .shape = n_aperture
@@ -88,6 +88,11 @@ class Settings(object):
                    "'python -m pip install cvxopt'."
             self.logger.error(text)
             raise ModuleNotFoundError(text)
+        if self.weight_solver_settings['warm_start'] and \
+           self.weight_solver_settings['nnls_solver'] != 'scipy':
+            self.logger.warning('The weight solver setting warm_start only '
+                                'applies to nnls_solver \'scipy\' and will '
+                                'be ignored.')
         if 'use_new_mirroring' in self.orblib_settings:
             self.logger.warning('As DYNAMITE always uses the new mirroring, '
                                 'the orblib_setting \'use_new_mirroring\' is '
@@ -104,6 +109,74 @@ class Settings(object):
                 self.orblib_settings[key] = default
                 self.logger.info(f'No value given for orblib setting {key} '
                                  f'- set to its default {default}.')
+        for key in ['cache_losvds', 'sparse_losvds', 'cache_ics']:
+            if key not in self.orblib_settings.keys():
+                self.orblib_settings[key] = True
+                self.logger.debug(f'No value given for orblib setting {key} '
+                                  '- set to its default True.')
+        if 'losvd_memory_cache_mb' not in self.orblib_settings.keys():
+            # a budget of 1000 MB shared by all parallel processes
+            ncpus = max(self.multiprocessing_settings['ncpus'],
+                        self.multiprocessing_settings['ncpus_weights'])
+            default = 1000 // ncpus
+            self.orblib_settings['losvd_memory_cache_mb'] = default
+            self.logger.debug('No value given for orblib setting '
+                              'losvd_memory_cache_mb - set to its default '
+                              f'1000/{ncpus} = {default}.')
+        if 'float32_intrinsic_moments' not in self.orblib_settings.keys():
+            self.orblib_settings['float32_intrinsic_moments'] = False
+            self.logger.debug('No value given for orblib setting '
+                              'float32_intrinsic_moments - set to its '
+                              'default False.')
+        if 'compression' not in self.orblib_settings.keys():
+            self.orblib_settings['compression'] = 'bz2'
+            self.logger.debug('No value given for orblib setting '
+                              'compression - set to its default bz2.')
+        if self.orblib_settings['compression'] not in \
+                ('bz2', 'gzip', 'lzma', 'none'):
+            text = 'Orblib setting compression must be one of bz2, gzip, ' \
+                   f"lzma, none, not {self.orblib_settings['compression']}."
+            self.logger.error(text)
+            raise ValueError(text)
+        if 'compression_level' not in self.orblib_settings.keys():
+            self.orblib_settings['compression_level'] = None
+            self.logger.debug('No value given for orblib setting '
+                              'compression_level - set to its default None.')
+        if 'scratch_directory' not in self.orblib_settings.keys():
+            self.orblib_settings['scratch_directory'] = None
+            self.logger.debug('No value given for orblib setting '
+                              'scratch_directory - set to its default None.')
+        for key in ['store_directory', 'store_max_gb', 'store_max_age_days']:
+            if key not in self.orblib_settings.keys():
+                self.orblib_settings[key] = None
+                self.logger.debug(f'No value given for orblib setting {key} '
+                                  '- set to its default None.')
+        if 'low_fidelity' not in self.orblib_settings.keys():
+            self.orblib_settings['low_fidelity'] = None
+            self.logger.debug('No value given for orblib setting '
+                              'low_fidelity - set to its default None.')
+        low_fidelity = self.orblib_settings['low_fidelity']
+        if low_fidelity is not None:
+            orblib_keys = ['nE', 'nI2', 'nI3', 'dithering', 'orbital_periods']
+            thresh_keys = [Configuration.thresh_chi2_abs,
+                           Configuration.thresh_chi2_scaled]
+            unknown = [k for k in low_fidelity.keys()
+                       if k not in orblib_keys + thresh_keys]
+            if len(unknown) > 0:
+                text = f'Unknown low_fidelity orblib settings {unknown}, ' \
+                       f'valid settings are {orblib_keys + thresh_keys}.'
+                self.logger.error(text)
+                raise ValueError(text)
+            if not any(k in low_fidelity.keys() for k in thresh_keys):
+                text = 'The low_fidelity orblib setting needs one of ' \
+                       f'{thresh_keys}.'
+                self.logger.error(text)
+                raise ValueError(text)
+            if low_fidelity.get('nI2', 4) < 4:
+                text = "orblib_settings: low_fidelity nI2 must be >= 4, " \
+                       f"but is {low_fidelity['nI2']}."
+                self.logger.error(text)
+                raise ValueError(text)
         self.logger.debug('Settings validated.')
 
     def __repr__(self):
@@ -437,6 +510,17 @@ class Configuration(object):
                     value['reattempt_failures'] = True
                 if value['reattempt_failures']:
                     logger.info('Will attempt to recover partially run models.')
+                if 'warm_start' not in value:
+                    value['warm_start'] = False
+                logger.debug('... warm-start NNLS from neighbouring ml '
+                             f"models: {value['warm_start']}.")
+                if 'warm_start_max_gram_mb' not in value:
+                    value['warm_start_max_gram_mb'] = 1000
+                for fista_key, default in [('fista_chi2_rtol', 1e-13),
+                                           ('fista_kkt_tol', 1e-9),
+                                           ('fista_max_iter', 100000)]:
+                    if fista_key not in value:
+                        value[fista_key] = default
                 logger.debug(f'weight_solver_settings: {tuple(value.keys())}')
                 self.settings.add('weight_solver_settings', value)
 
@@ -469,6 +553,18 @@ class Configuration(object):
                     value['orblibs_in_parallel'] = False
                 logger.debug("... integrate orblibs in parallel: "
                              f"{value['orblibs_in_parallel']}.")
+                if 'read_orblibs_in_parallel' not in value:
+                    value['read_orblibs_in_parallel'] = False
+                logger.debug("... read orblibs in parallel: "
+                             f"{value['read_orblibs_in_parallel']}.")
+                if 'orblib_integration_chunks' not in value:
+                    value['orblib_integration_chunks'] = 1
+                logger.debug("... orbit integration chunks per orblib: "
+                             f"{value['orblib_integration_chunks']}.")
+                if 'solve_ml_families' not in value:
+                    value['solve_ml_families'] = False
+                logger.debug("... run all models of an orblib in one process: "
+                             f"{value['solve_ml_families']}.")
                 logger.debug(f'multiprocessing_settings: {tuple(value.keys())}')
                 self.settings.add('multiprocessing_settings', value)
 
@@ -492,6 +588,9 @@ class Configuration(object):
         if 'generator_settings' in self.settings.parameter_space_settings:
             self.set_threshold_del_chi2( \
                 self.settings.parameter_space_settings['generator_settings'])
+        if self.settings.orblib_settings['low_fidelity'] is not None:
+            self.set_threshold_del_chi2( \
+                self.settings.orblib_settings['low_fidelity'])
 
         self.parspace = parspace.ParameterSpace(self.system)
         logger.info('Instantiated parameter space')
@@ -671,14 +671,20 @@ class GaussHermite(Kinematics, data.Integrated):
         coef = self.get_hermite_polynomial_coeffients(max_order=max_order)
         nrm = stats.norm()
         hpolys = self.evaluate_hermite_polynomials(coef, w)
-        # TODO: optimize the next line for (i) vel_hist.dx is constant, (ii)
-        # arrays are too large for memory e.g. using dask
-        h = np.einsum('ijk,kj,lkj,j->ikl', # integral in eqn 7
-                      vel_hist.y,
-                      nrm.pdf(w),
-                      hpolys,
-                      vel_hist.dx,
-                      optimize=False)
+        if vel_hist.sparse is not None:
+            # integral in eqn 7, evaluated on the non-zero values only
+            kernel = nrm.pdf(w) * hpolys * vel_hist.dx
+            h = vel_hist.sparse.sum_over_bins(kernel)  # all orders at once
+            h = np.ascontiguousarray(np.moveaxis(h, 0, -1))
+        else:
+            # TODO: optimize the next line for (i) vel_hist.dx is constant,
+            # (ii) arrays are too large for memory e.g. using dask
+            h = np.einsum('ijk,kj,lkj,j->ikl', # integral in eqn 7
+                          vel_hist.y,
+                          nrm.pdf(w),
+                          hpolys,
+                          vel_hist.dx,
+                          optimize=False)
         h *= 2 * np.pi**0.5 # pre-factor in eqn 7
         return h
 
@@ -786,6 +792,434 @@ class GaussHermite(Kinematics, data.Integrated):
             hist_bins += 1
         self.hist_bins = hist_bins
 
+class SparseHistogramValues(object):
+    """Compressed sparse storage of LOSVD histogram values
+
+    Orbit library LOSVDs are non-zero in a contiguous range of velocity bins
+    only. For each orbit and aperture (a `row`, with row index
+    ``orbit * n_apertures + aperture``), only this range is stored, similar
+    to the CSR format of sparse matrices: the values of row ``r`` are
+    ``values[indptr[r]:indptr[r+1]]`` and belong to the velocity bins
+    starting at ``first_bin[r]``.
+
+    Parameters
+    ----------
+    shape : tuple of int
+        the shape (n_orbits, n_bins, n_apertures) of the dense histograms
+    indptr : int array (n_orbits * n_apertures + 1,)
+        the start of each row in ``values``, ``indptr[-1] == len(values)``
+    first_bin : int array (n_orbits * n_apertures,)
+        the index of the velocity bin of each row's first value
+    values : float array
+        the stored histogram values
+
+    """
+    def __init__(self, shape=None, indptr=None, first_bin=None, values=None):
+        self.shape = tuple(int(n) for n in shape)
+        self.indptr = indptr
+        self.first_bin = first_bin
+        self.values = values
+
+    @property
+    def n_values(self):
+        """int: number of values in each row"""
+        return np.diff(self.indptr)
+
+    @property
+    def nbytes(self):
+        """int: number of bytes of the stored arrays"""
+        return self.indptr.nbytes + self.first_bin.nbytes \
+               + self.values.nbytes
+
+    def copy(self):
+        """Copy of the sparse histogram values
+
+        Returns
+        -------
+        ``SparseHistogramValues``
+
+        """
+        return SparseHistogramValues(shape=self.shape,
+                                     indptr=np.array(self.indptr),
+                                     first_bin=np.array(self.first_bin),
+                                     values=np.array(self.values))
+
+    def get_orbit_chunks(self, n_values=2**20):
+        """Split the rows into chunks of whole orbits
+
+        The methods of this class process the rows chunk by chunk, so that
+        the index arrays of ``get_row_and_bin_indices`` stay small compared
+        to the stored values.
+
+        Parameters
+        ----------
+        n_values : int, optional
+            the approximate maximum number of values per chunk, assuming
+            all rows hold values in all bins. The default is 2**20.
+
+        Returns
+        -------
+        list of tuples
+            (start, end), the first and last+1 row index of each chunk
+
+        """
+        n_orbits, n_bins, n_apertures = self.shape
+        n_rows = max(1, n_values // (n_bins * n_apertures)) * n_apertures
+        n_rows_tot = n_orbits * n_apertures
+        return [(start, min(start + n_rows, n_rows_tot))
+                for start in range(0, n_rows_tot, n_rows)]
+
+    def get_row_and_bin_indices(self, start=0, end=None):
+        """Row and velocity bin index of each stored value
+
+        Parameters
+        ----------
+        start : int, optional
+            the first row. The default is 0.
+        end : int, optional
+            the last+1 row. The default is None (up to the last row).
+
+        Returns
+        -------
+        tuple of two int arrays
+            of the same length as the values of rows ``start`` to ``end-1``,
+            i.e. ``values[indptr[start]:indptr[end]]``
+
+        """
+        if end is None:
+            end = len(self.indptr) - 1
+        indptr = np.asarray(self.indptr[start:end+1])
+        row = np.repeat(np.arange(start, end), np.diff(indptr))
+        bin_idx = np.arange(indptr[0], indptr[-1]) - indptr[row - start] \
+                  + self.first_bin[row]
+        return row, bin_idx
+
+    def get_chunk_values(self, start, end):
+        """The values of rows ``start`` to ``end-1``
+
+        Returns
+        -------
+        float array
+            ``values[indptr[start]:indptr[end]]``
+
+        """
+        return self.values[self.indptr[start]:self.indptr[end]]
+
+    def toarray(self):
+        """Dense histogram values
+
+        Returns
+        -------
+        array (n_orbits, n_bins, n_apertures)
+
+        """
+        n_orbits, n_bins, n_apertures = self.shape
+        y = np.zeros(self.shape)
+        for start, end in self.get_orbit_chunks():
+            row, bin_idx = self.get_row_and_bin_indices(start, end)
+            orbit, aperture = np.divmod(row, n_apertures)
+            y[orbit, bin_idx, aperture] = self.get_chunk_values(start, end)
+        return y
+
+    @classmethod
+    def from_dense(cls, y):
+        """Sparse storage of dense histogram values
+
+        Parameters
+        ----------
+        y : array (n_orbits, n_bins, n_apertures)
+
+        Returns
+        -------
+        ``SparseHistogramValues``
+            storing the range from the first to the last non-zero bin of
+            each row
+
+        """
+        n_orbits, n_bins, n_apertures = y.shape
+        y = np.swapaxes(y, 1, 2).reshape(-1, n_bins)
+        non_zero = y != 0
+        has_values = np.any(non_zero, axis=1)
+        first_bin = np.where(has_values, np.argmax(non_zero, axis=1), 0)
+        last_bin = n_bins - 1 - np.argmax(non_zero[:, ::-1], axis=1)
+        n_values = np.where(has_values, last_bin - first_bin + 1, 0)
+        bins = np.arange(n_bins)
+        in_range = (bins >= first_bin[:, np.newaxis]) \
+                   & (bins < (first_bin + n_values)[:, np.newaxis])
+        return cls(shape=(n_orbits, n_bins, n_apertures),
+                   indptr=np.concatenate(([0], np.cumsum(n_values))),
+                   first_bin=first_bin,
+                   values=y[in_range])
+
+    def sum_over_bins(self, weights=None):
+        """Weighted sum over the velocity bins
+
+        Several weighted sums (e.g., one per Gauss Hermite order) can be
+        evaluated in one pass by stacking the weights along leading axes.
+
+        Parameters
+        ----------
+        weights : array, optional
+            weights broadcastable to shape (..., n_apertures, n_bins). If
+            None, the values are summed.
+
+        Returns
+        -------
+        array (..., n_orbits, n_apertures)
+
+        """
+        n_orbits, n_bins, n_apertures = self.shape
+        if weights is None:
+            lead_shape = ()
+        else:
+            weights = np.asarray(weights)
+            lead_shape = weights.shape[:-2]
+            weights = np.broadcast_to(weights,
+                                      lead_shape + (n_apertures, n_bins))
+            weights = weights.reshape(-1, n_apertures * n_bins)
+        result = np.empty((int(np.prod(lead_shape)), n_orbits * n_apertures))
+        for start, end in self.get_orbit_chunks():
+            row, bin_idx = self.get_row_and_bin_indices(start, end)
+            values = self.get_chunk_values(start, end)
+            if weights is None:
+                result[0, start:end] = np.bincount(row - start,
+                                                   weights=values,
+                                                   minlength=end - start)
+                continue
+            weight_idx = row % n_apertures * n_bins + bin_idx
+            for result_l, weights_l in zip(result, weights):
+                result_l[start:end] = np.bincount(
+                    row - start,
+                    weights=values * weights_l[weight_idx],
+                    minlength=end - start)
+        return result.reshape(lead_shape + (n_orbits, n_apertures))
+
+    def sum_over_orbits(self, weights):
+        """Weighted sum over the orbits
+
+        Parameters
+        ----------
+        weights : array (n_orbits,)
+
+        Returns
+        -------
+        array (n_bins, n_apertures)
+
+        """
+        n_orbits, n_bins, n_apertures = self.shape
+        result = np.zeros(n_bins * n_apertures)
+        for start, end in self.get_orbit_chunks():
+            row, bin_idx = self.get_row_and_bin_indices(start, end)
+            orbit, aperture = np.divmod(row, n_apertures)
+            result += np.bincount(
+                bin_idx * n_apertures + aperture,
+                weights=self.get_chunk_values(start, end) * weights[orbit],
+                minlength=n_bins*n_apertures)
+        return result.reshape(n_bins, n_apertures)
+
+    def rebin(self, f):
+        """Map the velocity bins onto new bins with a (sparse) matrix
+
+        Parameters
+        ----------
+        f : array (n_new_bins, n_bins)
+            ``f[l,j]`` is the fraction of the j'th bin in the l'th new bin
+
+        Returns
+        -------
+        array (n_orbits, n_new_bins, n_apertures)
+            the dense, rebinned histograms
+
+        """
+        n_orbits, n_bins, n_apertures = self.shape
+        result = np.zeros((n_orbits, len(f), n_apertures))
+        for start, end in self.get_orbit_chunks():
+            row, bin_idx = self.get_row_and_bin_indices(start, end)
+            values = self.get_chunk_values(start, end)
+            orbits = slice(start // n_apertures, end // n_apertures)
+            for l, f_l in enumerate(f):
+                if np.any(f_l[bin_idx] != 0):
+                    result[orbits, l, :] = np.bincount(
+                        row - start,
+                        weights=values * f_l[bin_idx],
+                        minlength=end - start).reshape(-1, n_apertures)
+        return result
+
+    def divide_rows(self, divisors):
+        """Divide the values of each row by a number
+
+        Parameters
+        ----------
+        divisors : array (n_orbits, n_apertures)
+
+        Returns
+        -------
+        ``SparseHistogramValues``
+            sharing ``indptr`` and ``first_bin`` with this object
+
+        """
+        divisors = np.ravel(divisors)
+        values = np.empty(len(self.values))
+        for start, end in self.get_orbit_chunks():
+            n_values = np.diff(self.indptr[start:end+1])
+            values[self.indptr[start]:self.indptr[end]] = \
+                self.get_chunk_values(start, end) \
+                / np.repeat(divisors[start:end], n_values)
+        return SparseHistogramValues(shape=self.shape,
+                                     indptr=self.indptr,
+                                     first_bin=self.first_bin,
+                                     values=values)
+
+    def zero_bins(self, bins):
+        """Set the values in some velocity bins to zero, in place
+
+        Parameters
+        ----------
+        bins : int array
+            indices of the bins, in the range 0 to n_bins-1
+
+        """
+        for start, end in self.get_orbit_chunks():
+            _, bin_idx = self.get_row_and_bin_indices(start, end)
+            is_zero = np.isin(bin_idx, bins)
+            self.values[self.indptr[start] + np.flatnonzero(is_zero)] = 0.
+
+    def flip(self):
+        """Reverse the velocity axis
+
+        Returns
+        -------
+        ``SparseHistogramValues``
+
+        """
+        values = np.empty(len(self.values))
+        for start, end in self.get_orbit_chunks():
+            n_values = np.diff(self.indptr[start:end+1])
+            row_start = np.repeat(np.asarray(self.indptr[start:end]),
+                                  n_values)
+            row_end = np.repeat(np.asarray(self.indptr[start+1:end+1]),
+                                n_values)
+            idx = np.arange(self.indptr[start], self.indptr[end])
+            # the value at position i of a row moves to position n-1-i
+            values[idx] = self.values[row_start + row_end - 1 - idx]
+        first_bin = self.shape[1] - self.first_bin - self.n_values
+        return SparseHistogramValues(shape=self.shape,
+                                     indptr=self.indptr.copy(),
+                                     first_bin=first_bin,
+                                     values=values)
+
+    def take_orbits(self, orbits, apertures=None):
+        """Select (and reorder) orbits and, optionally, apertures
+
+        Only the rows of the selected orbits and apertures are accessed, so
+        this is efficient for memory-mapped arrays, too.
+
+        Parameters
+        ----------
+        orbits : int array
+            indices of the orbits to take
+        apertures : int array, optional
+            indices of the apertures to take. The default is None (all
+            apertures).
+
+        Returns
+        -------
+        ``SparseHistogramValues``
+
+        """
+        n_orbits, n_bins, n_apertures = self.shape
+        if apertures is None:
+            apertures = np.arange(n_apertures)
+        apertures = np.asarray(apertures)
+        rows = (np.asarray(orbits)[:, np.newaxis] * n_apertures
+                + apertures).ravel()
+        row_start = np.asarray(self.indptr[rows])
+        n_values = self.indptr[rows + 1] - row_start
+        indptr = np.concatenate(([0], np.cumsum(n_values)))
+        idx = np.arange(indptr[-1]) \
+              + np.repeat(row_start - indptr[:-1], n_values)
+        return SparseHistogramValues(
+            shape=(len(orbits), n_bins, len(apertures)),
+            indptr=indptr,
+            first_bin=np.asarray(self.first_bin[rows]),
+            values=np.asarray(self.values[idx]))
+
+    def mirror_and_concatenate(self, other):
+        """Interlace with the flipped copy and append other orbits
+
+        Equivalent to concatenating the orbits of this object and the
+        flipped copy, interlacing them (orbit ``i`` becomes orbits ``2i``
+        and ``2i+1`` with the latter flipped), and concatenating ``other``,
+        but without creating the intermediate objects.
+
+        Parameters
+        ----------
+        other : ``SparseHistogramValues``
+            with the same number of bins and apertures
+
+        Returns
+        -------
+        ``SparseHistogramValues``
+
+        """
+        n_orbits, n_bins, n_apertures = self.shape
+        n_values = self.n_values.reshape(n_orbits, n_apertures)
+        first_bin = self.first_bin.reshape(n_orbits, n_apertures)
+        # a flipped row starts where the unflipped row ends, counted from
+        # the last bin
+        first_bin = np.stack((first_bin, n_bins - first_bin - n_values), 1)
+        n_values = np.stack((n_values, n_values), 1)
+        n_values = np.concatenate((n_values.ravel(), other.n_values))
+        first_bin = np.concatenate((first_bin.ravel(), other.first_bin))
+        indptr = np.concatenate(([0], np.cumsum(n_values)))
+        values = np.empty(indptr[-1])
+        # copy chunks of orbits, so that the index arrays stay small
+        n_chunk = max(1, 2**16 // n_apertures)
+        for orbit in range(0, n_orbits, n_chunk):
+            rows = np.arange(orbit * n_apertures,
+                             min(orbit + n_chunk, n_orbits) * n_apertures)
+            start, end = self.indptr[rows[0]], self.indptr[rows[-1] + 1]
+            n_val = self.indptr[rows + 1] - self.indptr[rows]
+            row = np.repeat(rows, n_val)
+            pos = np.arange(start, end) - self.indptr[row]
+            # row r of orbit o becomes rows r+o*n_apertures (unflipped) and
+            # r+(o+1)*n_apertures (flipped)
+            new_row = row + row // n_apertures * n_apertures
+            values[indptr[new_row] + pos] = self.values[start:end]
+            values[indptr[new_row + n_apertures + 1] - 1 - pos] = \
+                self.values[start:end]
+        values[indptr[2*n_orbits*n_apertures]:] = other.values
+        return SparseHistogramValues(
+            shape=(2 * n_orbits + other.shape[0], n_bins, n_apertures),
+            indptr=indptr,
+            first_bin=first_bin,
+            values=values)
+
+    @staticmethod
+    def concatenate(sparse_values):
+        """Concatenate along the orbit axis
+
+        Parameters
+        ----------
+        sparse_values : list of ``SparseHistogramValues``
+            all with the same number of bins and apertures
+
+        Returns
+        -------
+        ``SparseHistogramValues``
+
+        """
+        n_orbits = sum(s.shape[0] for s in sparse_values)
+        offsets = np.cumsum([0] + [s.indptr[-1] for s in sparse_values])
+        indptr = [s.indptr[:-1] + o for s, o in zip(sparse_values, offsets)]
+        indptr = np.concatenate(indptr + [offsets[-1:]])
+        return SparseHistogramValues(
+            shape=(n_orbits,) + sparse_values[0].shape[1:],
+            indptr=indptr,
+            first_bin=np.concatenate([s.first_bin for s in sparse_values]),
+            values=np.concatenate([s.values for s in sparse_values]))
+
+
 class Histogram(object):
     """LOSVD histograms
 
@@ -793,8 +1227,14 @@ class Histogram(object):
     ----------
     xedg : array (n_bins+1,)
         histogram bin edges
-    y : (n_orbits, n_bins+1, n_apertures)
-        histogram values
+    y : array (n_orbits, n_bins, n_apertures) or ``SparseHistogramValues``
+        histogram values. If a ``SparseHistogramValues`` object is given,
+        the histograms are stored sparsely and the methods of this class
+        avoid creating the dense array. For sparse histograms, accessing
+        ``y`` returns a read-only dense copy, so that changing it in place
+        (e.g. ``hist.y *= 2``) raises a ValueError instead of silently not
+        changing the histograms. Assign a new array to ``y`` instead (e.g.
+        ``hist.y = hist.y * 2``), which stores the histograms densely.
     normalise : bool, default=True
         whether to normalise to pdf
 
@@ -804,6 +1244,8 @@ class Histogram(object):
         bin centers
     dx : array (n_bins,)
         bin widths
+    sparse : ``SparseHistogramValues`` or None
+        the sparse histogram values or None if stored as dense array
     normalised : bool
         whether or not has been normalised to pdf
 
@@ -817,6 +1259,73 @@ class Histogram(object):
         if normalise:
             self.normalise()
 
+    @property
+    def y(self):
+        """array (n_orbits, n_bins, n_apertures): the histogram values"""
+        if self.sparse is not None:
+            self.logger.debug('Creating a dense copy of sparse histograms.')
+            y = self.sparse.toarray()
+            y.setflags(write=False)  # writes would not change the histograms
+            return y
+        return self._y
+
+    @y.setter
+    def y(self, y):
+        if isinstance(y, SparseHistogramValues):
+            self.sparse, self._y = y, None
+        else:
+            self.sparse, self._y = None, y
+
+    @property
+    def shape(self):
+        """tuple: the shape (n_orbits, n_bins, n_apertures) of ``y``"""
+        if self.sparse is not None:
+            return self.sparse.shape
+        return self._y.shape
+
+    def copy(self):
+        """Copy of the histograms, sparse histograms stay sparse
+
+        Returns
+        -------
+        ``dyn.kinematics.Histogram``
+
+        """
+        y = self.sparse.copy() if self.sparse is not None else np.array(self.y)
+        return Histogram(xedg=np.array(self.xedg), y=y, normalise=False)
+
+    def set_read_only(self):
+        """Make the histogram values read-only, e.g. to share them
+
+        ``zero_bins``, the only method changing the values in place, copies
+        read-only values first, i.e. the values are copied on write.
+
+        """
+        if self.sparse is not None:
+            arrays = [self.sparse.values,
+                      self.sparse.indptr,
+                      self.sparse.first_bin]
+        else:
+            arrays = [self._y]
+        for array in arrays:
+            array.setflags(write=False)
+
+    def share(self):
+        """Histograms sharing the (read-only) values with this object
+
+        The values are made read-only, see ``set_read_only``. The bin edges
+        are copied, so that e.g. ``scale_x_values`` does not change this
+        object.
+
+        Returns
+        -------
+        ``dyn.kinematics.Histogram``
+
+        """
+        self.set_read_only()
+        y = self.sparse if self.sparse is not None else self._y
+        return Histogram(xedg=np.array(self.xedg), y=y, normalise=False)
+
     def get_normalisation(self):
         """Get the normalsition
 
@@ -828,10 +1337,65 @@ class Histogram(object):
             the normalisation
 
         """
+        if self.sparse is not None:
+            return self.sparse.sum_over_bins(self.dx)
         na = np.newaxis
         norm = np.sum(self.y*self.dx[na,:,na], axis=1)
         return norm
 
+    def get_sum(self):
+        """Get the sum of the histogram values over all bins
+
+        Returns
+        -------
+        array shape (n_orbits, n_apertures)
+            the sum, e.g. the projected masses of orbit library LOSVDs
+
+        """
+        if self.sparse is not None:
+            return self.sparse.sum_over_bins()
+        return np.sum(self.y, 1)
+
+    def get_weighted_sum(self, weights):
+        """Get the weighted sum of the histograms, e.g. a model's LOSVDs
+
+        Parameters
+        ----------
+        weights : array (n_orbits,)
+
+        Returns
+        -------
+        array shape (n_bins, n_apertures)
+            ``Sum_i weights_i * y_i``
+
+        """
+        weights = np.asarray(weights)
+        if self.sparse is not None:
+            return self.sparse.sum_over_orbits(weights)
+        return np.dot(self.y.T, weights).T
+
+    def zero_bins(self, bins):
+        """Set the histogram values in some bins to zero, in place
+
+        Parameters
+        ----------
+        bins : list of int
+            indices of the bins, negative indices count from the end
+
+        """
+        if self.sparse is not None:
+            if not self.sparse.values.flags.writeable:  # copy on write
+                self.sparse = SparseHistogramValues(
+                    shape=self.sparse.shape,
+                    indptr=self.sparse.indptr,
+                    first_bin=self.sparse.first_bin,
+                    values=np.array(self.sparse.values))
+            self.sparse.zero_bins(np.array(bins) % self.sparse.shape[1])
+        else:
+            if not self._y.flags.writeable:  # copy on write
+                self._y = np.array(self._y)
+            self._y[:,bins,:] = 0.
+
     def normalise(self):
         """normalises the LOSVDs
 
@@ -842,6 +1406,11 @@ class Histogram(object):
 
         """
         norm = self.get_normalisation()
+        if self.sparse is not None:
+            # where norm=0, values are 0
+            norm[norm == 0.] = np.inf
+            self.y = self.sparse.divide_rows(norm)
+            return
         na = np.newaxis
         tmp = self.y/norm[:,na,:]
         # where norm=0, tmp=nan. Fix this:
@@ -878,8 +1447,12 @@ class Histogram(object):
             mean velcoity of losvd
 
         """
-        na = np.newaxis
-        mean = np.sum(self.x[na,:,na] * self.y * self.dx[na,:,na], axis=1)
+        if self.sparse is not None:
+            mean = self.sparse.sum_over_bins(self.x * self.dx)
+        else:
+            na = np.newaxis
+            mean = np.sum(self.x[na,:,na] * self.y * self.dx[na,:,na],
+                          axis=1)
         norm = self.get_normalisation()
         # ignore invalid operations resulting in np.nan (such as 0/0 -> np.nan)
         with np.errstate(invalid='ignore'):
@@ -897,9 +1470,23 @@ class Histogram(object):
         """
         na = np.newaxis
         mean = self.get_mean()
-        v_minus_mu = self.x[na,:,na]-mean[:,na,:]
-        var = np.sum(v_minus_mu**2. * self.y * self.dx[na,:,na],
-                     axis=1)
+        if self.sparse is not None:
+            n_orbits, n_bins, n_apertures = self.sparse.shape
+            var = np.empty(n_orbits * n_apertures)
+            for start, end in self.sparse.get_orbit_chunks():
+                row, bin_idx = self.sparse.get_row_and_bin_indices(start, end)
+                v_minus_mu = self.x[bin_idx] - np.ravel(mean)[row]
+                var[start:end] = np.bincount(
+                    row - start,
+                    weights=v_minus_mu**2. \
+                            * self.sparse.get_chunk_values(start, end) \
+                            * self.dx[bin_idx],
+                    minlength=end - start)
+            var = var.reshape(n_orbits, n_apertures)
+        else:
+            v_minus_mu = self.x[na,:,na]-mean[:,na,:]
+            var = np.sum(v_minus_mu**2. * self.y * self.dx[na,:,na],
+                         axis=1)
         norm = self.get_normalisation()
         var /= norm
         sigma = var**0.5
@@ -920,8 +1507,9 @@ class Histogram(object):
         v_sigma = self.get_sigma() # starting values for fit
         def gauss(x, a, mean, sigma):
             return a*np.exp(-(x-mean)**2/(2.*sigma**2))
-        for orbit in range(self.y.shape[0]):
-            for aperture in range(self.y.shape[-1]):
+        y = self.y  # a dense copy for sparse histograms
+        for orbit in range(y.shape[0]):
+            for aperture in range(y.shape[-1]):
                 err_msg=f'{orbit=}, {aperture=}: mean or sigma is nan.'
                 if not (np.isnan(v_mean[orbit,aperture]) or
                         np.isnan(v_sigma[orbit,aperture])): # nan?
@@ -931,7 +1519,7 @@ class Histogram(object):
                     try:
                         p_opt, _ = curve_fit(gauss,
                                              self.x,
-                                             self.y[orbit,:,aperture],
+                                             y[orbit,:,aperture],
                                              p0=p_initial,
                                              method='trf')
                     except:
@@ -1439,6 +2027,8 @@ class BayesLOSVD(Kinematics, data.Integrated):
         f2[f2>1] = 1
         f2[f2<0] = 0
         f = np.minimum(f1, f2)
+        if losvd_histograms.sparse is not None:
+            return losvd_histograms.sparse.rebin(f)
         # TODO:  check if the following is faster if we use sparseness of f
         # sparse matrix multiplication won't work with einsum, but may be faster
         rebined_orbit_vel_hist = np.einsum('ijk,lj->ilk',
@@ -7,10 +7,14 @@ import shutil
 import numpy as np
 from astropy import table
 from astropy.io import ascii
+from pathos.multiprocessing import Pool
 
 from dynamite import weight_solvers as ws
 from dynamite import orblib as dyn_orblib
 
+# subdirectory of an orbit library directory holding its low-fidelity version
+LOW_FIDELITY_DIRECTORY = 'low_fidelity/'
+
 class AllModels(object):
     """All models which have been run so far
 
@@ -80,6 +84,10 @@ class AllModels(object):
         # add extra columns
         names += ['orblib_done', 'weights_done', 'all_done']
         dtype += [bool, bool, bool]
+        # low-fidelity screening (orblib setting low_fidelity): the chi2 of
+        # the low-fidelity model and whether the model was screened out
+        names += ['low_fidelity_chi2', 'screened']
+        dtype += [float, bool]
         # which_iter will record which iteration of parameters a model came from
         names.append('which_iter')
         dtype.append(int)
@@ -101,6 +109,11 @@ class AllModels(object):
         self.table = table.vstack((self.table, table_read),
                                   join_type='outer',
                                   metadata_conflicts='error')
+        # tables written without low-fidelity screening
+        for name, value in (('low_fidelity_chi2', np.nan),
+                            ('screened', False)):
+            if isinstance(self.table[name], table.column.MaskedColumn):
+                self.table[name] = self.table[name].filled(value)
         self.logger.debug(f'{len(self.table)} models read '
                           f'from file {self.filename}')
 
@@ -121,6 +134,10 @@ class AllModels(object):
         deleted.
         Note that orbit libraries on disk will not be deleted as they
         may be in use by other models.
+        Models screened out by low-fidelity screening (``screened==True``,
+        see the orblib setting ``low_fidelity``) are complete as they are:
+        they are neither updated nor deleted, and their orbit library
+        directories (holding the low-fidelity models) are kept.
 
         Up to DYNAMITE 3.0 there was no kinmapchi2 column in the all_models
         table. If possible (data exists on disk), calculate and add the values,
@@ -134,18 +151,12 @@ class AllModels(object):
         """
         table_modified = False
         for i, row in enumerate(self.table):
-            if not row['all_done']:
+            if not row['all_done'] and not row['screened']:
                 table_modified = True
                 mod = self.get_model_from_row(i)
                 staging_filename = mod.directory+'model_done_staging.ecsv'
                 f_root = mod.directory_noml + 'datfil/'
-                check = os.path.isfile(f_root + 'orblib.dat.bz2') \
-                        and os.path.isfile(f_root + 'orblibbox.dat.bz2')
-                if not check:
-                    check = os.path.isfile(f_root + 'orblib_qgrid.dat.bz2') \
-                     and os.path.isfile(f_root + 'orblib_losvd_hist.dat.bz2') \
-                     and os.path.isfile(f_root + 'orblibbox_qgrid.dat.bz2') \
-                     and os.path.isfile(f_root + 'orblibbox_losvd_hist.dat.bz2')
+                check = dyn_orblib.get_orblib_layout(f_root) is not None
                 if os.path.isfile(staging_filename):
                     # the model has completed but was not entered in the table
                     staging_file = ascii.read(staging_filename)
@@ -167,14 +178,15 @@ class AllModels(object):
         # if we will reattempt weight solving, only delete models with no orblib
         if self.config.settings.weight_solver_settings['reattempt_failures']:
             for i, row in enumerate(self.table):
-                if (not row['orblib_done']) and (not row['all_done']):
+                if (not row['orblib_done']) and (not row['all_done']) \
+                        and (not row['screened']):
                     to_delete.append(i)
                     self.logger.info('No orblibs calculated for model in '
                                      f'{row["directory"]} - removing row {i}.')
         # otherwise delete any model which is not `all_done`
         else:
             for i, row in enumerate(self.table):
-                if not row['all_done']:
+                if not row['all_done'] and not row['screened']:
                     to_delete.append(i)
                     self.logger.info('No finished model found in '
                                      f'{row["directory"]} - removing row {i}.')
@@ -193,9 +205,10 @@ class AllModels(object):
             for directory in dirs_to_delete:
                 try:
                     # Only remove orblib directories that are not used by
-                    # already completed models
+                    # already completed or screened models
+                    keep = self.table['all_done'] | self.table['screened']
                     orblibs_keep = [d[:d[:-1].rindex('/')+1] for d in
-                     self.table[np.where(self.table['all_done'])]['directory']]
+                                    self.table[np.where(keep)]['directory']]
                     if directory in set(orblibs_keep):
                         self.logger.info(f'Orblib directory {directory} in '
                                          'use by existing model - untouched.')
@@ -386,7 +399,9 @@ class AllModels(object):
         ----------
         directory : str
             The directory string needs to start with the output directory
-            defined in ``config.settings.io_settings['output_directory']``
+            defined in ``config.settings.io_settings['output_directory']``.
+            Directories of low-fidelity models (see ``Model``) return the
+            low-fidelity ``Model``.
 
         Raises
         ------
@@ -398,10 +413,13 @@ class AllModels(object):
         mod : a ``dyn.model.Model`` object
 
         """
+        low_fidelity = f'/{LOW_FIDELITY_DIRECTORY}' in directory
+        if low_fidelity:
+            directory = directory.replace(f'/{LOW_FIDELITY_DIRECTORY}', '/')
         for idx, dir_table in enumerate(self.table['directory']):
             if self.config.settings.io_settings['output_directory'] \
                                         + 'models/' + dir_table == directory:
-                mod = self.get_model_from_row(idx)
+                mod = self.get_model_from_row(idx, low_fidelity=low_fidelity)
                 break
         else:
             text = f'Directory {directory} not in all_models table. ' \
@@ -410,13 +428,16 @@ class AllModels(object):
             raise ValueError(text)
         return mod
 
-    def get_model_from_row(self, row_id):
+    def get_model_from_row(self, row_id, low_fidelity=False):
         """Get a ``Model`` given a table row
 
         Parameters
         ----------
         row_id : int
             which row
+        low_fidelity : bool, optional
+            If True, return the model's low-fidelity version, see ``Model``.
+            The default is False.
 
         Returns
         -------
@@ -426,7 +447,8 @@ class AllModels(object):
         parset = self.get_parset_from_row(row_id)
         mod = Model(config=self.config,
                     parset=parset,
-                    directory=self.table['directory'][row_id])
+                    directory=self.table['directory'][row_id],
+                    low_fidelity=low_fidelity)
         return mod
 
     def get_row_from_model(self, model=None):
@@ -508,6 +530,31 @@ class AllModels(object):
             raise ValueError(text)
         return ml_orblib
 
+    def get_orblib_rows(self, model_id):
+        """Get the rows of all models sharing model number model_id's orblib
+
+        The models of an orbit library have the same parameters except
+        ``ml``. This method searches ``self.table``, the all_models table.
+
+        Parameters
+        ----------
+        model_id : int
+            The ``self.table`` row index of the model.
+
+        Returns
+        -------
+        list of ints
+            The ``self.table`` row indices of the models using the same
+            orblib, including model_id.
+
+        """
+        orblib_parameters = [p for p in self.config.parspace.par_names
+                             if p != 'ml']
+        orblib_data = self.table[orblib_parameters]
+        row_comp = tuple(orblib_data[model_id])
+        return [row_id for row_id, row in enumerate(orblib_data)
+                if np.allclose(row_comp, tuple(row))]
+
     def get_model_velocity_scaling_factor(self, model_id=None, model=None):
         """Get the model's velocity scaling factor
 
@@ -551,6 +598,21 @@ class AllModels(object):
         self.table.write(self.filename, format='ascii.ecsv', overwrite=True)
         self.logger.debug(f'Model table written to file {self.filename}')
 
+    def get_unscreened_rows(self):
+        """Get the rows of the models not screened out
+
+        Models screened out by low-fidelity screening (``screened==True``)
+        have no chi2 values and are excluded wherever the chi2 values are
+        compared, e.g. to find the best models.
+
+        Returns
+        -------
+        1d numpy array of bool
+            True for the rows of ``self.table`` not screened out
+
+        """
+        return ~np.array(self.table['screened'], dtype=bool)
+
     def get_best_n_models(self, n=10, which_chi2=None):
         """Get the best n models or all but the n best models so far
 
@@ -572,11 +634,12 @@ class AllModels(object):
         Returns
         -------
         a new ``astropy.table`` object holding the best n models, sorted by
-        which_chi2
+        which_chi2. Models screened out by low-fidelity screening are
+        never included.
 
         """
         which_chi2 = self.config.validate_chi2(which_chi2)
-        table = copy.deepcopy(self.table)
+        table = copy.deepcopy(self.table[self.get_unscreened_rows()])
         table.sort(which_chi2)
         if n>=0:
             table = table[:n]
@@ -598,11 +661,14 @@ class AllModels(object):
         -------
         list of int
             indices in the all_models table of the n best model so far, sorted
-            by which_chi2
+            by which_chi2. Models screened out by low-fidelity screening are
+            never included.
 
         """
         which_chi2 = self.config.validate_chi2(which_chi2)
-        return list(self.table.argsort(keys=which_chi2)[:n])
+        unscreened = self.get_unscreened_rows()
+        idx = [i for i in self.table.argsort(keys=which_chi2) if unscreened[i]]
+        return idx[:n]
 
     def get_mods_within_chi2_thresh(self, which_chi2=None, delta=None):
         """Get models within or outside a delta threshold of the best
@@ -630,17 +696,19 @@ class AllModels(object):
         -------
         a new ``astropy.table`` object holding the ''delta-best'' models
         (if delta >= 0) or holding all but the ''delta-best'' models
-        (if delta < 0), respectively.
+        (if delta < 0), respectively. Models screened out by low-fidelity
+        screening are never included.
 
         """
         which_chi2 = self.config.validate_chi2(which_chi2)
-        chi2_min = np.nanmin(self.table[which_chi2])
+        table = self.table[self.get_unscreened_rows()]
+        chi2_min = np.nanmin(table[which_chi2])
         if delta is None:
             delta = chi2_min * 0.1
         if delta >= 0:
-            models = self.table[self.table[which_chi2] <= chi2_min+delta]
+            models = table[table[which_chi2] <= chi2_min+delta]
         else:
-            models = self.table[self.table[which_chi2] > chi2_min-delta]
+            models = table[table[which_chi2] > chi2_min-delta]
         return models
 
     def make_best_models_table(self,
@@ -735,7 +803,7 @@ class AllModels(object):
 
         """
         which_chi2=self.config.settings.parameter_space_settings['which_chi2']
-        chi2_min = min(self.table[which_chi2])
+        chi2_min = np.nanmin(self.table[which_chi2][self.get_unscreened_rows()])
         chi2_abs_thresh = 3 * np.sqrt(self.config.get_2n_obs())
         model_rows_keep = \
             self.get_mods_within_chi2_thresh(delta=chi2_abs_thresh)
@@ -814,6 +882,185 @@ class AllModels(object):
                          f'{len(model_rows_del)} identified models from disk.')
         return True
 
+    def convert_orblibs(self,
+                        compression=None,
+                        compression_level=None,
+                        remove_originals=False,
+                        write_caches=True,
+                        ncpus=None):
+        """
+        Converts all existing orbit libraries to a faster format.
+
+        Runs ``LegacyOrbitLibrary.convert_orbit_library`` on the orbit
+        library of each model with ``orblib_done=True`` in the all_models
+        table, decoding each orbit library once. The orbit libraries are
+        converted in parallel. Orbit libraries already converted, e.g. by
+        an interrupted earlier call, are skipped, so that the conversion
+        can be resumed by calling this method again. A failed conversion
+        is logged and does not stop the conversion of the other orbit
+        libraries.
+
+        Parameters
+        ----------
+        compression : str or None, optional
+            the codec of the converted orbit library files, a key of
+            ``dyn.orblib.ORBLIB_CODECS``, e.g. 'none' or 'gzip'. The default
+            is None (keep the files' compression).
+        compression_level : int or None, optional
+            compression level passed to the compressor. The default is None
+            (the compressor's default).
+        remove_originals : bool, optional
+            If True, the original orbit library files are removed after
+            converting them, otherwise they are moved to the orbit
+            libraries' ``datfil/orblib_originals/`` directories, from where
+            ``purge_orblib_originals`` removes them once verified. The
+            default is False.
+        write_caches : bool, optional
+            If True, the caches of the decoded orbit libraries are written.
+            The default is True.
+        ncpus : int or None, optional
+            number of orbit libraries converted in parallel. The default is
+            None (the multiprocessing setting ``ncpus``).
+
+        Returns
+        -------
+        int
+            The number of orbit libraries converted by this call.
+
+        """
+        if ncpus is None:
+            ncpus = self.config.settings.multiprocessing_settings['ncpus']
+        orblib_rows = self._get_one_row_per_orblib()
+        self.logger.info(f'Converting {len(orblib_rows)} orbit libraries '
+                         f'using {ncpus} cpus...')
+        input_list = [(row_id,
+                       compression,
+                       compression_level,
+                       remove_originals,
+                       write_caches) for row_id in orblib_rows.values()]
+        with Pool(ncpus) as p:
+            output = p.map(self._convert_orblib, input_list)
+        n_failed = output.count(None)
+        n_converted = output.count(True)
+        if n_failed > 0:
+            self.logger.warning(f'Conversion of {n_failed} orbit libraries '
+                                'failed, see the error messages above.')
+        self.logger.info(f'{n_converted} orbit libraries converted, '
+                         f'{output.count(False)} had been converted before.')
+        return n_converted
+
+    def _convert_orblib(self, input_data):
+        """Convert the orbit library of one model, see ``convert_orblibs``
+
+        Parameters
+        ----------
+        input_data : tuple
+            the row index of the model in the all_models table followed by
+            the arguments of ``LegacyOrbitLibrary.convert_orbit_library``
+
+        Returns
+        -------
+        bool or None
+            the return value of ``LegacyOrbitLibrary.convert_orbit_library``
+            or None if the conversion failed
+
+        """
+        row_id, *args = input_data
+        mod = self.get_model_from_row(row_id)
+        orblib = dyn_orblib.LegacyOrbitLibrary(config=self.config,
+                                               mod_dir=mod.directory_noml,
+                                               parset=mod.parset)
+        try:
+            return orblib.convert_orbit_library(*args)
+        except Exception as e:
+            self.logger.error(f'Cannot convert orbit library '
+                              f'{mod.directory_noml}: {e}')
+            return None
+
+    def purge_orblib_originals(self, ncpus=None):
+        """
+        Removes the verified originals of converted orbit libraries.
+
+        Runs ``LegacyOrbitLibrary.purge_orblib_originals`` on the orbit
+        library of each model with ``orblib_done=True`` in the all_models
+        table, in parallel. The originals kept by ``convert_orblibs`` are
+        removed if the converted orbit library matches its manifest and
+        the decompressed content of the original matches the content
+        checksum of the converted file. Failures are logged and do not stop
+        the purge of the other orbit libraries.
+
+        Parameters
+        ----------
+        ncpus : int or None, optional
+            number of orbit libraries processed in parallel. The default is
+            None (the multiprocessing setting ``ncpus``).
+
+        Returns
+        -------
+        int
+            The number of original files removed.
+
+        """
+        if ncpus is None:
+            ncpus = self.config.settings.multiprocessing_settings['ncpus']
+        orblib_rows = self._get_one_row_per_orblib()
+        with Pool(ncpus) as p:
+            output = p.map(self._purge_orblib_originals,
+                           list(orblib_rows.values()))
+        n_failed = output.count(None)
+        if n_failed > 0:
+            self.logger.warning(f'Purging the originals of {n_failed} orbit '
+                                'libraries failed, see the error messages '
+                                'above.')
+        n_removed = sum(n for n in output if n is not None)
+        self.logger.info(f'{n_removed} original orbit library files '
+                         'removed.')
+        return n_removed
+
+    def _purge_orblib_originals(self, row_id):
+        """Purge the originals of one model's orbit library
+
+        See ``purge_orblib_originals``.
+
+        Parameters
+        ----------
+        row_id : int
+            the row index of the model in the all_models table
+
+        Returns
+        -------
+        int or None
+            the number of original files removed or None if it failed
+
+        """
+        mod = self.get_model_from_row(row_id)
+        orblib = dyn_orblib.LegacyOrbitLibrary(config=self.config,
+                                               mod_dir=mod.directory_noml,
+                                               parset=mod.parset)
+        try:
+            return orblib.purge_orblib_originals()
+        except Exception as e:
+            self.logger.error(f'Cannot purge the originals of orbit library '
+                              f'{mod.directory_noml}: {e}')
+            return None
+
+    def _get_one_row_per_orblib(self):
+        """Find one model per orbit library
+
+        Returns
+        -------
+        dict
+            the row index of the first model with ``orblib_done=True`` of
+            each orbit library, keyed by the orbit library directory
+
+        """
+        orblib_rows = {}
+        for row_id, row in enumerate(self.table):
+            if row['orblib_done']:
+                orblib_dir = row['directory'][:row['directory'][:-1].rindex('/')]
+                orblib_rows.setdefault(orblib_dir, row_id)
+        return orblib_rows
+
 
 class Model(object):
     """A DYNAMITE model.
@@ -833,6 +1080,12 @@ class Model(object):
         the all_models_file will be searched for the directory name. If the
         all_models file does not exist, the model directory will be set to
         ``orblib_000_000/ml{ml}``.
+    low_fidelity : bool, optional
+        If True, the model uses a low-fidelity orbit library with the
+        reduced settings of the orblib setting ``low_fidelity``. Its
+        orbit library and weights are stored in the subdirectory
+        ``low_fidelity/`` of the orbit library directory, e.g.
+        ``orblib_000_000/low_fidelity/ml{ml}``. The default is False.
 
     Returns
     -------
@@ -840,7 +1093,11 @@ class Model(object):
     object when methods are run.
 
     """
-    def __init__(self, config=None, parset=None, directory=None):
+    def __init__(self,
+                 config=None,
+                 parset=None,
+                 directory=None,
+                 low_fidelity=False):
         self.logger = logging.getLogger(f'{__name__}.{__class__.__name__}')
         if config is None or parset is None:
             text = f'{__class__.__name__} needs configuration object and ' \
@@ -856,6 +1113,11 @@ class Model(object):
         else:
            self.directory=self.config.settings.io_settings['output_directory']\
                           + 'models/' + directory
+        self.low_fidelity = low_fidelity
+        if low_fidelity:
+            i_ml = self.directory[:-1].rindex('/') + 1
+            self.directory = self.directory[:i_ml] + LOW_FIDELITY_DIRECTORY \
+                             + self.directory[i_ml:]
         self.logger.debug(f'Model directory string: {self.directory}')
         self.directory_noml=self.directory[:self.directory[:-1].rindex('/')+1]
         self.logger.debug('Model directory string up to ml: '
@@ -1012,7 +1274,8 @@ class Model(object):
         orblib = dyn_orblib.LegacyOrbitLibrary(
                 config=self.config,
                 mod_dir=self.directory_noml,
-                parset=self.parset)
+                parset=self.parset,
+                low_fidelity=self.low_fidelity)
         orblib.get_orblib()
         return orblib
 
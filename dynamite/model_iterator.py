@@ -6,6 +6,7 @@ from pathos.multiprocessing import Pool
 import matplotlib.pyplot as plt
 
 from dynamite import parameter_space
+from dynamite import orblib as dyn_orblib
 from dynamite import plotter
 
 class ModelIterator(object):
@@ -206,7 +207,12 @@ class ModelInnerIterator(object):
             # TODO: assert dummy_chi2_function is a valid function of parset
         self.dummy_chi2_function = dummy_chi2_function
         self.ncpus = config.settings.multiprocessing_settings['ncpus']
+        self.solve_ml_families = \
+            config.settings.multiprocessing_settings['solve_ml_families']
         self.n_to_do = 0
+        # low-fidelity screening of new orbit libraries
+        self.low_fidelity = config.settings.orblib_settings['low_fidelity']
+        self.which_chi2 = config.validate_chi2()
 
     def run_iteration(self, split_orblib_weights=False):
         """Run one iteration step
@@ -217,7 +223,11 @@ class ModelInnerIterator(object):
         threads as defined in the ncpus parameter in the configuration file.
         In case multiple models comprise the same (new) orbit library it is
         ensured that they are calculated only once, avoiding conflicting
-        threads.
+        threads. If the orblib setting ``low_fidelity`` is given, new orbit
+        libraries are screened first, see ``screen_low_fidelity``. If the
+        multiprocessing setting ``solve_ml_families`` is True, all models of
+        an orbit library are run by the same process, see
+        ``run_ml_families``.
 
         Parameters
         ----------
@@ -252,6 +262,15 @@ class ModelInnerIterator(object):
             # save all_models here - as it is useful to have directories saved
             # even if the run fails and we don't reach the next save
             self.all_models.save()
+            if self.low_fidelity is not None and not self.do_dummy_run \
+                    and len(rows_to_do) > 0:
+                rows_to_do_orblib, rows_to_do_ml = \
+                    self.screen_low_fidelity(rows_to_do_orblib, rows_to_do_ml)
+                rows_to_do = np.array(sorted(rows_to_do_orblib+rows_to_do_ml),
+                                      dtype=int)
+                self.n_to_do = len(rows_to_do)
+                n_orblib = len(rows_to_do_orblib)
+                self.all_models.save()
             if split_orblib_weights:  # first the orblibs, then all weights
                 do_orblib, do_weights = True, False  # orblibs only
                 input_list_orblib = [i + (do_orblib, do_weights)
@@ -266,10 +285,19 @@ class ModelInnerIterator(object):
                 do_orblib, do_weights = False, True  # all the weights
                 input_list_ml = [i + (do_orblib, do_weights)
                                  for i in enumerate(rows_to_do)]
-                if len(rows_to_do) > 0:
+                if len(rows_to_do) > 0 and self.solve_ml_families:
+                    self.run_ml_families(list(rows_to_do),
+                                         do_orblib,
+                                         do_weights,
+                                         self.ncpus_weights)
+                elif len(rows_to_do) > 0:
                     with Pool(self.ncpus_weights) as p:
                         output = p.map(self.create_and_run_model, input_list_ml)
                     self.write_output_to_all_models_table(rows_to_do, output)
+            elif self.solve_ml_families:  # each orblib with all its weights
+                if len(rows_to_do) > 0:
+                    self.run_ml_families(list(rows_to_do), True, True,
+                                         self.ncpus)
             else:  # first the orblibs + their weights, then remaining weights
                 input_list_orblib = list(enumerate(rows_to_do_orblib,
                                                    start=n_orblib))
@@ -294,6 +322,218 @@ class ModelInnerIterator(object):
             self.delete_staging_files(rows_to_do) # delete all staging files
         return self.par_generator.status
 
+    def get_ml_families(self, rows):
+        """Group models by their orbit library
+
+        Parameters
+        ----------
+        rows : list of ints
+            Rows of the all_models table, the row of a new orbit library
+            must precede the rows of the other models using it.
+
+        Returns
+        -------
+        list of lists of ints
+            The rows of the models of each orbit library. The first row of
+            each orbit library is kept first (a new orbit library is
+            calculated with its ml), the other rows are sorted by ml.
+
+        """
+        families = {}
+        for row in rows:
+            directory = self.all_models.table['directory'][row]
+            orblib_dir = directory[:directory[:-1].rindex('/')+1]
+            families.setdefault(orblib_dir, []).append(row)
+        ml = self.all_models.table['ml']
+        return [family[:1] + sorted(family[1:], key=lambda row: ml[row])
+                for family in families.values()]
+
+    def run_ml_families(self, rows, get_orblib, get_weights, ncpus):
+        """Run the models of each orbit library in one process
+
+        Instead of running each model in a separate task, each parallel task
+        runs all models of one orbit library, see
+        ``create_and_run_ml_family``. The decoded orbit library and the
+        ml-independent weight solver constraints are then kept in the
+        process' memory cache (see the orblib setting
+        ``losvd_memory_cache_mb``) and re-used for all its ml values, instead
+        of being read by every model's process. Writes the output to the
+        all_models table.
+
+        Parameters
+        ----------
+        rows : list of ints
+            Rows of the all_models table to run, see ``get_ml_families``.
+        get_orblib : bool
+            Whether the orbit libraries need to be computed, see
+            ``create_and_run_model``.
+        get_weights : bool
+            Whether the weights need to be computed, see
+            ``create_and_run_model``.
+        ncpus : int
+            Number of parallel processes.
+
+        Returns
+        -------
+        None.
+
+        """
+        families = self.get_ml_families(rows)
+        input_list = []
+        rows = []
+        for family in families:
+            input_list.append(([(len(rows) + j, row)
+                                for j, row in enumerate(family)],
+                               get_orblib,
+                               get_weights))
+            rows += family
+        self.logger.info(f'Running {len(rows)} model(s) of {len(families)} '
+                         'orbit libraries, one orbit library per process.')
+        with Pool(ncpus) as p:
+            output = p.map(self.create_and_run_ml_family, input_list)
+        output = [model_output for family_output in output
+                  for model_output in family_output]
+        self.write_output_to_all_models_table(rows, output)
+
+    def create_and_run_ml_family(self, data_input):
+        """Create and run all models of an orbit library
+
+        Parameters
+        ----------
+        data_input : tuple of length 3
+            (models, get_orblib, get_weights) where models is a list of
+            (i, row) tuples of the models of an orbit library and get_orblib
+            and get_weights are as in ``create_and_run_model``. The models
+            are run in this order.
+
+        Returns
+        -------
+        list of tuples
+            the output of ``create_and_run_model`` for each model. The
+            process' orbit library memory cache is cleared afterwards.
+
+        """
+        models, get_orblib, get_weights = data_input
+        output = [self.create_and_run_model((i, row, get_orblib, get_weights))
+                  for i, row in models]
+        # release the memory, the next family uses another orbit library
+        dyn_orblib.orblib_cache.clear()
+        return output
+
+    def screen_low_fidelity(self, rows_orblib, rows_ml):
+        """Screen new orbit libraries with low-fidelity models
+
+        For each new orbit library, a low-fidelity model with the reduced
+        settings of the orblib setting ``low_fidelity`` is run (orbit library
+        and weight solver). Its chi2 (as given in ``which_chi2``) is stored
+        in the ``low_fidelity_chi2`` column of the all_models table for all
+        models using the orbit library. Only orbit libraries whose
+        low-fidelity chi2 lies within the ``low_fidelity`` threshold of the
+        best low-fidelity chi2 in the all_models table get promoted to full
+        resolution. If there is no finite low-fidelity chi2 to compare with
+        (e.g. if all low-fidelity models failed), all new orbit libraries
+        are promoted. The other models, including those re-using their orbit
+        libraries, are entered in the all_models table with
+        ``screened == True``, ``orblib_done == False``, and nan chi2 values,
+        as are new models of orbit libraries screened out earlier.
+        The low-fidelity orbit libraries and weights remain in the
+        ``low_fidelity/`` subdirectories of the orbit library directories.
+
+        Parameters
+        ----------
+        rows_orblib : list of ints
+            Rows of the all_models table with new orbit libraries.
+        rows_ml : list of ints
+            Rows of the all_models table with existing orbit libraries.
+
+        Returns
+        -------
+        tuple of two lists of ints
+            (rows_orblib, rows_ml) of the promoted models.
+
+        """
+        input_list = list(enumerate(rows_orblib))
+        chi2 = []
+        if len(input_list) > 0:
+            with Pool(self.ncpus) as p:
+                chi2 = p.map(self.run_low_fidelity_model, input_list)
+        chi2 = np.array(chi2, dtype=float)
+        t = self.all_models.table
+        dirs = [d[:d[:-1].rindex('/')+1] if d else d for d in t['directory']]
+        # low-fidelity chi2 of earlier and new orbit libraries
+        chi2_of_dir = {dirs[r]: t['low_fidelity_chi2'][r]
+                       for r in range(len(t))
+                       if not np.isnan(t['low_fidelity_chi2'][r])}
+        chi2_of_dir.update(zip([dirs[r] for r in rows_orblib], chi2))
+        for r in rows_orblib + rows_ml:
+            if dirs[r] in chi2_of_dir:
+                t['low_fidelity_chi2'][r] = chi2_of_dir[dirs[r]]
+        # the best low-fidelity chi2 of all models so far, including
+        # previous runs
+        thresh = self.low_fidelity['threshold_del_chi2']
+        if all(np.isnan(t['low_fidelity_chi2'])):
+            # nothing to compare with, e.g. if all low-fidelity models failed
+            best_chi2 = np.nan
+            promoted = np.ones(len(chi2), dtype=bool)
+            self.logger.warning('No low-fidelity chi2 to compare with, all '
+                                f'{len(rows_orblib)} orbit libraries are '
+                                'promoted.')
+        else:
+            best_chi2 = np.nanmin(t['low_fidelity_chi2'])
+            promoted = chi2 <= best_chi2 + thresh
+        # new models of earlier screened orbit libraries remain screened
+        screened_dirs = [dirs[r] for r, p in zip(rows_orblib, promoted)
+                         if not p] \
+                        + [dirs[r] for r in np.flatnonzero(t['screened'])]
+        rows_screened = [r for r in rows_orblib + rows_ml
+                         if dirs[r] in screened_dirs]
+        time = str(np.datetime64('now', 'ms'))
+        output = [(False, False, np.nan, np.nan, np.nan, False, time)] \
+                 * len(rows_screened)
+        self.write_output_to_all_models_table(rows_screened, output)
+        t['screened'][rows_screened] = True
+        self.logger.info(f'Low-fidelity screening: {sum(promoted)} of '
+                         f'{len(rows_orblib)} orbit libraries promoted, '
+                         f'best low-fidelity {self.which_chi2}={best_chi2}, '
+                         f'threshold {thresh}.')
+        rows_orblib = [r for r in rows_orblib if r not in rows_screened]
+        rows_ml = [r for r in rows_ml if r not in rows_screened]
+        return rows_orblib, rows_ml
+
+    def run_low_fidelity_model(self, data_input):
+        """Run the low-fidelity version of a model
+
+        Parameters
+        ----------
+        data_input : tuple of length 2
+            (i, row) where i is the index of a new orbit library in this
+            iteration, and row is the row index of the all_models table
+
+        Returns
+        -------
+        float
+            the low-fidelity model's chi2 as given in ``which_chi2``, nan if
+            the orbit library or weight solving failed
+
+        """
+        i, row = data_input
+        mod = self.all_models.get_model_from_row(row, low_fidelity=True)
+        self.logger.info(f'... screening orbit library {i+1}: '
+                         f'{mod.directory}.')
+        mod.setup_directories()
+        cwd = os.getcwd()
+        try:
+            orblib = mod.get_orblib()
+            _ = mod.get_weights(orblib)
+            chi2 = getattr(mod, self.which_chi2)
+        except Exception as e:
+            os.chdir(cwd)
+            chi2 = np.nan
+            self.logger.warning(f'Low-fidelity model {i+1} (row {row}, '
+                                f'directory {mod.directory}) failed, it '
+                                f'will not be promoted: {e}')
+        return chi2
+
     def delete_staging_files(self, rows):
         """
         Deletes staging files.
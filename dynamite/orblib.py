@@ -1,9 +1,19 @@
 import os
+import array
 import subprocess
 import shutil
 import logging
+import bz2
+import gzip
+import lzma
+import collections
+import concurrent.futures
+import hashlib
+import json
+import tempfile
+import threading
+import time
 import numpy as np
-from scipy.io import FortranFile
 from astropy import table
 import astropy.units as u
 import matplotlib.pyplot as plt
@@ -13,6 +23,465 @@ from dynamite import physical_system as physys
 from dynamite import kinematics as dyn_kin
 from dynamite.constants import PARSEC_KM
 
+
+# Codecs of the orbit library files: file name extension, magic bytes at the
+# start of the file, a function opening the file for reading, and shell
+# commands compressing and decompressing a file to stdout. Uncompressed files
+# get their own extension to distinguish them from the (possibly incomplete)
+# output of the orbit integrator.
+ORBLIB_CODECS = {
+    'bz2': {'extension':'.bz2',
+            'magic':b'BZh',
+            'open':bz2.open,
+            'compress':'bzip2 -c',
+            'decompress':'bunzip2 -c'},
+    'gzip': {'extension':'.gz',
+             'magic':b'\x1f\x8b',
+             'open':gzip.open,
+             'compress':'gzip -c',
+             'decompress':'gzip -dc'},
+    'lzma': {'extension':'.xz',
+             'magic':b'\xfd7zXZ\x00',
+             'open':lzma.open,
+             'compress':'xz -c',
+             'decompress':'xz -dc'},
+    'none': {'extension':'.raw',
+             'magic':b'',
+             'open':open,
+             'compress':'cat',
+             'decompress':'cat'},
+}
+
+
+def find_orblib_file(file_name):
+    """Find an orbit library file written with any of the ``ORBLIB_CODECS``
+
+    Parameters
+    ----------
+    file_name : str
+        name of the file without the codec's extension, e.g.
+        '.../datfil/orblib_qgrid.dat'
+
+    Returns
+    -------
+    str or None
+        the name of the existing file including the codec's extension, or
+        None if there is no such file
+
+    """
+    for codec in ORBLIB_CODECS.values():
+        if os.path.isfile(file_name + codec['extension']):
+            return file_name + codec['extension']
+    return None
+
+
+def get_orblib_file_codec(file_name):
+    """Detect the codec of an orbit library file from its magic bytes
+
+    Parameters
+    ----------
+    file_name : str
+        name of the existing file
+
+    Returns
+    -------
+    str
+        a key of ``ORBLIB_CODECS``, 'none' for uncompressed files
+
+    """
+    with open(file_name, 'rb') as f:
+        magic = f.read(6)
+    for name, codec in ORBLIB_CODECS.items():
+        if magic.startswith(codec['magic']):
+            return name
+
+
+def open_orblib_file(file_name):
+    """Open an orbit library file for binary reading, decompressing on the fly
+
+    Parameters
+    ----------
+    file_name : str
+        name of the existing file, compressed with any of the
+        ``ORBLIB_CODECS``
+
+    Returns
+    -------
+    binary file object
+
+    """
+    codec = get_orblib_file_codec(file_name)
+    return ORBLIB_CODECS[codec]['open'](file_name, 'rb')
+
+
+def get_orblib_content_checksum(file_name):
+    """Checksum of the decompressed content of an orbit library file
+
+    Parameters
+    ----------
+    file_name : str
+        name of the existing file, compressed with any of the
+        ``ORBLIB_CODECS``
+
+    Returns
+    -------
+    str
+        the sha256 hex digest of the decompressed content
+
+    """
+    checksum = hashlib.sha256()
+    with open_orblib_file(file_name) as f:
+        for block in iter(lambda: f.read(2**24), b''):
+            checksum.update(block)
+    return checksum.hexdigest()
+
+
+def strip_orblib_codec_extension(file_name):
+    """Remove the codec's extension from an orbit library file name
+
+    Parameters
+    ----------
+    file_name : str
+        name of the file including the extension of one of the
+        ``ORBLIB_CODECS``, e.g. 'orblib_qgrid.dat.bz2'
+
+    Returns
+    -------
+    str
+        the file name without the extension, e.g. 'orblib_qgrid.dat', or
+        file_name if it has none of the extensions
+
+    """
+    for codec in ORBLIB_CODECS.values():
+        if file_name.endswith(codec['extension']):
+            return file_name[:-len(codec['extension'])]
+    return file_name
+
+
+# name of the manifest of a complete orbit library in its datfil/ directory
+ORBLIB_MANIFEST = 'orblib_manifest.json'
+
+# orblib settings overridden by the low_fidelity orblib setting
+LOW_FIDELITY_SETTINGS = ('nE', 'nI2', 'nI3', 'dithering', 'orbital_periods')
+
+
+def read_orblib_manifest(datfil):
+    """Read the manifest of a complete orbit library
+
+    The manifest is written by ``LegacyOrbitLibrary._write_orblib_manifest``
+    once the orbit library is complete.
+
+    Parameters
+    ----------
+    datfil : str
+        the orbit library's datfil/ directory, including the trailing slash
+
+    Returns
+    -------
+    dict or None
+        the manifest, None if there is no (readable) manifest
+
+    """
+    try:
+        with open(datfil + ORBLIB_MANIFEST) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logging.getLogger(__name__).warning(
+            f'Could not read {datfil}{ORBLIB_MANIFEST}: {e}.')
+        return None
+
+
+def get_orblib_layout(datfil):
+    """Get the layout of a complete orbit library
+
+    Only the orbit library's manifest is read. Orbit libraries without
+    manifest, e.g. written by earlier DYNAMITE versions, are probed file by
+    file.
+
+    Parameters
+    ----------
+    datfil : str
+        the orbit library's datfil/ directory, including the trailing slash
+
+    Returns
+    -------
+    str or None
+        'new' for the files {fileroot}_qgrid.dat and
+        {fileroot}_losvd_hist.dat (and optionally {fileroot}_pops.dat),
+        'legacy' for the files {fileroot}.dat, None if the orbit library is
+        incomplete. If both layouts exist, 'new' is returned.
+
+    """
+    manifest = read_orblib_manifest(datfil)
+    if manifest is not None:
+        return manifest['layout']
+    if all(find_orblib_file(f'{datfil}{fileroot}{f}.dat')
+           for fileroot in ('orblib', 'orblibbox')
+           for f in ('_qgrid', '_losvd_hist')):
+        return 'new'
+    if find_orblib_file(f'{datfil}orblib.dat') \
+            and find_orblib_file(f'{datfil}orblibbox.dat'):
+        return 'legacy'
+    return None
+
+
+class FortranRecordReader(object):
+    """Read Fortran unformatted sequential records from a binary stream
+
+    A minimal replacement for ``scipy.io.FortranFile`` which, unlike the
+    latter, works with any readable binary file object (e.g., the streaming
+    decompressors ``bz2.BZ2File``), as it only relies on the object's
+    ``readinto`` method. Each record consists of a 4 byte length marker, the
+    payload, and a repetition of the length marker.
+
+    Parameters
+    ----------
+    fileobj : binary file object
+        The stream to read from, supporting ``fileobj.readinto(buffer)``.
+    name : str, optional
+        A name for the stream used in error messages. The default is ''.
+
+    """
+    header_dtype = np.dtype(np.uint32)
+
+    def __init__(self, fileobj, name=''):
+        self.fileobj = fileobj
+        self.name = name
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Close the underlying stream
+        """
+        self.fileobj.close()
+
+    def _read_bytes(self, n):
+        # reading into a bytearray yields writeable numpy arrays
+        buffer = bytearray(n)
+        view, n_read = memoryview(buffer), 0
+        while n_read < n:
+            n_new = self.fileobj.readinto(view[n_read:])
+            if not n_new:
+                raise EOFError(f'Unexpected end of file in {self.name}.')
+            n_read += n_new
+        return buffer
+
+    def _read_size(self):
+        buffer = self._read_bytes(self.header_dtype.itemsize)
+        return int(np.frombuffer(buffer, dtype=self.header_dtype)[0])
+
+    def read_record(self, *dtypes):
+        """Read one record
+
+        Parameters
+        ----------
+        *dtypes : numpy dtypes
+            If a single dtype is given, the record is interpreted as a 1d
+            array of that dtype. If several dtypes are given, the record must
+            hold exactly one item of each dtype (as in
+            ``scipy.io.FortranFile.read_record``).
+
+        Returns
+        -------
+        numpy array or list of numpy arrays
+            A 1d array if a single dtype is given, otherwise a list of 1d
+            arrays of length one.
+
+        Raises
+        ------
+        ValueError
+            If the record size does not match the dtypes or if the record's
+            header and footer differ.
+
+        """
+        dtypes = [np.dtype(dtype) for dtype in dtypes]
+        size = self._read_size()
+        buffer = self._read_bytes(size)
+        if size != self._read_size():
+            raise ValueError('Record header and footer differ in '
+                             f'{self.name}.')
+        if len(dtypes) == 1:
+            if size % dtypes[0].itemsize != 0:
+                raise ValueError(f'Record size {size} in {self.name} is not '
+                                 f'a multiple of {dtypes[0].itemsize}.')
+            return np.frombuffer(buffer, dtype=dtypes[0])
+        if size != sum(dtype.itemsize for dtype in dtypes):
+            raise ValueError(f'Record size {size} in {self.name} does not '
+                             'match the requested dtypes.')
+        data, offset = [], 0
+        for dtype in dtypes:
+            data.append(np.frombuffer(buffer,
+                                      dtype=dtype,
+                                      count=1,
+                                      offset=offset))
+            offset += dtype.itemsize
+        return data
+
+    def skip_record(self):
+        """Skip one record by seeking past it, without decoding it
+
+        Raises
+        ------
+        ValueError
+            If the record's header and footer differ.
+
+        """
+        size = self._read_size()
+        self.fileobj.seek(size, os.SEEK_CUR)
+        if size != self._read_size():
+            raise ValueError('Record header and footer differ in '
+                             f'{self.name}.')
+
+    def index_records(self):
+        """Get the offsets of all remaining records in the stream
+
+        Requires a seekable stream, e.g., an uncompressed file.
+
+        Returns
+        -------
+        list of int
+            The byte offsets of the starts of the records, followed by the
+            offset of the end of the last record.
+
+        """
+        offsets = [self.fileobj.tell()]
+        end = self.fileobj.seek(0, os.SEEK_END)
+        self.fileobj.seek(offsets[0])
+        while offsets[-1] < end:
+            self.skip_record()
+            offsets.append(self.fileobj.tell())
+        return offsets
+
+    def read_ints(self, dtype=np.int32):
+        """Read a record of integers, see ``read_record``
+        """
+        return self.read_record(dtype)
+
+    def read_reals(self, dtype=float):
+        """Read a record of reals, see ``read_record``
+        """
+        return self.read_record(dtype)
+
+
+class OrbitLibraryCache(object):
+    """Process-local LRU cache of decoded orbit libraries
+
+    Holds arbitrary data (e.g., decoded LOSVD histograms and masses) under a
+    key, together with a file key identifying the files the data was read
+    from. Entries are evicted in least recently used order as soon as the
+    total size of all entries exceeds ``max_bytes``. The cache is
+    thread-safe, but every process has its own cache.
+
+    Parameters
+    ----------
+    max_bytes : int, optional
+        The memory budget in bytes, 0 disables the cache. The default is 0.
+
+    """
+    def __init__(self, max_bytes=0):
+        self.logger = logging.getLogger(f'{__name__}.{__class__.__name__}')
+        self.max_bytes = max_bytes
+        self.n_bytes = 0
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def _evict(self, max_bytes):
+        # evict least recently used entries until at most max_bytes are held
+        while self._entries and self.n_bytes > max_bytes:
+            key, entry = self._entries.popitem(last=False)
+            self.n_bytes -= entry['n_bytes']
+            self.logger.debug(f'Evicted {key} from orbit library cache.')
+
+    def set_max_bytes(self, max_bytes):
+        """Set the memory budget, evicting entries if needed
+
+        Parameters
+        ----------
+        max_bytes : int
+            The memory budget in bytes, 0 disables the cache.
+
+        """
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict(max_bytes)
+
+    def get(self, key, file_key):
+        """Get the data stored under key
+
+        Parameters
+        ----------
+        key : hashable
+            The key of the entry.
+        file_key : array
+            The entry is only returned if it was stored with an identical
+            file key, otherwise it is outdated and removed.
+
+        Returns
+        -------
+        The stored data or None if there is no (valid) entry.
+
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if not np.array_equal(entry['file_key'], file_key):
+                del self._entries[key]
+                self.n_bytes -= entry['n_bytes']
+                self.logger.debug(f'Orbit library cache entry {key} is '
+                                  'outdated.')
+                return None
+            self._entries.move_to_end(key)
+            return entry['data']
+
+    def put(self, key, file_key, data, n_bytes):
+        """Store data under key, replacing an existing entry
+
+        Data larger than ``max_bytes`` is not stored.
+
+        Parameters
+        ----------
+        key : hashable
+            The key of the entry.
+        file_key : array
+            Identifies the files the data was read from, see ``get``.
+        data : object
+            The data to store. It must not be modified after storing it.
+        n_bytes : int
+            The memory size of data.
+
+        """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self.n_bytes -= entry['n_bytes']
+            if n_bytes > self.max_bytes:
+                return
+            self._evict(self.max_bytes - n_bytes)
+            self._entries[key] = {'file_key': file_key,
+                                  'data': data,
+                                  'n_bytes': n_bytes}
+            self.n_bytes += n_bytes
+
+    def clear(self):
+        """Remove all entries
+        """
+        with self._lock:
+            self._entries.clear()
+            self.n_bytes = 0
+
+
+# decoded orbit libraries of this process, see
+# LegacyOrbitLibrary.read_losvd_histograms
+orblib_cache = OrbitLibraryCache()
+
+
 class OrbitLibrary(object):
     """An abstract class for orbit libraries.
 
@@ -40,11 +509,24 @@ class OrbitLibrary(object):
 class LegacyOrbitLibrary(OrbitLibrary):
     """Orbit libraries calculated from `legacy` Fortan programs
 
+    Parameters
+    ----------
+    config : a ``dyn.config_reader.Configuration`` object
+    mod_dir : str
+        The orbit library directory (the model directory without the ml part)
+    parset : row of an Astropy Table
+        contains the values of the potential parameters for this model
+    low_fidelity : bool, optional
+        If True, the orbit library uses the reduced numbers of orbits and
+        orbital periods given in the orblib setting ``low_fidelity``.
+        The default is False.
+
     """
     def __init__(self,
                  config=None,
                  mod_dir=None,
-                 parset=None):
+                 parset=None,
+                 low_fidelity=False):
         self.logger = logging.getLogger(f'{__name__}.{__class__.__name__}')
         if config is None:
             text = f'{__class__.__name__} needs configuration object, ' \
@@ -55,10 +537,26 @@ class LegacyOrbitLibrary(OrbitLibrary):
         self.parset = parset
         self.system = config.system
         self.settings = config.settings.orblib_settings
+        self.low_fidelity = low_fidelity
+        if low_fidelity:
+            self.settings = dict(self.settings)
+            for key in LOW_FIDELITY_SETTINGS:
+                if key in self.settings['low_fidelity']:
+                    self.settings[key] = self.settings['low_fidelity'][key]
         self.legacy_directory = config.settings.legacy_settings['directory']
         self.in_dir = config.settings.io_settings['input_directory']
+        # initial conditions shared by orbit libraries with the same inputs
+        self.ics_cache_dir = \
+            config.settings.io_settings['model_directory'] + 'ics_cache/'
         self.orblibs_in_parallel = \
             config.settings.multiprocessing_settings['orblibs_in_parallel']
+        self.read_orblibs_in_parallel = config.settings.\
+            multiprocessing_settings['read_orblibs_in_parallel']
+        self.orblib_integration_chunks = config.settings.\
+            multiprocessing_settings['orblib_integration_chunks']
+        # directory of the uncompressed integrator output, relative to
+        # mod_dir or absolute, see get_orblib
+        self.raw_orblib_dir = 'datfil/'
         if len(config.all_models.table) == 0:
             self.velocity_scaling_factor = 1.0
         else:
@@ -72,63 +570,387 @@ class LegacyOrbitLibrary(OrbitLibrary):
         Writes and executes bash scripts to (i) calculate orbit initial
         conditions, (ii) calculate orbit libraries, (iii) calculate aperture and
         3D grid masses for the MGE. If orbit libraries for this model already
-        exist, then this method does nothing.
+        exist, then this method does nothing. If the orblib setting
+        ``store_directory`` is given and the store holds an orbit library
+        with identical inputs, it is linked into datfil/ instead of
+        integrating the orbits, and new orbit libraries are added to the
+        store.
 
         Returns
         -------
         Creates the following output files in ``output/models/*/datfil/``:
             - begin.dat                     (ics for tube orbits)
             - beginbox.dat                  (ics for box orbits)
-            - orblib.dat.bz2                (zipped tube orbit library)
+            - orblib_*.dat.bz2              (zipped tube orbit library)
             - orblib.dat_orbclass.out       (orbit classification for tube orbs)
-            - orblibbox.dat.bz2             (zipped box orbit library)
+            - orblibbox_*.dat.bz2           (zipped box orbit library)
             - orblibbox.dat_orbclass.out    (orbit classification for box orbs)
             - mass_aper.dat                 (MGE masses in apertures)
             - mass_qgrid.dat                (MGE masses in 3D grid)
             - mass_radmass.dat              (MGE masses in radial bins)
+            - orblib_manifest.json          (complete orbit library's files)
             - +8 log and status files
 
         """
-        # check if orbit library was calculated already (FIXME: improve this!)
-        f_root = self.mod_dir + 'datfil/'
-        check = os.path.isfile(f_root + 'orblib.dat.bz2') \
-                and os.path.isfile(f_root + 'orblibbox.dat.bz2')
-        if not check:
-            check = os.path.isfile(f_root + 'orblib_qgrid.dat.bz2') \
-                    and os.path.isfile(f_root + 'orblib_losvd_hist.dat.bz2') \
-                    and os.path.isfile(f_root + 'orblibbox_qgrid.dat.bz2') \
-                    and os.path.isfile(f_root + 'orblibbox_losvd_hist.dat.bz2')
-        if not check:  # need to calculate orblib
-            # prepare the fortran input files for orblib
-            self.create_fortran_input_orblib(self.mod_dir+'infil/')
-            if self.system.is_bar_disk_system():
-                stars = self.system.get_unique_bar_component()
-            else:
-                stars = self.system.get_unique_triaxial_visible_component()
-            # create the kinematics and populations input files for each
-            # kinematic dataset and population dataset with own apertures
-            pops = [p for p in stars.population_data if p.kin_aper is None]
-            for data_set in stars.kinematic_data + pops:
-                # copy aperture and bins files across
-                shutil.copyfile(self.in_dir + data_set.aperturefile,
-                                self.mod_dir + f'infil/{data_set.aperturefile}')
-                shutil.copyfile(self.in_dir + data_set.binfile,
-                                self.mod_dir + f'infil/{data_set.binfile}')
-            # calculate orbit libary
-            file1 = 'begin.dat'
-            file2 = 'beginbox.dat'
-            check1 = os.path.isfile(self.mod_dir + f'datfil/{file1}')
-            check2 = os.path.isfile(self.mod_dir + f'datfil/{file2}')
-            if check1 + check2 != 2:
-                if check1:
-                    os.remove(self.mod_dir + f'datfil/{file1}')
-                if check2:
-                    os.remove(self.mod_dir + f'datfil/{file2}')
-                self.get_orbit_ics()
-            if self.orblibs_in_parallel:
-                self.get_orbit_library_par()
-            else:
-                self.get_orbit_library()
+        # check if orbit library was calculated already
+        if get_orblib_layout(self.mod_dir + 'datfil/') is None:
+            store_key = None
+            if self.settings['store_directory'] is not None:
+                # identical orbit library in the store?
+                self._write_orblib_input_files()
+                store_key = self._get_orblib_store_key()
+                if self._get_orblib_from_store(store_key):
+                    return
+            # need to calculate orblib
+            scratch_directory = self.settings['scratch_directory']
+            if scratch_directory is not None:
+                # the uncompressed files never reach the model directory
+                os.makedirs(scratch_directory, exist_ok=True)
+                self.raw_orblib_dir = tempfile.mkdtemp(
+                    prefix='orblib_',
+                    dir=os.path.abspath(scratch_directory)) + '/'
+                # Fortran file names have at most 80 characters
+                longest = f'{self.raw_orblib_dir}orblibbox_chunk_000/' \
+                          'orblibbox.dat_orbclass.out'
+                if len(longest) > 80:
+                    os.rmdir(self.raw_orblib_dir)
+                    text = 'The path of the orblib scratch_directory ' \
+                           f'{scratch_directory} is too long.'
+                    self.logger.error(text)
+                    raise ValueError(text)
+            try:
+                self._integrate_orbit_library()
+            finally:
+                if scratch_directory is not None:
+                    shutil.rmtree(self.raw_orblib_dir, ignore_errors=True)
+                    self.raw_orblib_dir = 'datfil/'
+            if self._write_orblib_manifest() is not None \
+                    and store_key is not None:
+                self._add_orblib_to_store(store_key)
+
+    def _integrate_orbit_library(self):
+        """Write the input files and run all Fortran programs for the orblib
+        """
+        # remove incomplete orbit library files, possibly of other codecs
+        for fileroot in 'orblib', 'orblibbox':
+            for f in '_qgrid', '_losvd_hist', '_pops':
+                f_name = f'{self.mod_dir}datfil/{fileroot}{f}.dat'
+                while find_orblib_file(f_name) is not None:
+                    os.remove(find_orblib_file(f_name))
+        # the manifest marks a complete orbit library
+        if os.path.isfile(self.mod_dir + 'datfil/' + ORBLIB_MANIFEST):
+            os.remove(self.mod_dir + 'datfil/' + ORBLIB_MANIFEST)
+        self._write_orblib_input_files()
+        # calculate orbit libary
+        file1 = 'begin.dat'
+        file2 = 'beginbox.dat'
+        check1 = os.path.isfile(self.mod_dir + f'datfil/{file1}')
+        check2 = os.path.isfile(self.mod_dir + f'datfil/{file2}')
+        if check1 + check2 != 2:
+            if check1:
+                os.remove(self.mod_dir + f'datfil/{file1}')
+            if check2:
+                os.remove(self.mod_dir + f'datfil/{file2}')
+            self.get_orbit_ics()
+        if self.orblib_integration_chunks > 1:
+            self.get_orbit_library_chunked()
+        elif self.orblibs_in_parallel:
+            self.get_orbit_library_par()
+        else:
+            self.get_orbit_library()
+
+    def _write_orblib_input_files(self):
+        """Write the input files of the Fortran programs to infil/
+
+        Writes the input files for orblib and copies the aperture and bins
+        files of the kinematics and populations with own apertures.
+
+        """
+        # prepare the fortran input files for orblib
+        self.create_fortran_input_orblib(self.mod_dir+'infil/')
+        # create the kinematics and populations input files for each
+        # kinematic dataset and population dataset with own apertures
+        for data_set in self._get_aperture_data_sets():
+            # copy aperture and bins files across
+            shutil.copyfile(self.in_dir + data_set.aperturefile,
+                            self.mod_dir + f'infil/{data_set.aperturefile}')
+            shutil.copyfile(self.in_dir + data_set.binfile,
+                            self.mod_dir + f'infil/{data_set.binfile}')
+
+    def _get_aperture_data_sets(self):
+        """The kinematics and populations with own aperture and bins files
+
+        Returns
+        -------
+        list
+            the kinematic data sets followed by the population data sets
+            not sharing the apertures of a kinematic data set
+
+        """
+        if self.system.is_bar_disk_system():
+            stars = self.system.get_unique_bar_component()
+        else:
+            stars = self.system.get_unique_triaxial_visible_component()
+        pops = [p for p in stars.population_data if p.kin_aper is None]
+        return stars.kinematic_data + pops
+
+    def _get_orblib_store_key(self):
+        """Content address of the orbit library in the orblib store
+
+        An orbit library is fully determined by the input files of the
+        Fortran programs in infil/ (see ``_write_orblib_input_files``), the
+        Fortran programs themselves, and the number of chunks the orbits
+        are integrated in (see ``get_orbit_library_chunked``), as each
+        chunk draws its own random numbers.
+
+        Returns
+        -------
+        str
+            the sha256 hex digest of the names, sizes, and contents of the
+            input files and Fortran programs and of the number of chunks
+
+        """
+        in_files = ['parameters_pot.in', 'parameters_lum.in', 'orbstart.in',
+                    'orblib.in', 'orblibbox.in', 'triaxmass.in',
+                    'triaxmassbin.in']
+        for data_set in self._get_aperture_data_sets():
+            in_files += [data_set.aperturefile, data_set.binfile]
+        files = [f'{self.mod_dir}infil/{f}' for f in in_files]
+        if self.system.is_bar_disk_system():
+            programs = ['orbitstart_bar', 'orblib_bar']
+        else:
+            programs = ['orbitstart', 'orblib_new_mirror']
+        programs += ['triaxmass', 'triaxmassbin']
+        files += [f'{self.legacy_directory}/{f}' for f in programs]
+        checksum = hashlib.sha256()
+        for f_name in files:
+            if not os.path.isfile(f_name):
+                checksum.update(f'{os.path.basename(f_name)} -1\n'.encode())
+                continue
+            checksum.update(f'{os.path.basename(f_name)} '
+                            f'{os.path.getsize(f_name)}\n'.encode())
+            with open(f_name, 'rb') as f:
+                for block in iter(lambda: f.read(2**24), b''):
+                    checksum.update(block)
+        if self.orblib_integration_chunks > 1:
+            # unchunked orbit libraries keep the keys of earlier versions
+            checksum.update(f'orblib_integration_chunks '
+                            f'{self.orblib_integration_chunks}\n'.encode())
+        return checksum.hexdigest()
+
+    def _get_orblib_store_files(self):
+        """Names of the files of a complete orbit library in datfil/
+
+        Returns
+        -------
+        list of str
+            the orbit library files, the orbit classification, MGE mass,
+            and initial conditions files, and the manifest (last)
+
+        """
+        datfil = self.mod_dir + 'datfil/'
+        manifest = read_orblib_manifest(datfil)
+        files = list(manifest['files'].keys())
+        for f_name in ['begin.dat', 'beginbox.dat', 'orbstart.dat',
+                       'orblib.dat_orbclass.out',
+                       'orblibbox.dat_orbclass.out',
+                       'mass_aper.dat', 'mass_qgrid.dat', 'mass_radmass.dat']:
+            if os.path.isfile(datfil + f_name):
+                files.append(f_name)
+        return files + [ORBLIB_MANIFEST]
+
+    def _link_or_copy(self, source, destination):
+        """Hard link source to destination, copy it if linking fails
+
+        Parameters
+        ----------
+        source : str
+            an existing file
+        destination : str
+            the new file, replaced atomically if it exists
+
+        """
+        tmp_file = f'{destination}.{os.getpid()}.tmp'
+        if os.path.lexists(tmp_file):
+            os.remove(tmp_file)
+        try:
+            os.link(source, tmp_file)
+        except OSError:  # e.g., different file systems
+            shutil.copy2(source, tmp_file)
+        os.replace(tmp_file, destination)
+
+    def _get_orblib_from_store(self, key):
+        """Link an orbit library with identical inputs from the orblib store
+
+        Parameters
+        ----------
+        key : str
+            the orbit library's content address, see
+            ``_get_orblib_store_key``
+
+        Returns
+        -------
+        bool
+            True if the orbit library was found in the store and linked
+            into datfil/, False otherwise
+
+        """
+        entry = os.path.join(self.settings['store_directory'], key) + '/'
+        if not os.path.isfile(entry + ORBLIB_MANIFEST):
+            return False
+        try:
+            # the manifest comes last and marks the orbit library complete
+            files = [f for f in sorted(os.listdir(entry))
+                     if f != ORBLIB_MANIFEST] + [ORBLIB_MANIFEST]
+            self._link_stored_files(entry, files)
+        except OSError as e:  # e.g., evicted meanwhile
+            self.logger.warning(f'Could not use orbit library {entry} from '
+                                f'the store: {e}. Integrating it instead.')
+            return False
+        self.logger.info(f'Orbit library {self.mod_dir} linked from the '
+                         f'store {entry}.')
+        return True
+
+    def _add_orblib_to_store(self, key):
+        """Add the complete orbit library to the orblib store
+
+        The files are hard linked (or copied) to a temporary directory in
+        the store, which is then renamed to the content address ``key``. If
+        the store already holds the orbit library (e.g., added by another
+        process meanwhile), the store is left unchanged. Failing to add the
+        orbit library is not an error. Afterwards, the store is cleaned up,
+        see ``_evict_orblib_store``.
+
+        Parameters
+        ----------
+        key : str
+            the orbit library's content address, see
+            ``_get_orblib_store_key``
+
+        """
+        store = self.settings['store_directory']
+        try:
+            if self._store_datfil_files(store,
+                                        key,
+                                        self._get_orblib_store_files()):
+                self.logger.debug(f'Orbit library {self.mod_dir} added to the '
+                                  f'store {store}.')
+        except OSError as e:
+            self.logger.warning(f'Could not add orbit library {self.mod_dir} '
+                                f'to the store {store}: {e}.')
+        self._evict_orblib_store()
+
+    def _store_datfil_files(self, store, key, file_names):
+        """Hard link (or copy) files of datfil/ to a new directory in a store
+
+        The files are linked to a temporary directory in ``store``, which is
+        then renamed to ``key``, so that the directory ``key`` is always
+        complete. If the store already holds ``key`` (e.g., added by another
+        process meanwhile), the store is left unchanged.
+
+        Parameters
+        ----------
+        store : str
+            the store directory, created if it does not exist
+        key : str
+            the name of the new directory in the store
+        file_names : list of str
+            the names of the files in datfil/
+
+        Raises
+        ------
+        OSError
+            If the files cannot be added to the store.
+
+        Returns
+        -------
+        bool
+            True if the files were added, False if ``key`` already existed
+
+        """
+        entry = os.path.join(store, key)
+        os.makedirs(store, exist_ok=True)
+        if os.path.isdir(entry):
+            return False
+        tmp_dir = tempfile.mkdtemp(prefix=f'.{key}.', dir=store)
+        try:
+            for f_name in file_names:
+                self._link_or_copy(self.mod_dir + 'datfil/' + f_name,
+                                   os.path.join(tmp_dir, f_name))
+            os.rename(tmp_dir, entry)
+        except OSError:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            if os.path.isdir(entry):  # added by another process
+                return False
+            raise
+        return True
+
+    def _link_stored_files(self, entry, file_names):
+        """Hard link (or copy) files of a directory in a store to datfil/
+
+        Parameters
+        ----------
+        entry : str
+            the directory in the store, including the trailing slash. Its
+            modification time is updated to mark it as recently used.
+        file_names : list of str
+            the names of the files, linked in this order
+
+        Raises
+        ------
+        OSError
+            If the files cannot be linked, e.g. if ``entry`` was removed.
+
+        """
+        os.utime(entry)  # for evicting the least recently used
+        for f_name in file_names:
+            self._link_or_copy(entry + f_name,
+                               self.mod_dir + 'datfil/' + f_name)
+
+    def _evict_orblib_store(self):
+        """Evict orbit libraries from the orblib store
+
+        Removes the orbit libraries not used for more than the orblib
+        setting ``store_max_age_days`` days, then the least recently used
+        ones until the store's size is at most ``store_max_gb`` gigabytes.
+        An orbit library is removed by renaming it first, so that other
+        processes never link an incomplete orbit library.
+
+        """
+        store = self.settings['store_directory']
+        max_age = self.settings['store_max_age_days']
+        max_gb = self.settings['store_max_gb']
+        if max_age is None and max_gb is None:
+            return
+        entries = []
+        for key in os.listdir(store):
+            entry = os.path.join(store, key)
+            if key.startswith('.') or not os.path.isdir(entry):
+                continue
+            try:
+                size = sum(os.path.getsize(os.path.join(entry, f))
+                           for f in os.listdir(entry))
+                entries.append((os.path.getmtime(entry), size, key))
+            except OSError:  # evicted by another process meanwhile
+                continue
+        entries.sort()  # least recently used first
+        total_size = sum(entry[1] for entry in entries)
+        now = time.time()
+        for last_used, size, key in entries:
+            too_old = max_age is not None \
+                and now - last_used > max_age * 86400
+            too_big = max_gb is not None and total_size > max_gb * 2**30
+            if not (too_old or too_big):
+                continue
+            tmp_dir = os.path.join(store, f'.{key}.{os.getpid()}.evicted')
+            try:
+                os.rename(os.path.join(store, key), tmp_dir)
+            except OSError:  # evicted by another process meanwhile
+                continue
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            total_size -= size
+            self.logger.debug(f'Orbit library {key} evicted from the store '
+                              f'{store}.')
 
     def create_fortran_input_orblib(self, path):
         """write input files for Fortran orbit library programs
@@ -380,14 +1202,16 @@ class LegacyOrbitLibrary(OrbitLibrary):
                 line = f'"infil/{pop_i.binfile}"{tab[:-3]}{label}\n'
                 f.write(line)
             o_file = 'datfil/orblibbox' if box else 'datfil/orblib'
-            f_name = f'"{o_file}_qgrid.dat"'
+            # raw integrator output, compressed to datfil/ afterwards
+            raw_file = self.raw_orblib_dir + o_file[len('datfil/'):]
+            f_name = f'"{raw_file}_qgrid.dat"'
             f.write(f'{f_name}{tab[:-4] if len(f_name) >= 32 else tab[:-3]}'
                     '[orbit qgrid file]\n')
             if len(psf_pop_idx) > 0:
-                f_name = f'"{o_file}_pops.dat"'
+                f_name = f'"{raw_file}_pops.dat"'
                 f.write(f'{f_name}{tab[:-4] if len(f_name) >= 32 else tab[:-3]}'
                         '[pops \'0d hist\' file]\n')
-            f_name = f'"{o_file}_losvd_hist.dat"'
+            f_name = f'"{raw_file}_losvd_hist.dat"'
             f.write(f'{f_name}{tab[:-4] if len(f_name) >= 32 else tab[:-3]}'
                     '[orbit losvd 1d hist file]\n')
             f_name = f'"{o_file}.dat_orbclass.out"'
@@ -400,7 +1224,7 @@ class LegacyOrbitLibrary(OrbitLibrary):
         #write triaxmass.in
         #-------------------
         text='infil/parameters_lum.in' +'\n' + \
-        'datfil/orblib_qgrid.dat' +'\n' + \
+        f'{self.raw_orblib_dir}orblib_qgrid.dat' +'\n' + \
         'datfil/mass_radmass.dat' +'\n' + \
         'datfil/mass_qgrid.dat'
         triaxmass_file= open(path+'triaxmass.in',"w")
@@ -432,7 +1256,35 @@ class LegacyOrbitLibrary(OrbitLibrary):
 
     def get_orbit_ics(self):
         """Execute the bash script to calculate orbit ICs
+
+        The ICs only depend on infil/parameters_pot.in, the random seed in
+        infil/orbstart.in, and the orbitstart program. If the orblib setting
+        ``cache_ics`` is True, they are cached in the ``ics_cache/``
+        directory of the model directory, keyed by the sha256 of these
+        files, and linked into datfil/ for all orbit libraries with
+        identical inputs instead of running orbitstart again.
+
+        Raises
+        ------
+        FileNotFoundError
+            If the orbitstart program is missing.
+        RuntimeError
+            If orbitstart failed otherwise.
+
         """
+        key = self._get_ics_cache_key() if self.settings['cache_ics'] \
+            else None
+        entry = f'{self.ics_cache_dir}{key}/'
+        if key is not None and os.path.isdir(entry):
+            try:
+                self._link_stored_files(entry, sorted(os.listdir(entry)))
+            except OSError as e:
+                self.logger.warning(f'Could not use initial conditions '
+                                    f'{entry}: {e}.')
+            else:
+                self.logger.info('Initial conditions for '
+                                 f'{self.mod_dir} linked from {entry}.')
+                return
         cur_dir = os.getcwd()
         os.chdir(self.mod_dir)
         cmdstr = self.write_executable_for_ics()
@@ -458,6 +1310,48 @@ class LegacyOrbitLibrary(OrbitLibrary):
                 text += f'{log_file} Be wary: DYNAMITE may crash...'
                 self.logger.warning(text)
                 raise RuntimeError(text)
+        if key is None:
+            return
+        try:
+            self._store_datfil_files(self.ics_cache_dir,
+                                     key,
+                                     ['begin.dat', 'beginbox.dat',
+                                      'orbstart.dat'])
+        except OSError as e:
+            self.logger.warning(f'Could not cache initial conditions of '
+                                f'{self.mod_dir}: {e}.')
+
+    def _get_ics_cache_key(self):
+        """Key of the orbit ICs in the ICs cache
+
+        Returns
+        -------
+        str
+            the sha256 hex digest of the contents of infil/parameters_pot.in,
+            infil/orbstart.in, and the orbitstart program
+
+        Raises
+        ------
+        FileNotFoundError
+            If the orbitstart program is missing.
+
+        """
+        program = 'orbitstart_bar' if self.system.is_bar_disk_system() \
+            else 'orbitstart'
+        program = f'{self.legacy_directory}/{program}'
+        if not os.path.isfile(program):
+            text = f'{program} not found. Check DYNAMITE legacy_fortran ' \
+                   'executables.'
+            self.logger.error(text)
+            raise FileNotFoundError(text)
+        checksum = hashlib.sha256()
+        for f_name in [self.mod_dir + 'infil/parameters_pot.in',
+                       self.mod_dir + 'infil/orbstart.in',
+                       program]:
+            with open(f_name, 'rb') as f:
+                data = f.read()
+            checksum.update(f'{len(data)}\n'.encode() + data)
+        return checksum.hexdigest()
 
     def write_executable_for_ics(self):
         """Write the bash script to calculate orbit ICs
@@ -569,6 +1463,270 @@ class LegacyOrbitLibrary(OrbitLibrary):
                 self.logger.warning(text)
                 raise RuntimeError(text)
 
+    def get_orbit_library_chunked(self):
+        """Calculate the orbit libraries in parallel chunks of orbits
+
+        Splits the orbits of both the tube and the box orbit library into
+        ``orblib_integration_chunks`` slices, integrates all slices in
+        parallel processes writing to the scratch directories
+        ``orblib_chunk_*/`` and ``orblibbox_chunk_*/`` in ``datfil/`` (or in
+        the ``scratch_directory``), and merges the slices into the standard
+        orbit library files. Then, the
+        aperture and 3D grid masses are calculated and the orbit library
+        files are compressed.
+
+        """
+        chunks = []
+        for fileroot, ics_file in ('orblib', 'begin.dat'), \
+                                  ('orblibbox', 'beginbox.dat'):
+            orbit_ranges = self._get_orbit_chunk_ranges(
+                ics_file,
+                self.orblib_integration_chunks)
+            for i, (first, last) in enumerate(orbit_ranges):
+                chunk_dir = f'{self.raw_orblib_dir}{fileroot}_chunk_{i:03d}/'
+                self._write_chunk_orblib_dot_in(fileroot,
+                                                chunk_dir,
+                                                first,
+                                                last,
+                                                i)
+                chunks.append((fileroot, chunk_dir))
+        # move to model directory
+        cur_dir = os.getcwd()
+        os.chdir(self.mod_dir)
+        cmdstr = self.write_executable_for_integrate_orbits_chunked(chunks)
+        self.logger.info('Integrating orbit library tube and box orbits '
+                         f'in {len(chunks)} chunks for {self.mod_dir}.')
+        p = subprocess.run('bash '+cmdstr,
+                           stdout=subprocess.PIPE,
+                           stderr=subprocess.STDOUT,
+                           shell=True)
+        # move back to original directory
+        os.chdir(cur_dir)
+        log_files = ', '.join(os.path.join(self.mod_dir,
+                                           f'{chunk_dir}{fileroot}.log')
+                              for fileroot, chunk_dir in chunks)
+        self._check_orblib_script(cmdstr, p, f'Logfiles: {log_files}.')
+        for fileroot in 'orblib', 'orblibbox':
+            self._merge_orbit_library_chunks(
+                fileroot,
+                [chunk_dir for f, chunk_dir in chunks if f == fileroot])
+        cur_dir = os.getcwd()
+        os.chdir(self.mod_dir)
+        cmdstr = self.write_executable_for_chunked_orblib_masses()
+        self.logger.info('Calculating aperture and 3D grid masses and '
+                         f'compressing the orbit libraries for {self.mod_dir}.')
+        p = subprocess.run('bash '+cmdstr,
+                           stdout=subprocess.PIPE,
+                           stderr=subprocess.STDOUT,
+                           shell=True)
+        os.chdir(cur_dir)
+        log_files = f'Logfiles: {self.mod_dir}datfil/triaxmass.log, ' \
+                    f'{self.mod_dir}datfil/triaxmassbin.log.'
+        self._check_orblib_script(cmdstr, p, log_files)
+
+    def _check_orblib_script(self, cmdstr, p, log_files):
+        """Log the outcome of a bash script and raise an error if it failed
+
+        Parameters
+        ----------
+        cmdstr : str
+            name of the bash script
+        p : ``subprocess.CompletedProcess``
+            the completed script with its (combined) output in ``p.stdout``
+        log_files : str
+            text listing the relevant log files
+
+        Raises
+        ------
+        FileNotFoundError
+            If the script could not find the executables.
+        RuntimeError
+            If the script failed otherwise.
+
+        """
+        if not p.stdout.decode("UTF-8"):
+            self.logger.info(f'...done - {cmdstr} exit code '
+                             f'{p.returncode}. {log_files}')
+        else:
+            text=f'...failed! {cmdstr} exit code {p.returncode}. ' \
+                 f'Message: {p.stdout.decode("UTF-8")}'
+            if p.returncode == 127: # command not found
+                text += 'Check DYNAMITE legacy_fortran executables.'
+                self.logger.error(text)
+                raise FileNotFoundError(text)
+            else:
+                text += f'{log_files} Be wary: DYNAMITE may crash...'
+                self.logger.warning(text)
+                raise RuntimeError(text)
+
+    def _get_orbit_chunk_ranges(self, ics_file, n_chunks):
+        """Split the orbits to integrate into chunks
+
+        Parameters
+        ----------
+        ics_file : str
+            the file with the orbit initial conditions in ``datfil/``,
+            ``begin.dat`` or ``beginbox.dat``
+        n_chunks : int
+            the number of chunks
+
+        Returns
+        -------
+        list of tuples
+            (first orbit, last orbit) of each non-empty chunk, with 1-based
+            orbit numbers as in ``orblib.in``, covering the orbits selected
+            by the ``starting_orbit`` and ``number_orbits`` settings. Note
+            that the orbit integrator stops after the orbit given by
+            ``number_orbits``, i.e., it is the last orbit rather than the
+            number of orbits.
+
+        """
+        with open(f'{self.mod_dir}datfil/{ics_file}') as f:
+            n_ener, n_i2, n_i3 = (int(n) for n in f.readline().split())
+        last = n_ener * n_i2 * n_i3 // self.settings['dithering']**3
+        if self.settings['number_orbits'] != -1:
+            last = min(last, self.settings['number_orbits'])
+        orbits = np.arange(self.settings['starting_orbit'], last + 1)
+        return [(int(o[0]), int(o[-1]))
+                for o in np.array_split(orbits, n_chunks) if len(o) > 0]
+
+    def _write_chunk_orblib_dot_in(self,
+                                   fileroot,
+                                   chunk_dir,
+                                   first,
+                                   last,
+                                   chunk):
+        """Write the orbit integrator input file for one chunk of orbits
+
+        Creates the (empty) scratch directory of the chunk and writes a
+        copy of ``infil/orblib.in`` or ``infil/orblibbox.in`` to it, with
+        the chunk's orbit range, all output files in the scratch
+        directory, and a random seed of its own: a positive
+        ``random_seed`` is increased by the chunk's index, so that the
+        chunks draw independent random numbers. The first chunk uses
+        ``random_seed`` itself.
+
+        Parameters
+        ----------
+        fileroot : str
+            'orblib' or 'orblibbox'
+        chunk_dir : str
+            the scratch directory, absolute or relative to the model
+            directory, ending with '/'
+        first : int
+            the chunk's first orbit (1-based)
+        last : int
+            the chunk's last orbit (1-based)
+        chunk : int
+            the chunk's index (0-based)
+
+        """
+        path = os.path.join(self.mod_dir, chunk_dir)
+        shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(path)
+        with open(f'{self.mod_dir}infil/{fileroot}.in') as f:
+            lines = f.readlines()
+        with open(f'{path}{fileroot}.in', 'w') as f:
+            for i, line in enumerate(lines):
+                if i == 0:  # random seed, <= 0 gives a stochastic seed
+                    seed = int(line.split()[0])
+                    if seed > 0:
+                        # stay within the Fortran default integer range
+                        seed = (seed - 1 + chunk) % (2**31 - 1) + 1
+                    line = f'{seed}\n'
+                elif '[starting orbit]' in line:
+                    line = f'{first}{line[len(line.split()[0]):]}'
+                elif '[orbits  to intergrate;' in line:
+                    line = f'{last}{line[len(line.split()[0]):]}'
+                elif line.rstrip().endswith(' file]'):  # output files
+                    f_name = line.split('"')[1]
+                    line = line.replace(
+                        f_name,
+                        chunk_dir + os.path.basename(f_name),
+                        1)
+                f.write(line)
+
+    def _merge_orbit_library_chunks(self, fileroot, chunk_dirs):
+        """Merge the chunks of an orbit library into the standard files
+
+        Concatenates the chunks' ``_qgrid``, ``_losvd_hist``, and ``_pops``
+        files, the orbit classification files, and the log files in the
+        order of the chunks, and removes the scratch directories.
+
+        Parameters
+        ----------
+        fileroot : str
+            'orblib' or 'orblibbox'
+        chunk_dirs : list of str
+            the scratch directories of the chunks in orbit order, absolute
+            or relative to the model directory
+
+        """
+        f_root = f'{self.mod_dir}datfil/{fileroot}'
+        extension = self._get_compression()[1]
+        raw_root = os.path.join(self.mod_dir, self.raw_orblib_dir + fileroot)
+        chunk_dirs = [os.path.join(self.mod_dir, chunk_dir)
+                      for chunk_dir in chunk_dirs]
+        # number of header records of each file
+        for suffix, n_header in ('_qgrid.dat', 5), \
+                                ('_losvd_hist.dat', 1), \
+                                ('_pops.dat', 0):
+            out_file = raw_root + suffix
+            for f_name in out_file, f_root + suffix + extension:
+                if os.path.isfile(f_name):
+                    os.remove(f_name)
+            in_files = [f'{chunk_dir}{fileroot}{suffix}'
+                        for chunk_dir in chunk_dirs]
+            if os.path.isfile(in_files[0]):  # pops files are optional
+                self._merge_fortran_record_files(out_file, in_files, n_header)
+        for suffix, mode in ('.dat_orbclass.out', 'wb'), ('.log', 'ab'):
+            with open(f_root + suffix, mode) as out:
+                for chunk_dir in chunk_dirs:
+                    with open(f'{chunk_dir}{fileroot}{suffix}', 'rb') as f:
+                        shutil.copyfileobj(f, out)
+        for chunk_dir in chunk_dirs:
+            shutil.rmtree(chunk_dir)
+
+    def _merge_fortran_record_files(self, out_file, in_files, n_header):
+        """Concatenate the orbits of Fortran unformatted orbit library files
+
+        Each input file consists of ``n_header`` header records, the records
+        of its orbits, and one trailing record. The output file gets the
+        header records of the first and the trailing record of the last
+        input file, with the orbit records of all input files in between.
+
+        Parameters
+        ----------
+        out_file : str
+            the output file
+        in_files : list of str
+            the uncompressed input files
+        n_header : int
+            the number of header records
+
+        Raises
+        ------
+        ValueError
+            If an input file is incomplete.
+
+        """
+        with open(out_file, 'wb') as out:
+            for i, in_file in enumerate(in_files):
+                with open(in_file, 'rb') as f:
+                    offsets = FortranRecordReader(f, in_file).index_records()
+                    if len(offsets) < n_header + 2:
+                        text = f'Orbit library file {in_file} is incomplete.'
+                        self.logger.error(text)
+                        raise ValueError(text)
+                    start = 0 if i == 0 else offsets[n_header]
+                    end = offsets[-1] if i == len(in_files)-1 else offsets[-2]
+                    f.seek(start)
+                    n_bytes = end - start
+                    while n_bytes > 0:
+                        buffer = f.read(min(n_bytes, 2**24))
+                        out.write(buffer)
+                        n_bytes -= len(buffer)
+
     def write_executable_for_integrate_orbits_par(self):
         """Write the bash script to calculate orbit libraries
         """
@@ -584,8 +1742,10 @@ class LegacyOrbitLibrary(OrbitLibrary):
             txt_file.write(f'test -e {self.legacy_directory}/{f_name} || ' +
                            f'{{ echo "File {self.legacy_directory}/{f_name} ' +
                            'not found." && exit 127; }\n')
-        txt_file.write('(rm -f datfil/orblib.dat.tmp datfil/orblib_qgrid.dat '
-                        'datfil/orblib_pops.dat datfil/orblib_losvd_hist.dat\n')
+        raw = self.raw_orblib_dir
+        compress, ext = self._get_compression()
+        txt_file.write(f'(rm -f datfil/orblib.dat.tmp {raw}orblib_qgrid.dat '
+                       f'{raw}orblib_pops.dat {raw}orblib_losvd_hist.dat\n')
         txt_file.write(f'{self.legacy_directory}/{orb_prgrm} < infil/orblib.in '
                         '>> datfil/orblib.log\n')
         txt_file.write('rm -f datfil/mass_qgrid.dat datfil/mass_radmass.dat '
@@ -602,22 +1762,26 @@ class LegacyOrbitLibrary(OrbitLibrary):
             txt_file.write(f'{self.legacy_directory}/triaxmassbin '
                            '< infil/triaxmassbin.in >> datfil/triaxmassbin.log')
         for f in 'qgrid', 'pops', 'losvd_hist':
+            raw_name = f'{raw}orblib_{f}.dat'
             f_name = 'datfil/orblib_' + f + '.dat'
-            txt_file.write(f'\ntest -e {f_name} '
-                           f'&& rm -f {f_name}.bz2 && bzip2 -k {f_name}\n')
-            txt_file.write(f'rm -f {f_name}')
+            txt_file.write(f'\ntest -e {raw_name} '
+                           f'&& rm -f {f_name}{ext} '
+                           f'&& {compress} {raw_name} > {f_name}{ext}\n')
+            txt_file.write(f'rm -f {raw_name}')
         txt_file.write(') &\n')
         txt_file.write('orblib=$!\n')
         txt_file.write('(rm -f datfil/orblibbox.dat.tmp '
-                        'datfil/orblibbox_qgrid.dat datfil/orblibbox_pops.dat '
-                        'datfil/orblibbox_losvd_hist.dat\n')
+                       f'{raw}orblibbox_qgrid.dat {raw}orblibbox_pops.dat '
+                       f'{raw}orblibbox_losvd_hist.dat\n')
         txt_file.write(f'{self.legacy_directory}/{orb_prgrm} '
                        '< infil/orblibbox.in >> datfil/orblibbox.log')
         for f in 'qgrid', 'pops', 'losvd_hist':
+            raw_name = f'{raw}orblibbox_{f}.dat'
             f_name = 'datfil/orblibbox_' + f + '.dat'
-            txt_file.write(f'\ntest -e {f_name} '
-                           f'&& rm -f {f_name}.bz2 && bzip2 -k {f_name}\n')
-            txt_file.write(f'rm {f_name}')
+            txt_file.write(f'\ntest -e {raw_name} '
+                           f'&& rm -f {f_name}{ext} '
+                           f'&& {compress} {raw_name} > {f_name}{ext}\n')
+            txt_file.write(f'rm -f {raw_name}')
         txt_file.write(') &\n')
         txt_file.write('orblibbox=$!\n')
         txt_file.write('wait $orblib $orblibbox\n')
@@ -625,80 +1789,788 @@ class LegacyOrbitLibrary(OrbitLibrary):
         # returns the name of the executables
         return cmd_string
 
-    def write_executable_for_integrate_orbits(self):
-        """Write the bash script to calculate orbit libraries
+    def write_executable_for_integrate_orbits(self):
+        """Write the bash script to calculate orbit libraries
+        """
+        if self.system.is_bar_disk_system():
+            orb_prgrm = 'orblib_bar'
+        else:
+            orb_prgrm = 'orblib_new_mirror'
+        # tubeorbits
+        cmdstr_tube = 'cmd_tube_orbs'
+        txt_file = open(cmdstr_tube, "w")
+        txt_file.write('#!/bin/bash\n')
+        txt_file.write('# first, check whether executables exist\n')
+        for f_name in orb_prgrm, 'triaxmass', 'triaxmassbin':
+            txt_file.write(f'test -e {self.legacy_directory}/{f_name} || ' +
+                           f'{{ echo "File {self.legacy_directory}/{f_name} ' +
+                           'not found." && exit 127; }\n')
+        raw = self.raw_orblib_dir
+        compress, ext = self._get_compression()
+        txt_file.write(f'rm -f datfil/orblib.dat.tmp {raw}orblib_qgrid.dat '
+                       f'datfil/orblib_qgrid.dat{ext} {raw}orblib_pops.dat '
+                       f'datfil/orblib_pops.dat{ext} '
+                       f'{raw}orblib_losvd_hist.dat '
+                       f'datfil/orblib_losvd_hist.dat{ext}\n')
+        txt_file.write(f'{self.legacy_directory}/{orb_prgrm} < infil/orblib.in '
+                       '>> datfil/orblib.log\n')
+        txt_file.write('rm -f datfil/mass_qgrid.dat datfil/mass_radmass.dat '
+                       'datfil/mass_aper.dat\n')
+        txt_file.write(f'{self.legacy_directory}/triaxmass '
+                       '< infil/triaxmass.in >> datfil/triaxmass.log\n')
+        txt_file.write(f'{self.legacy_directory}/triaxmassbin '
+                       '< infil/triaxmassbin.in >> datfil/triaxmassbin.log\n')
+        for f in 'qgrid', 'pops', 'losvd_hist':
+            raw_name = f'{raw}orblib_{f}.dat'
+            f_name = 'datfil/orblib_' + f + '.dat'
+            txt_file.write(f'test -e {raw_name} '
+                           f'&& {compress} {raw_name} > {f_name}.staging{ext} '
+                           f'&& mv {f_name}.staging{ext} {f_name}{ext}\n')
+            txt_file.write(f'rm -f {raw_name}\n')
+        txt_file.close()
+        # boxorbits
+        cmdstr_box = 'cmd_box_orbs'
+        txt_file = open(cmdstr_box, "w")
+        txt_file.write('#!/bin/bash\n')
+        txt_file.write('# first, check whether executable exists\n')
+        txt_file.write(f'test -e {self.legacy_directory}/{orb_prgrm} || ' +
+                       f'{{ echo "File {self.legacy_directory}/{orb_prgrm} ' +
+                       'not found." && exit 127; }\n')
+        txt_file.write('rm -f datfil/orblibbox.dat.tmp '
+                       f'{raw}orblibbox_qgrid.dat '
+                       f'datfil/orblibbox_qgrid.dat{ext} '
+                       f'{raw}orblibbox_pops.dat '
+                       f'datfil/orblibbox_pops.dat{ext} '
+                       f'{raw}orblibbox_losvd_hist.dat '
+                       f'datfil/orblibbox_losvd_hist.dat{ext}\n')
+        txt_file.write(f'{self.legacy_directory}/{orb_prgrm} '
+                       '< infil/orblibbox.in >> datfil/orblibbox.log\n')
+        for f in 'qgrid', 'pops', 'losvd_hist':
+            raw_name = f'{raw}orblibbox_{f}.dat'
+            f_name = 'datfil/orblibbox_' + f + '.dat'
+            txt_file.write(
+                f'test -e {raw_name} '
+                f'&& {compress} {raw_name} > {f_name}.staging{ext} '
+                f'&& mv {f_name}.staging{ext} {f_name}{ext}\n')
+            txt_file.write(f'rm -f {raw_name}\n')
+        txt_file.close()
+        # returns the name of the executables
+        return cmdstr_tube, cmdstr_box
+
+    def write_executable_for_integrate_orbits_chunked(self, chunks):
+        """Write the bash script to calculate orbit library chunks in parallel
+
+        Parameters
+        ----------
+        chunks : list of tuples
+            (fileroot, chunk_dir) of each chunk, see
+            ``_write_chunk_orblib_dot_in``
+
+        """
+        if self.system.is_bar_disk_system():
+            prgrms = 'orblib_bar', 'triaxmass_bar', 'triaxmassbin_bar'
+        else:
+            prgrms = 'orblib_new_mirror', 'triaxmass', 'triaxmassbin'
+        cmd_string = 'cmd_chunked_orbs'
+        txt_file = open(cmd_string, "w")
+        txt_file.write('#!/bin/bash\n')
+        txt_file.write('# first, check whether executables exist\n')
+        for f_name in prgrms:
+            txt_file.write(f'test -e {self.legacy_directory}/{f_name} || ' +
+                           f'{{ echo "File {self.legacy_directory}/{f_name} ' +
+                           'not found." && exit 127; }\n')
+        for fileroot, chunk_dir in chunks:
+            txt_file.write(f'{self.legacy_directory}/{prgrms[0]} '
+                           f'< {chunk_dir}{fileroot}.in '
+                           f'>> {chunk_dir}{fileroot}.log &\n')
+        txt_file.write('wait\n')
+        txt_file.close()
+        # returns the name of the executable
+        return cmd_string
+
+    def write_executable_for_chunked_orblib_masses(self):
+        """Write the bash script to calculate masses after chunked integration
+
+        The aperture and 3D grid masses are calculated while the merged
+        orbit library files are compressed in parallel.
+
+        """
+        if self.system.is_bar_disk_system():
+            prgrms = 'triaxmass_bar', 'triaxmassbin_bar'
+        else:
+            prgrms = 'triaxmass', 'triaxmassbin'
+        cmd_string = 'cmd_chunked_orbs_masses'
+        txt_file = open(cmd_string, "w")
+        txt_file.write('#!/bin/bash\n')
+        txt_file.write('rm -f datfil/mass_qgrid.dat datfil/mass_radmass.dat '
+                       'datfil/mass_aper.dat\n')
+        txt_file.write(f'({self.legacy_directory}/{prgrms[0]} '
+                       '< infil/triaxmass.in >> datfil/triaxmass.log\n')
+        txt_file.write(f'{self.legacy_directory}/{prgrms[1]} '
+                       '< infil/triaxmassbin.in >> datfil/triaxmassbin.log'
+                       ') &\n')
+        compress, ext = self._get_compression()
+        raw_names = []
+        for fileroot in 'orblib', 'orblibbox':
+            for f in 'qgrid', 'pops', 'losvd_hist':
+                raw_name = f'{self.raw_orblib_dir}{fileroot}_{f}.dat'
+                f_name = f'datfil/{fileroot}_{f}.dat'
+                txt_file.write(f'test -e {raw_name} '
+                               f'&& {compress} {raw_name} > '
+                               f'{f_name}.staging{ext} '
+                               f'&& mv {f_name}.staging{ext} {f_name}{ext} &\n')
+                raw_names.append(raw_name)
+        txt_file.write('wait\n')
+        txt_file.write(f'rm -f {" ".join(raw_names)}\n')
+        txt_file.close()
+        # returns the name of the executable
+        return cmd_string
+
+    def read_ics(self):
+        # ...
+        pass
+
+    def _open_orblib_file(self, file_name):
+        """Open a compressed orblib file for reading its Fortran records
+
+        The file is decompressed on the fly while reading, no uncompressed
+        copy is written to disk. The codec is detected from the file.
+
+        Parameters
+        ----------
+        file_name : str
+            file name relative to the model directory ``self.mod_dir``
+            without the codec's extension, e.g. 'datfil/orblib_qgrid.dat'
+
+        Returns
+        -------
+        ``FortranRecordReader`` object
+
+        Raises
+        ------
+        FileNotFoundError
+            If the file does not exist with any of the ``ORBLIB_CODECS``.
+
+        """
+        path = self._find_orblib_file(file_name)
+        return FortranRecordReader(open_orblib_file(path), name=path)
+
+    def _find_orblib_file(self, file_name):
+        """Find an orblib file written with any of the ``ORBLIB_CODECS``
+
+        If the orbit library has a manifest, the file is looked up in the
+        manifest instead of probing the file system.
+
+        Parameters
+        ----------
+        file_name : str
+            file name relative to the model directory ``self.mod_dir``
+            without the codec's extension, e.g. 'datfil/orblib_qgrid.dat'
+
+        Returns
+        -------
+        str
+            the path of the file including the codec's extension
+
+        Raises
+        ------
+        FileNotFoundError
+            If the file does not exist with any of the ``ORBLIB_CODECS``.
+
+        """
+        path = None
+        manifest = read_orblib_manifest(self.mod_dir + 'datfil/')
+        if manifest is None:
+            path = find_orblib_file(self.mod_dir + file_name)
+        else:  # no need to probe the files
+            for codec in ORBLIB_CODECS.values():
+                name = os.path.basename(file_name) + codec['extension']
+                if name in manifest['files']:
+                    path = self.mod_dir + 'datfil/' + name
+                    break
+        if path is None:
+            text = f'Orbit library file {self.mod_dir}{file_name} ' \
+                   '(with any compression) not found.'
+            self.logger.error(text)
+            raise FileNotFoundError(text)
+        return path
+
+    def _get_compression(self):
+        """Get the compression of new orbit library files
+
+        Returns
+        -------
+        tuple of str
+            the shell command compressing a file to stdout (with the
+            ``compression_level`` setting, if given) and the file name
+            extension of the ``compression`` setting
+
+        """
+        codec = ORBLIB_CODECS[self.settings['compression']]
+        compress = codec['compress']
+        level = self.settings['compression_level']
+        if level is not None and compress != 'cat':
+            compress += f' -{level}'
+        return compress, codec['extension']
+
+    def _write_orblib_manifest(self, caches=False, content_checksums=None):
+        """Write the manifest of the complete orbit library
+
+        The manifest datfil/orblib_manifest.json records the layout (see
+        ``get_orblib_layout``), the orbit library files with their codec,
+        size, and sha256 checksum, and the number of orbits, dithering, and
+        3D grid sizes from the headers of the tube and box orbit libraries.
+        It is written atomically, so that the completeness of the orbit
+        library can be checked by reading one file. Nothing is written if
+        the orbit library is incomplete.
+
+        Parameters
+        ----------
+        caches : bool, optional
+            whether the caches of the decoded orbit library have been
+            written, see ``convert_orbit_library``. The default is False.
+        content_checksums : dict or None, optional
+            the sha256 hex digests of the decompressed files' contents, with
+            the file names without codec extension as keys (e.g.
+            'orblib_qgrid.dat'). They are recorded as ``content_sha256``
+            for end-to-end verification (see ``verify_orbit_library``). The
+            default is None (no content checksums).
+
+        Returns
+        -------
+        dict or None
+            the manifest, None if the orbit library is incomplete
+
+        """
+        datfil = self.mod_dir + 'datfil/'
+        if os.path.isfile(datfil + ORBLIB_MANIFEST):
+            os.remove(datfil + ORBLIB_MANIFEST)
+        layout = get_orblib_layout(datfil)
+        if layout is None:
+            self.logger.warning(f'Orbit library {self.mod_dir} incomplete, '
+                                'no manifest written.')
+            return None
+        suffixes = ('_qgrid', '_losvd_hist', '_pops') if layout == 'new' \
+            else ('',)
+        manifest = {'layout': layout,
+                    'files': {},
+                    'orbits': {},
+                    'caches': caches}
+        for fileroot in 'orblib', 'orblibbox':
+            for f in suffixes:
+                f_name = find_orblib_file(f'{datfil}{fileroot}{f}.dat')
+                if f_name is None:  # pops files are optional
+                    continue
+                checksum = hashlib.sha256()
+                with open(f_name, 'rb') as f_in:
+                    for block in iter(lambda: f_in.read(2**24), b''):
+                        checksum.update(block)
+                entry = {'codec': get_orblib_file_codec(f_name),
+                         'size': os.path.getsize(f_name),
+                         'sha256': checksum.hexdigest()}
+                name = f'{fileroot}{f}.dat'
+                if content_checksums is not None \
+                        and name in content_checksums:
+                    entry['content_sha256'] = content_checksums[name]
+                manifest['files'][os.path.basename(f_name)] = entry
+            with FortranRecordReader(
+                    open_orblib_file(find_orblib_file(
+                        f'{datfil}{fileroot}{suffixes[0]}.dat'))) as f_in:
+                norb, _, _, _, ndith = f_in.read_ints(np.int32)
+                quad_light_grid_sizes = f_in.read_ints(np.int32)
+            manifest['orbits'][fileroot] = {
+                'norb': int(norb),
+                'ndith': int(ndith),
+                'quad_light_grid_sizes': quad_light_grid_sizes.tolist()}
+        tmp_file = f'{datfil}{ORBLIB_MANIFEST}.{os.getpid()}.tmp'
+        with open(tmp_file, 'w') as f:
+            json.dump(manifest, f, indent=1)
+        os.replace(tmp_file, datfil + ORBLIB_MANIFEST)
+        self.logger.debug(f'Orbit library manifest {datfil}{ORBLIB_MANIFEST} '
+                          'written.')
+        return manifest
+
+    def convert_orbit_library(self,
+                              compression=None,
+                              compression_level=None,
+                              remove_originals=False,
+                              write_caches=True):
+        """Convert an existing orbit library to a faster format
+
+        Re-compresses the orbit library files with another codec of
+        ``ORBLIB_CODECS`` (e.g., 'none' or 'gzip', which decode several
+        times faster than 'bz2') and/or writes the caches of the decoded
+        orbit library, so that existing orbit libraries profit from them
+        when re-plotting or re-solving the weights. Each re-compressed file
+        is decompressed again and verified against the checksum of the
+        original's uncompressed content before the original is moved to
+        datfil/orblib_originals/ or removed. Finally, the orbit library's
+        manifest (see ``_write_orblib_manifest``) is written, which marks
+        the orbit library as converted. It records the checksums of the
+        decompressed contents, too, which are verified against those of an
+        earlier conversion, so that ``verify_orbit_library`` can check the
+        data end to end and ``purge_orblib_originals`` can remove verified
+        originals later. An interrupted conversion can be resumed by calling
+        this method again.
+
+        Parameters
+        ----------
+        compression : str or None, optional
+            the codec of the converted orbit library files, a key of
+            ``ORBLIB_CODECS``. The default is None (keep the files'
+            compression).
+        compression_level : int or None, optional
+            compression level passed to the compressor. The default is None
+            (the compressor's default).
+        remove_originals : bool, optional
+            If True, the original orbit library files are removed after
+            converting them, otherwise they are moved to
+            datfil/orblib_originals/. The default is False.
+        write_caches : bool, optional
+            If True, the LOSVD cache (datfil/losvd_cache/, regardless of the
+            ``cache_losvds`` setting), the intrinsic moments cache
+            (datfil/intmoms_cache/), and the binary orbclass files are
+            written. The default is True.
+
+        Raises
+        ------
+        ValueError
+            If ``compression`` is not a key of ``ORBLIB_CODECS`` or a
+            converted file does not reproduce the original's content or
+            the content checksum of an earlier conversion.
+        FileNotFoundError
+            If the orbit library does not exist.
+
+        Returns
+        -------
+        bool
+            False if the orbit library had already been converted to the
+            given compression, True otherwise.
+
+        """
+        if compression is not None and compression not in ORBLIB_CODECS:
+            text = f'Unknown compression {compression}, must be one of ' \
+                   f'{list(ORBLIB_CODECS.keys())}.'
+            self.logger.error(text)
+            raise ValueError(text)
+        datfil = self.mod_dir + 'datfil/'
+        file_names = [f'{fileroot}{f}.dat'
+                      for fileroot in ('orblib', 'orblibbox')
+                      for f in ('', '_qgrid', '_losvd_hist', '_pops')]
+        manifest = read_orblib_manifest(datfil)
+        if manifest is not None and (manifest['caches'] or not write_caches) \
+                and all('content_sha256' in f
+                        for f in manifest['files'].values()):
+            codecs = {f['codec'] for f in manifest['files'].values()}
+            if compression is None or codecs == {compression}:
+                self.logger.debug(f'Orbit library {self.mod_dir} already '
+                                  'converted.')
+                return False
+        if get_orblib_layout(datfil) is None:
+            text = f'No orbit library found in {self.mod_dir}.'
+            self.logger.error(text)
+            raise FileNotFoundError(text)
+        # content checksums of an earlier conversion
+        known_checksums = {}
+        if manifest is not None:
+            known_checksums = {strip_orblib_codec_extension(name):
+                               f['content_sha256']
+                               for name, f in manifest['files'].items()
+                               if 'content_sha256' in f}
+        content_checksums = {}
+
+        if compression is not None:
+            codec = ORBLIB_CODECS[compression]
+            compress = codec['compress']
+            if compression_level is not None and compress != 'cat':
+                compress += f' -{compression_level}'
+            originals_dir = datfil + 'orblib_originals/'
+            # the files change, probe them until the new manifest is written
+            if manifest is not None:
+                os.remove(datfil + ORBLIB_MANIFEST)
+            for name in file_names:
+                new_file = datfil + name + codec['extension']
+                originals = [datfil + name + c['extension']
+                             for c in ORBLIB_CODECS.values()
+                             if c is not codec and
+                             os.path.isfile(datfil + name + c['extension'])]
+                if originals and not os.path.isfile(new_file):
+                    # the new file only appears once it has been verified
+                    staging_file = f'{datfil}{name}.staging{codec["extension"]}'
+                    checksum = hashlib.sha256()
+                    p = subprocess.Popen(f'{compress} > {staging_file}',
+                                         shell=True,
+                                         stdin=subprocess.PIPE)
+                    with open_orblib_file(originals[0]) as f:
+                        for block in iter(lambda: f.read(2**24), b''):
+                            checksum.update(block)
+                            p.stdin.write(block)
+                    p.stdin.close()
+                    if p.wait() != 0:
+                        text = f'Compressing {originals[0]} with ' \
+                               f'{compress} failed.'
+                        self.logger.error(text)
+                        raise ValueError(text)
+                    content_checksums[name] = checksum.hexdigest()
+                    if get_orblib_content_checksum(staging_file) \
+                            != content_checksums[name] \
+                            or known_checksums.get(name, checksum.hexdigest())\
+                            != content_checksums[name]:
+                        os.remove(staging_file)
+                        text = f'Converting {originals[0]} failed, the ' \
+                               'converted file differs from the original ' \
+                               'or the original differs from the manifest.'
+                        self.logger.error(text)
+                        raise ValueError(text)
+                    os.replace(staging_file, new_file)
+                for original in originals:
+                    if remove_originals:
+                        os.remove(original)
+                    else:
+                        os.makedirs(originals_dir, exist_ok=True)
+                        os.replace(original,
+                                   originals_dir + os.path.basename(original))
+                if originals:
+                    self.logger.debug(f'{originals[0]} converted to '
+                                      f'{new_file}.')
+
+        # content checksums of the files not re-compressed above
+        for name in file_names:
+            f_name = find_orblib_file(datfil + name)
+            if f_name is not None and name not in content_checksums:
+                content_checksums[name] = get_orblib_content_checksum(f_name)
+                if known_checksums.get(name, content_checksums[name]) \
+                        != content_checksums[name]:
+                    text = f'The content of {f_name} differs from the ' \
+                           'checksum in the manifest.'
+                    self.logger.error(text)
+                    raise ValueError(text)
+
+        if write_caches:
+            # this object's settings only, keep the shared settings unchanged
+            settings = self.settings
+            self.settings = dict(settings,
+                                 cache_losvds=True,
+                                 losvd_memory_cache_mb=0)
+            try:
+                self.read_losvd_histograms()
+                self.read_intrinsic_moment_groups()
+                self.read_orbit_property_file()
+            finally:
+                self.settings = settings
+
+        self._write_orblib_manifest(caches=write_caches,
+                                    content_checksums=content_checksums)
+        self.logger.info(f'Orbit library {self.mod_dir} converted.')
+        return True
+
+    def verify_orbit_library(self):
+        """Verify the orbit library files against the manifest
+
+        Checks the size and sha256 checksum of each file listed in the
+        orbit library's manifest and, if the manifest records it (see
+        ``convert_orbit_library``), the sha256 checksum of the decompressed
+        content, which verifies the data end to end.
+
+        Returns
+        -------
+        bool
+            True if all files are verified, False if there is no manifest
+            or a file is missing or differs (logged as warnings)
+
+        """
+        datfil = self.mod_dir + 'datfil/'
+        manifest = read_orblib_manifest(datfil)
+        if manifest is None:
+            self.logger.warning(f'Orbit library {self.mod_dir} has no '
+                                'manifest, cannot verify it.')
+            return False
+        verified = True
+        for name, entry in manifest['files'].items():
+            f_name = datfil + name
+            if not os.path.isfile(f_name) \
+                    or os.path.getsize(f_name) != entry['size']:
+                self.logger.warning(f'{f_name} missing or of wrong size.')
+                verified = False
+                continue
+            checksum = hashlib.sha256()
+            with open(f_name, 'rb') as f_in:
+                for block in iter(lambda: f_in.read(2**24), b''):
+                    checksum.update(block)
+            if checksum.hexdigest() != entry['sha256']:
+                self.logger.warning(f'{f_name} differs from its checksum.')
+                verified = False
+            elif 'content_sha256' in entry and entry['content_sha256'] \
+                    != get_orblib_content_checksum(f_name):
+                self.logger.warning(f'The content of {f_name} differs from '
+                                    'its checksum.')
+                verified = False
+        return verified
+
+    def purge_orblib_originals(self):
+        """Remove the verified originals of a converted orbit library
+
+        The originals moved to datfil/orblib_originals/ by
+        ``convert_orbit_library`` are removed if the orbit library passes
+        ``verify_orbit_library`` and the decompressed content of the
+        original matches the content checksum of the converted file in the
+        manifest. Other originals are kept and logged as warnings. The
+        directory is removed when it is empty.
+
+        Returns
+        -------
+        int
+            The number of original files removed.
+
+        """
+        originals_dir = self.mod_dir + 'datfil/orblib_originals/'
+        if not os.path.isdir(originals_dir):
+            return 0
+        if not self.verify_orbit_library():
+            self.logger.warning(f'Orbit library {self.mod_dir} not '
+                                'verified, its originals are kept.')
+            return 0
+        manifest = read_orblib_manifest(self.mod_dir + 'datfil/')
+        checksums = {strip_orblib_codec_extension(name): f['content_sha256']
+                     for name, f in manifest['files'].items()
+                     if 'content_sha256' in f}
+        n_removed = 0
+        for original in sorted(os.listdir(originals_dir)):
+            checksum = checksums.get(strip_orblib_codec_extension(original))
+            if checksum is None \
+                    or get_orblib_content_checksum(originals_dir + original) \
+                    != checksum:
+                self.logger.warning(f'{originals_dir}{original} does not '
+                                    'match the content checksum of the '
+                                    'converted file, kept.')
+                continue
+            os.remove(originals_dir + original)
+            n_removed += 1
+        if len(os.listdir(originals_dir)) == 0:
+            os.rmdir(originals_dir)
+        self.logger.info(f'{n_removed} original files of orbit library '
+                         f'{self.mod_dir} removed.')
+        return n_removed
+
+    def _index_losvd_hist_records(self, words, n_hist, file_name=''):
+        """Locate the histogram records in a decompressed losvd_hist file
+
+        After a header record, the file holds one record (ivmin, ivmax) per
+        orbit and aperture, each followed by a record of ivmax-ivmin+1 reals
+        if ivmin <= ivmax. All record markers and payloads are multiples of
+        4 bytes, so the file can be treated as an array of 4 byte words.
+        The records are walked one after the other: the length of each
+        histogram record follows from (ivmin, ivmax), which gives the start
+        of the next (ivmin, ivmax) record. Only the words of the
+        (ivmin, ivmax) records are read, the histogram values are skipped.
+        Any records following the histograms (the Fortran program writes a
+        short trailing record) are ignored.
+
+        Parameters
+        ----------
+        words : 1d numpy array of dtype uint32
+            the decompressed losvd_hist file as 4 byte words, trailing
+            bytes not forming a full word are dropped
+        n_hist : int
+            the number of (ivmin, ivmax) records in the file, i.e.,
+            number of orbits * total number of apertures
+        file_name : str, optional
+            only used in error messages
+
+        Returns
+        -------
+        tuple of three 1d numpy arrays of length n_hist
+            the word offsets of the (ivmin, ivmax) records and the ivmin and
+            ivmax values. Velocities ivmin to ivmax of the histogram are
+            stored as float64 starting at word offset + 5.
+
+        Raises
+        ------
+        ValueError
+            if the record structure of the file is corrupt
+
+        """
+        n_words = len(words)
+        # indexing a memoryview gives Python ints, much faster in the loop
+        ints = memoryview(words).cast('B').cast('i')
+        offsets = array.array('q', bytes(8 * n_hist))
+        pos = 2 + int(words[0]) // 4  # skip the header record
+        for i in range(n_hist):
+            if pos + 4 > n_words or ints[pos] != 8 or ints[pos + 3] != 8:
+                text = f'Corrupt or truncated losvd_hist file {file_name}: ' \
+                       f'record {i} of {n_hist} not found.'
+                self.logger.error(text)
+                raise ValueError(text)
+            offsets[i] = pos
+            n_v = ints[pos + 2] - ints[pos + 1] + 1
+            pos += 6 + 2 * n_v if n_v > 0 else 4
+        if pos > n_words:
+            text = f'Unexpected end of losvd_hist file {file_name}.'
+            self.logger.error(text)
+            raise ValueError(text)
+        offsets = np.frombuffer(offsets, dtype=np.int64)
+        ivmin = words[offsets + 1].view(np.int32)
+        ivmax = words[offsets + 2].view(np.int32)
+        # check the markers of the histogram records
+        n_v = np.maximum(ivmax - ivmin + 1, 0)
+        has_v = n_v > 0
+        o_v, n_v = offsets[has_v], n_v[has_v]
+        if not (np.all(words[o_v + 4] == 8 * n_v)
+                and np.all(words[o_v + 5 + 2 * n_v] == 8 * n_v)):
+            text = f'Corrupt histogram records in {file_name}.'
+            self.logger.error(text)
+            raise ValueError(text)
+        return offsets, ivmin, ivmax
+
+    def _read_losvd_hist_file(self,
+                              file_name,
+                              norb,
+                              hist_bins,
+                              n_apertures,
+                              sparse=False,
+                              kin_sets=None):
+        """Read all LOSVD histograms from a losvd_hist file at once
+
+        Decompresses the whole file into memory, locates the records (see
+        ``_index_losvd_hist_records``), and gathers the histogram values
+        with vectorized operations instead of reading the records one by
+        one. Besides the values, only arrays with one entry per record and
+        index arrays for blocks of values are created. The decompressed file
+        is released before the (dense) histograms are created.
+
+        Parameters
+        ----------
+        file_name : str
+            file name relative to the model directory ``self.mod_dir``,
+            without the codec's extension, e.g. 'datfil/orblib_losvd_hist.dat'
+        norb : int
+            number of orbits in the file
+        hist_bins : list of int
+            number of (odd) velocity bins for each kinematic set
+        n_apertures : list of int
+            number of apertures for each kinematic set
+        sparse : bool, optional
+            If True, return ``dyn.kinematics.SparseHistogramValues`` objects
+            holding the non-zero velocity range of each histogram only.
+            The default is False.
+        kin_sets : list of int or None, optional
+            If given, only the histograms of these kinematic sets are
+            extracted, the records of all other sets are skipped. The
+            default is None (all kinematic sets).
+
+        Returns
+        -------
+        list of 3d numpy arrays or ``SparseHistogramValues`` objects
+            the histograms for each kinematic set, each of shape
+            (norb, hist_bins[i], n_apertures[i]), or None for kinematic sets
+            not in ``kin_sets``
+
         """
-        if self.system.is_bar_disk_system():
-            orb_prgrm = 'orblib_bar'
-        else:
-            orb_prgrm = 'orblib_new_mirror'
-        # tubeorbits
-        cmdstr_tube = 'cmd_tube_orbs'
-        txt_file = open(cmdstr_tube, "w")
-        txt_file.write('#!/bin/bash\n')
-        txt_file.write('# first, check whether executables exist\n')
-        for f_name in orb_prgrm, 'triaxmass', 'triaxmassbin':
-            txt_file.write(f'test -e {self.legacy_directory}/{f_name} || ' +
-                           f'{{ echo "File {self.legacy_directory}/{f_name} ' +
-                           'not found." && exit 127; }\n')
-        txt_file.write('rm -f datfil/orblib.dat.tmp datfil/orblib_qgrid.dat '
-                        'datfil/orblib_qgrid.dat.bz2 datfil/orblib_pops.dat '
-                        'datfil/orblib_pops.dat.bz2 '
-                        'datfil/orblib_losvd_hist.dat '
-                        'datfil/orblib_losvd_hist.dat.bz2\n')
-        txt_file.write(f'{self.legacy_directory}/{orb_prgrm} < infil/orblib.in '
-                       '>> datfil/orblib.log\n')
-        txt_file.write('rm -f datfil/mass_qgrid.dat datfil/mass_radmass.dat '
-                       'datfil/mass_aper.dat\n')
-        txt_file.write(f'{self.legacy_directory}/triaxmass '
-                       '< infil/triaxmass.in >> datfil/triaxmass.log\n')
-        txt_file.write(f'{self.legacy_directory}/triaxmassbin '
-                       '< infil/triaxmassbin.in >> datfil/triaxmassbin.log\n')
-        for f in 'qgrid', 'pops', 'losvd_hist':
-            f_name = 'datfil/orblib_' + f + '.dat'
-            txt_file.write(f'test -e {f_name} '
-                           f'&& bzip2 -kc {f_name} > {f_name}.staging.bz2 '
-                           f'&& mv {f_name}.staging.bz2 {f_name}.bz2\n')
-            txt_file.write(f'rm -f {f_name}\n')
-        txt_file.close()
-        # boxorbits
-        cmdstr_box = 'cmd_box_orbs'
-        txt_file = open(cmdstr_box, "w")
-        txt_file.write('#!/bin/bash\n')
-        txt_file.write('# first, check whether executable exists\n')
-        txt_file.write(f'test -e {self.legacy_directory}/{orb_prgrm} || ' +
-                       f'{{ echo "File {self.legacy_directory}/{orb_prgrm} ' +
-                       'not found." && exit 127; }\n')
-        txt_file.write('rm -f datfil/orblibbox.dat.tmp '
-                        'datfil/orblibbox_qgrid.dat '
-                        'datfil/orblibbox_qgrid.dat.bz2 '
-                        'datfil/orblibbox_pops.dat '
-                        'datfil/orblibbox_pops.dat.bz2 '
-                        'datfil/orblibbox_losvd_hist.dat '
-                        'datfil/orblibbox_losvd_hist.dat.bz2\n')
-        txt_file.write(f'{self.legacy_directory}/{orb_prgrm} '
-                       '< infil/orblibbox.in >> datfil/orblibbox.log\n')
-        for f in 'qgrid', 'pops', 'losvd_hist':
-            f_name = 'datfil/orblibbox_' + f + '.dat'
-            txt_file.write(
-                f'test -e {f_name} '
-                f'&& bzip2 -kc {f_name} > {f_name}.staging.bz2 '
-                f'&& mv {f_name}.staging.bz2 {f_name}.bz2\n')
-            txt_file.write(f'rm -f {f_name}\n')
-        txt_file.close()
-        # returns the name of the executables
-        return cmdstr_tube, cmdstr_box
+        path = self._find_orblib_file(file_name)
+        with open_orblib_file(path) as orblib_in:
+            buffer = orblib_in.read()
+        words = np.frombuffer(buffer, dtype=np.uint32, count=len(buffer)//4)
+        n_ap_tot = sum(n_apertures)
+        offsets, ivmin, ivmax = \
+            self._index_losvd_hist_records(words, norb * n_ap_tot, path)
+        offsets = offsets.reshape(norb, n_ap_tot)
+        ivmin = ivmin.reshape(norb, n_ap_tot)
+        ivmax = ivmax.reshape(norb, n_ap_tot)
+        velhist0 = []
+        ap_start = 0
+        for kin_idx, (nv, na) in enumerate(zip(hist_bins, n_apertures)):
+            aps = slice(ap_start, ap_start + na)
+            ap_start += na
+            if kin_sets is not None and kin_idx not in kin_sets:
+                velhist0.append(None)
+                continue
+            o_k, v_lo = offsets[:, aps].ravel(), ivmin[:, aps].ravel()
+            n_v = np.maximum(ivmax[:, aps].ravel() - v_lo + 1, 0)
+            # in file order, the payloads are the rows of the sparse storage
+            has_v = n_v > 0
+            values = self._gather_losvd_hist_values(words,
+                                                    o_k[has_v] + 5,
+                                                    2 * n_v[has_v],
+                                                    2**22 // (2 * nv))
+            first_bin = v_lo + (nv - 1) // 2
+            velhist0.append(dyn_kin.SparseHistogramValues(
+                shape=(norb, nv, na),
+                indptr=np.concatenate(([0], np.cumsum(n_v))),
+                first_bin=np.where(has_v, first_bin, 0),
+                values=values))
+        # release the decompressed file before creating dense histograms
+        del words, buffer
+        if not sparse:
+            for kin_idx in range(len(velhist0)):
+                if velhist0[kin_idx] is not None:
+                    velhist0[kin_idx] = velhist0[kin_idx].toarray()
+        return velhist0
 
-    def read_ics(self):
-        # ...
-        pass
+    def _gather_losvd_hist_values(self, words, starts, n_words, block):
+        """Gather the histogram values of a losvd_hist file
+
+        Parameters
+        ----------
+        words : 1d numpy array of dtype uint32
+            the decompressed losvd_hist file as 4 byte words
+        starts : 1d numpy array of int
+            the word offsets of the histogram values, in file order
+        n_words : 1d numpy array of int
+            the number of words of each histogram's values (2 per value)
+        block : int
+            the number of histograms gathered at once, which bounds the
+            size of the index arrays
+
+        Returns
+        -------
+        1d numpy array of dtype float
+            the values of all histograms, concatenated
+
+        """
+        ends = np.cumsum(n_words)
+        values = np.empty(ends[-1] if len(ends) > 0 else 0, dtype=np.uint32)
+        block = max(block, 1)
+        for i in range(0, len(starts), block):
+            n_w = n_words[i:i+block]
+            first, last = ends[i] - n_w[0], ends[i + len(n_w) - 1]
+            # the word offset of value word j is its record's start minus
+            # the record's position in values, plus j
+            idx = np.repeat(starts[i:i+block] - (ends[i:i+block] - n_w), n_w)
+            idx += np.arange(first, last)
+            values[first:last] = words[idx]
+        return values.view(float)
+
+    def _get_losvd_bin_edges(self, hist_width, hist_bins):
+        """Velocity bin edges of the orbit library LOSVD histograms
+
+        Parameters
+        ----------
+        hist_width : float
+            width of the velocity histogram
+        hist_bins : int
+            (odd) number of velocity bins
+
+        Returns
+        -------
+        1d numpy array of length hist_bins+1
+            the bin edges, centered on the central bin
+
+        """
+        idx_center = (hist_bins-1)/2 # integer since hist_bins is odd
+        idx_center = int(idx_center)
+        dvhist0 = hist_width/hist_bins
+        vedg = np.arange(hist_bins+1) * dvhist0
+        v = (vedg[1:] + vedg[:-1])/2.
+        v_cent = v[idx_center]
+        vedg -= v_cent
+        return vedg
 
     def _read_individual_orbit(self, fort_file, quad_light_grid_sizes):
         """Read individual orbit parameters from file
 
         Parameters
         ----------
-        fort_file : scipy.io.FortranFile object
+        fort_file : ``FortranRecordReader`` object
             The file object to read from, typically pointing to
             {fileroot}.dat (legacy) or {fileroot}_qgrid.dat (new).
         quad_light_grid_sizes : numpy array of shape (4,)
@@ -732,7 +2604,9 @@ class LegacyOrbitLibrary(OrbitLibrary):
     def read_orbit_base(self,
                         fileroot,
                         return_intrinsic_moments=False,
-                        pops=False):
+                        pops=False,
+                        kin_sets=None,
+                        read_density=True):
         """
         Read orbit library from file datfil/{fileroot}.dat.bz2'
 
@@ -743,6 +2617,8 @@ class LegacyOrbitLibrary(OrbitLibrary):
         If both "legacy" and "new" files exist, default to the new behavior.
         With 'new behavior', populations data (projected masses) may exist in
         datfil/{fileroot}_pops.dat.bz2 and can be read by setting pops=True.
+        Instead of bz2, the files may be compressed with any of the
+        ``ORBLIB_CODECS``, which is detected automatically.
 
         Parameters
         ----------
@@ -754,6 +2630,15 @@ class LegacyOrbitLibrary(OrbitLibrary):
             False (the default): only read the orbit library and LOSVD
             histograms, as needed by the weight solvers.
             True: only read the population data's orbit densities.
+        kin_sets: list of int or None
+            The kinematic sets to read the LOSVD histograms for, the records
+            of all other kinematic sets are skipped. None (the default): all
+            kinematic sets if pops==False, and only the kinematic sets
+            sharing their apertures with populations if pops==True.
+        read_density: boolean
+            Whether to read the 3D density of the orbits if pops==False. If
+            False, the 3D grid file is not read (with 'new behavior'). The
+            default is True.
 
         Returns
         -------
@@ -762,7 +2647,9 @@ class LegacyOrbitLibrary(OrbitLibrary):
         orbit library LOSVDs are stored in the list of Histogram objects, and
         the 3D density of the orbits are stored in the array object.
         pops==True will return a tuple of type (list, None) where the
-        populations' projected masses are in the list of Histogram objects.
+        populations' projected masses are appended to the list of Histogram
+        objects. The list holds None for kinematic sets not in kin_sets and
+        the array is None if read_density==False.
 
         return_intrinsic_moments is True will returns a tuple (array, list)
         where the array stores the intrinsic moments of the orblib and the
@@ -774,13 +2661,7 @@ class LegacyOrbitLibrary(OrbitLibrary):
         else:
             stars = self.system.get_unique_triaxial_visible_component()
         norb = self.settings['nE'] * self.settings['nI2'] * self.settings['nI3']
-        ml = self.parset['ml']
-        cur_dir = os.getcwd()
-        os.chdir(self.mod_dir)
-        check = os.path.isfile(f'datfil/{fileroot}_qgrid.dat.bz2')
-        check = check and os.path.isfile(f'datfil/{fileroot}_losvd_hist.dat.bz2')
-        os.chdir(cur_dir)
-        legacy_file = False if check else True
+        legacy_file = get_orblib_layout(self.mod_dir + 'datfil/') != 'new'
         if pops and legacy_file:
             err_msg = f'Pops data not available in legacy mode: {self.mod_dir}.'
             self.logger.error(err_msg)
@@ -790,19 +2671,55 @@ class LegacyOrbitLibrary(OrbitLibrary):
                       f'=True, will set pops to False: {self.mod_dir}.'
             self.logger.warning(err_msg)
 
-        if not pops:  # need orbit properties in 'non-populations' mode only
-            os.chdir(self.mod_dir)
+        # we need to read the losvd_hist file if either pops==False or
+        # pops==True and some pops and kins share apertures
+        pops_unique = [p for p in stars.population_data if p.kin_aper is None]
+        n_kins = len(stars.kinematic_data)
+        if kin_sets is None:
+            if pops:
+                kin_sets = [p.kin_aper for p in stars.population_data
+                            if p.kin_aper is not None]
+            else:
+                kin_sets = range(n_kins)
+        kin_sets = sorted(set(kin_sets))
+        read_losvds = len(kin_sets) > 0
+        # the legacy file interlaces the 3D grid and the LOSVD histograms
+        read_qgrid = not pops and (read_density or legacy_file
+                                   or return_intrinsic_moments)
+        hist_widths = [k.hist_width for k in stars.kinematic_data]
+        # UNUSED hist_centers = [k.hist_center for k in stars.kinematic_data]
+        hist_bins = [k.hist_bins for k in stars.kinematic_data]
+        n_apertures = [k.n_spatial_bins for k in stars.kinematic_data]
+        if read_losvds or (read_qgrid and legacy_file):
+            self.logger.debug('Checking number of velocity bins...')
+            if np.any(np.array(hist_bins) % 2 == 0):
+                error_msg = 'All kinematics need odd number of velocity bins.'
+                self.logger.error(error_msg)
+                raise ValueError(error_msg)
+            self.logger.debug('...checks ok.')
+        losvd_future = None
+        if read_losvds and not legacy_file and not return_intrinsic_moments \
+                and self.read_orblibs_in_parallel:
+            # parse the losvd_hist file in a separate thread while reading
+            # the qgrid file below
+            executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+            losvd_future = executor.submit(
+                self._read_losvd_hist_file,
+                f'datfil/{fileroot}_losvd_hist.dat',
+                norb,
+                hist_bins,
+                n_apertures,
+                sparse=self.settings['sparse_losvds'],
+                kin_sets=kin_sets)
+            executor.shutdown(wait=False)
+
+        if read_qgrid:  # need orbit properties in 'non-populations' mode only
             if legacy_file:
-                orblib_file = f'datfil/{fileroot}.dat.bz2'
-                tmpfname = f'datfil/{fileroot}_{ml}.dat'
+                orblib_file = f'datfil/{fileroot}.dat'
             else:
-                orblib_file = f'datfil/{fileroot}_qgrid.dat.bz2'
-                tmpfname = f'datfil/{fileroot}_qgrid_{ml}.dat'
-            # unzip orblib to a temporary file with ml value attached
-            # ml value is needed to prevent different processes clashing
-            subprocess.run(f'bunzip2 -c {orblib_file} > {tmpfname}', shell=True)
-            # read the fortran file
-            orblib_in = FortranFile(tmpfname, 'r')
+                orblib_file = f'datfil/{fileroot}_qgrid.dat'
+            # decompress and read the fortran file on the fly
+            orblib_in = self._open_orblib_file(orblib_file)
             # read size of orbit library
             # from integrator_setup_write, lines 506 - 5129:
             norb_read, _, _, _, ndith = orblib_in.read_ints(np.int32)
@@ -811,8 +2728,6 @@ class LegacyOrbitLibrary(OrbitLibrary):
                             f' is {norb_read}, but expected {norb}.'
                 self.logger.error(error_msg)
                 orblib_in.close()
-                os.remove(tmpfname)
-                os.chdir(cur_dir)
                 raise ValueError(error_msg)
             # from qgrid_setup_write, lines 2339-1350:
             quad_light_grid_sizes = orblib_in.read_ints(np.int32)
@@ -839,68 +2754,54 @@ class LegacyOrbitLibrary(OrbitLibrary):
                                                         quad_light_grid_sizes)
                 # done with orblib_qgrid.dat.bz2
                 orblib_in.close()
-                # remove temporary file
-                os.remove(tmpfname)
-                os.chdir(cur_dir)
                 if return_intrinsic_moments:  # in that case, we are done
                     return intrinsic_moms, intrinsic_grid  ####################
         else:
             density_3D = None
 
-        # next, we check whether we need to read the losvd_hist file: either
-        # pops==False or pops==True and some pops and kins share apertures
-        pops_unique = [p for p in stars.population_data if p.kin_aper is None]
-        if not pops or len(pops_unique) < len(stars.population_data):
-            if not legacy_file:  # open the losvd_hist file if needed
-                os.chdir(self.mod_dir)
-                orblib_file = f'datfil/{fileroot}_losvd_hist.dat.bz2'
-                tmpfname = f'datfil/{fileroot}_losvd_hist_{ml}.dat'
-                subprocess.run(f'bunzip2 -c {orblib_file} > {tmpfname}',
-                               shell=True)
-                # read the fortran file
-                orblib_in = FortranFile(tmpfname, 'r')
-            # read the losvd histogram data
-            # from histogram_setup_write, lines 1917-1926:
-            _ = orblib_in.read_record(np.int32, np.int32, float)
-            # tmp = orblib_in.read_record(np.int32, np.int32, float)
-            # nconstr = tmp[0][0] # = total number of apertures for ALL kinematics
-            # nvhist = tmp[1][0] # = (nvbins-1)/2 for histo of FIRST kinematic set
-            # dvhist = tmp[2][0] # = delta_v in histogram for FIRST kinematic set
-            # these nvhist and dvhist are for the first kinematic set only
-            # however, orbits are stored N times where N = number of kinematic sets
-            # histogram settings for other N-1 sets may be different from the first
-            # these aren't stored in orblib.dat so must read from kinematics objects
-            n_kins = len(stars.kinematic_data)
-            hist_widths = [k.hist_width for k in stars.kinematic_data]
-            # UNUSED hist_centers = [k.hist_center for k in stars.kinematic_data]
-            hist_bins = [k.hist_bins for k in stars.kinematic_data]
-            self.logger.debug('Checking number of velocity bins...')
-            if np.any(np.array(hist_bins) % 2 == 0):
-                error_msg = 'All kinematics need odd number of velocity bins.'
-                self.logger.error(error_msg)
-                orblib_in.close()
-                os.remove(tmpfname)
-                os.chdir(cur_dir)
-                raise ValueError(error_msg)
-            self.logger.debug('...checks ok.')
-            n_apertures = [k.n_spatial_bins for k in stars.kinematic_data]
-            # get index linking kinematic set to aperture
-            # kin_idx_per_ap[i] = N <--> aperture i is from kinematic set N
-            kin_idx_per_ap = [np.zeros(n_apertures[i], dtype=int) + i
-                              for i in range(n_kins)]
-            kin_idx_per_ap = np.concatenate(kin_idx_per_ap)
-            kin_idx_per_ap = np.array(kin_idx_per_ap, dtype=int)
-            # below we loop i_ap from 1-n_total_apertures but will need the
-            # index of i_ap for the relevant kinematic set:
-            # we use `idx_ap_reset` to do this
-            cum_n_apertures = np.cumsum(n_apertures)
-            idx_ap_reset = np.concatenate(([0], cum_n_apertures[:-1]))
-            # set up a list of arrays to hold the results
-            tmp = zip(hist_bins,n_apertures)
-            velhist0 = [np.zeros((norb, nv, na)) for (nv,na) in tmp]
-            # Next read the histograms themselves.
-            for j in range(norb):
-                if legacy_file:  # orbit info is interlaced in the legacy file
+        if read_losvds or (read_qgrid and legacy_file):
+            if legacy_file:
+                # read the losvd histogram data
+                # from histogram_setup_write, lines 1917-1926:
+                _ = orblib_in.read_record(np.int32, np.int32, float)
+                # tmp = orblib_in.read_record(np.int32, np.int32, float)
+                # nconstr = tmp[0][0] # = total number of apertures for ALL kinematics
+                # nvhist = tmp[1][0] # = (nvbins-1)/2 for histo of FIRST kinematic set
+                # dvhist = tmp[2][0] # = delta_v in histogram for FIRST kinematic set
+                # these nvhist and dvhist are for the first kinematic set only
+                # however, orbits are stored N times where N = number of kinematic sets
+                # histogram settings for other N-1 sets may be different from the first
+                # these aren't stored in orblib.dat so must read from kinematics objects
+            if losvd_future is not None:
+                velhist0 = losvd_future.result()
+            elif not legacy_file:  # parse the whole losvd_hist file at once
+                orblib_file = f'datfil/{fileroot}_losvd_hist.dat'
+                velhist0 = self._read_losvd_hist_file(
+                    orblib_file,
+                    norb,
+                    hist_bins,
+                    n_apertures,
+                    sparse=self.settings['sparse_losvds'],
+                    kin_sets=kin_sets)
+            else:
+                # get index linking kinematic set to aperture
+                # kin_idx_per_ap[i] = N <--> aperture i is from kinematic set N
+                kin_idx_per_ap = [np.zeros(n_apertures[i], dtype=int) + i
+                                  for i in range(n_kins)]
+                kin_idx_per_ap = np.concatenate(kin_idx_per_ap)
+                kin_idx_per_ap = np.array(kin_idx_per_ap, dtype=int)
+                # below we loop i_ap from 1-n_total_apertures but will need
+                # the index of i_ap for the relevant kinematic set:
+                # we use `idx_ap_reset` to do this
+                cum_n_apertures = np.cumsum(n_apertures)
+                idx_ap_reset = np.concatenate(([0], cum_n_apertures[:-1]))
+                # set up a list of arrays to hold the results
+                tmp = zip(hist_bins,n_apertures)
+                velhist0 = [np.zeros((norb, nv, na)) if i in kin_sets else None
+                            for i, (nv,na) in enumerate(tmp)]
+                # Next read the histograms themselves, orbit info is
+                # interlaced in the legacy file.
+                for j in range(norb):
                     if return_intrinsic_moments:
                         _, _, intrinsic_moms[j] = \
                             self._read_individual_orbit(orblib_in,
@@ -909,62 +2810,47 @@ class LegacyOrbitLibrary(OrbitLibrary):
                         orbtypes[j, :], density_3D[j] , _ = \
                             self._read_individual_orbit(orblib_in,
                                                         quad_light_grid_sizes)
-                for i_ap, kin_idx in enumerate(kin_idx_per_ap):
-                    i_ap0 = i_ap - idx_ap_reset[kin_idx]
-                    ivmin, ivmax = orblib_in.read_ints(np.int32)
-                    if ivmin <= ivmax:
-                        nv0 = (hist_bins[kin_idx]-1)/2
-                        # ^--- this is an integer since hist_bins is odd
-                        nv0 = int(nv0)
-                        tmp = orblib_in.read_reals(float)
-                        velhist0[kin_idx][j, ivmin+nv0:ivmax+nv0+1, i_ap0] = tmp
-            orblib_in.close()
-            # remove temporary file
-            os.remove(tmpfname)
-            os.chdir(cur_dir)
+                    for i_ap, kin_idx in enumerate(kin_idx_per_ap):
+                        i_ap0 = i_ap - idx_ap_reset[kin_idx]
+                        ivmin, ivmax = orblib_in.read_ints(np.int32)
+                        if ivmin <= ivmax and velhist0[kin_idx] is None:
+                            orblib_in.skip_record()
+                        elif ivmin <= ivmax:
+                            nv0 = (hist_bins[kin_idx]-1)/2
+                            # ^--- this is an integer since hist_bins is odd
+                            nv0 = int(nv0)
+                            tmp = orblib_in.read_reals(float)
+                            velhist0[kin_idx][j, ivmin+nv0:ivmax+nv0+1, i_ap0] = tmp
+                orblib_in.close()
+                if not read_density:
+                    density_3D = None
             if return_intrinsic_moments:
                 return intrinsic_moms, intrinsic_grid  #######################
             else:
                 velhists = []
                 for i, velhist in enumerate(velhist0):
-                    width0 = hist_widths[i]
-                    bins0 = hist_bins[i]
-                    idx_center = (bins0-1)/2 # integer since hist_bins is odd
-                    idx_center = int(idx_center)
-                    dvhist0 = width0/bins0
-                    vedg = np.arange(bins0+1) * dvhist0
-                    v = (vedg[1:] + vedg[:-1])/2.
-                    v_cent = v[idx_center]
-                    vedg -= v_cent
+                    if velhist is None:
+                        velhists += [None]
+                        continue
+                    vedg = self._get_losvd_bin_edges(hist_widths[i],
+                                                     hist_bins[i])
                     vvv = dyn_kin.Histogram(xedg=vedg,
                                             y=velhist,
                                             normalise=False)
                     velhists += [vvv]
         else:
-            velhists = []
+            velhists = [None] * n_kins
 
         if pops and len(pops_unique) > 0:  # read remaining population data
             n_apertures = [p.n_spatial_bins for p in pops_unique]
             # set up a list of arrays to hold the results
             mass0 = [np.zeros((norb, 1, na)) for na in n_apertures]
             # Next read the projected masses (0d histograms) themselves.
-            pops_file = f'datfil/{fileroot}_pops.dat.bz2'
-            if not os.path.isfile(self.mod_dir + pops_file):
-                error_msg = f'Pops file {self.mod_dir}{pops_file} missing.'
-                self.logger.error(error_msg)
-                raise FileNotFoundError(error_msg)
-            os.chdir(self.mod_dir)
-            tmpfname = f'datfil/{fileroot}_pops_{ml}.dat'
-            subprocess.run(f'bunzip2 -c {pops_file} > {tmpfname}', shell=True)
-            # read the fortran file
-            orblib_in = FortranFile(tmpfname, 'r')
-            for j in range(norb):
-                for mass in mass0:
-                    mass[j, 0, :] = orblib_in.read_reals(float)
-            orblib_in.close()
-            # remove temporary file
-            os.remove(tmpfname)
-            os.chdir(cur_dir)
+            pops_file = f'datfil/{fileroot}_pops.dat'
+            with self._open_orblib_file(pops_file) as orblib_in:
+                for j in range(norb):
+                    for mass in mass0:
+                        mass[j, 0, :] = orblib_in.read_reals(float)
             # append the populations data to the velhists
             for mass in mass0:
                 vvv = dyn_kin.Histogram(xedg=np.array([-0.5, 0.5]),
@@ -996,6 +2882,16 @@ class LegacyOrbitLibrary(OrbitLibrary):
         error_msg = 'velocity array must be symmetric'
         assert np.allclose(orblib.xedg, -orblib.xedg[::-1]), error_msg
         self.logger.debug('...check ok.')
+        if orblib.sparse is not None:
+            n_orbs = orblib.shape[0]
+            # orbit i of the concatenation of losvd and its flipped version
+            # becomes orbit 2i (i < n_orbs) or 2(i-n_orbs)+1 (i >= n_orbs)
+            interlace = np.arange(2*n_orbs).reshape(2, n_orbs).T.ravel()
+            new_losvd = dyn_kin.SparseHistogramValues.concatenate(
+                [orblib.sparse, orblib.sparse.flip()]).take_orbits(interlace)
+            return dyn_kin.Histogram(xedg=orblib.xedg,
+                                     y=new_losvd,
+                                     normalise=False)
         losvd = orblib.y
         n_orbs, n_vel_bins, n_spatial_bins = losvd.shape
         reveresed_losvd = losvd[:, ::-1, :]
@@ -1021,13 +2917,18 @@ class LegacyOrbitLibrary(OrbitLibrary):
         new_intmom[1::2, :] = reversed_intmom
         return new_intmom
 
-    def combine_orblibs(self, orblib1, orblib2):
+    def combine_orblibs(self, orblib1, orblib2, mirror_first=False):
         """Combine two LOSVD histograms into one.
 
         Parameters
         ----------
         orblib1 : ``dyn.kinematics.Histogram``
         orblib2 : ``dyn.kinematics.Histogram``
+        mirror_first : bool, optional
+            If True, orblib1 is duplicated, flipped, and interlaced as in
+            ``duplicate_flip_and_interlace_orblib`` while combining, writing
+            directly into the combined histograms instead of creating the
+            mirrored orbit library first. The default is False.
 
         Returns
         -------
@@ -1035,9 +2936,14 @@ class LegacyOrbitLibrary(OrbitLibrary):
             the combined orbit libraries
 
         """
+        if mirror_first:
+            self.logger.debug('Checking for symmetric velocity array...')
+            error_msg = 'velocity array must be symmetric'
+            assert np.allclose(orblib1.xedg, -orblib1.xedg[::-1]), error_msg
+            self.logger.debug('...check ok.')
         # check orblibs are compatible
-        n_orbs1, n_vel_bins1, n_spatial_bins1 = orblib1.y.shape
-        n_orbs2, n_vel_bins2, n_spatial_bins2 = orblib2.y.shape
+        n_orbs1, n_vel_bins1, n_spatial_bins1 = orblib1.shape
+        n_orbs2, n_vel_bins2, n_spatial_bins2 = orblib2.shape
         self.logger.debug('Checking number of velocity bins...')
         error_msg = 'orblibs have different number of velocity bins'
         assert n_vel_bins1==n_vel_bins2, error_msg
@@ -1048,32 +2954,75 @@ class LegacyOrbitLibrary(OrbitLibrary):
         error_msg = 'orblibs have different number of spatial bins'
         assert n_spatial_bins1==n_spatial_bins2, error_msg
         self.logger.debug('...checks ok.')
-        new_losvd = np.zeros((n_orbs1 + n_orbs2,
+        if orblib1.sparse is not None or orblib2.sparse is not None:
+            # keep the storage sparse if any of the orblibs is sparse
+            sparse1, sparse2 = [
+                o.sparse if o.sparse is not None
+                else dyn_kin.SparseHistogramValues.from_dense(o.y)
+                for o in (orblib1, orblib2)]
+            if mirror_first:
+                new_losvd = sparse1.mirror_and_concatenate(sparse2)
+            else:
+                new_losvd = dyn_kin.SparseHistogramValues.concatenate(
+                    [sparse1, sparse2])
+            return dyn_kin.Histogram(xedg=orblib1.xedg,
+                                     y=new_losvd,
+                                     normalise=False)
+        if mirror_first:
+            n_orbs1 *= 2
+        new_losvd = np.empty((n_orbs1 + n_orbs2,
                               n_vel_bins1,
                               n_spatial_bins1))
-        new_losvd[:n_orbs1] = orblib1.y
+        if mirror_first:
+            new_losvd[0:n_orbs1:2] = orblib1.y
+            new_losvd[1:n_orbs1:2] = orblib1.y[:, ::-1, :]
+        else:
+            new_losvd[:n_orbs1] = orblib1.y
         new_losvd[n_orbs1:] = orblib2.y
         new_orblib = dyn_kin.Histogram(xedg=orblib1.xedg,
                                        y=new_losvd,
                                        normalise=False)
         return new_orblib
 
-    def read_losvd_histograms(self, pops=False):
+    def read_losvd_histograms(self,
+                              pops=False,
+                              kin_sets=None,
+                              read_intrinsic_masses=True):
         """Read the orbit library
 
         Read box orbits and tube orbits, mirrors the latter, and combines.
         Rescales the velocity axis according to the ``ml`` value. Sets LOSVDs
         and 3D grid/aperture masses of the combined orbit library.
         If pops=True, only calculates the populations' projected masses.
+        If the orblib setting ``cache_losvds`` is True, the decoded orbit
+        library is cached in datfil/losvd_cache/ and re-used by all ml
+        models of this orbit library. Reading only some of the kinematic
+        sets or skipping the 3D grid masses uses, but does not write, the
+        caches.
+
+        Parameters
+        ----------
+        pops : bool, optional
+            If True, only read the populations' projected masses. The
+            default is False.
+        kin_sets : list of int or None, optional
+            Only read the LOSVDs of these kinematic sets, skipping all other
+            kinematic sets' records. The default is None (all kinematic
+            sets). Ignored if pops is True.
+        read_intrinsic_masses : bool, optional
+            Whether to read the 3D grid/intrinsic masses. The default is
+            True. Ignored if pops is True.
 
         Returns
         -------
         If pops is False, sets the attributes:
             -   ``self.losvd_histograms``: a list, whose i'th entry is a
                 ``dyn.kinematics.Histogram`` object holding the orbit lib LOSVDs
-                binned for the i'th kinematic set
+                binned for the i'th kinematic set (None if not in kin_sets)
             -   ``self.intrinsic_masses``: 3D grid/intrinsic masses of orbit lib
+                (None if read_intrinsic_masses is False)
             -   ``self.projected_masses``: aperture/proj. masses of orbit lib
+                (None for kinematic sets not in kin_sets)
             -   ``self.n_orbs``: number of orbits in the orbit library
         If pops is True, sets the attribute:
             -   ``self.pops_projected _masses``: aperture/proj. masses of
@@ -1086,18 +3035,40 @@ class LegacyOrbitLibrary(OrbitLibrary):
             stars = self.system.get_unique_triaxial_visible_component()
         n_kins = len(stars.kinematic_data)
         n_pops = len(stars.population_data) if pops else 0
+        if n_pops > 0:  # the populations read their kin sets themselves
+            kin_sets, read_intrinsic_masses = None, False
+        elif kin_sets is None:
+            kin_sets = list(range(n_kins))
+        else:
+            kin_sets = sorted(set(kin_sets))
+        partial = n_pops == 0 and (len(kin_sets) < n_kins
+                                   or not read_intrinsic_masses)
+        if n_pops == 0 and \
+                self._read_losvd_memory_cache(kin_sets, read_intrinsic_masses):
+            return
+        if n_pops == 0 and self.settings['cache_losvds']:
+            if self._read_losvd_cache(kin_sets, read_intrinsic_masses):
+                return
 
+        box_future = None
+        if self.read_orblibs_in_parallel:
+            # read box orbits in a separate thread while reading tube orbits
+            executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+            box_future = executor.submit(self._read_orbit_base_checked,
+                                         'orblibbox',
+                                         'box',
+                                         pops=pops,
+                                         kin_sets=kin_sets,
+                                         read_density=read_intrinsic_masses)
+            executor.shutdown(wait=False)
         # TODO: check if this ordering is compatible with weights read in by
         # LegacyWeightSolver.read_weights
-        try:
-            tube_orblib, tube_density_3D = self.read_orbit_base('orblib',
-                                                                pops=pops)
-        except:
-            self.logger.error('Something went seriously wrong when reading '
-                              'the tube orbit library. Check disk quota, file '
-                              'integrity, and consistent config files. '
-                              f'Model: {self.mod_dir}.')
-            raise
+        tube_orblib, tube_density_3D = \
+            self._read_orbit_base_checked('orblib',
+                                          'tube',
+                                          pops=pops,
+                                          kin_sets=kin_sets,
+                                          read_density=read_intrinsic_masses)
         if n_pops > 0:      # build tube_pops from re-used kin and
             tube_pops = []  # genuine pops apertures
             for pop_idx, population in enumerate(stars.population_data):
@@ -1110,30 +3081,21 @@ class LegacyOrbitLibrary(OrbitLibrary):
                 self.logger.error(err_msg)
                 raise ValueError(err_msg)
 
-        if not self.system.is_bar_disk_system():
-            # tube orbits are mirrored/flipped and used twice
-            tmp = []
-            if n_pops == 0:
-                for tube_orblib0 in tube_orblib:
-                    tmp += \
-                        [self.duplicate_flip_and_interlace_orblib(tube_orblib0)]
-                tube_orblib = tmp
-                tube_density_3D = np.repeat(tube_density_3D, 2, axis=0)
-            else:
-                for t in tube_pops:
-                    tmp.append(self.duplicate_flip_and_interlace_orblib(t))
-                tube_pops = tmp
+        # tube orbits are mirrored/flipped and used twice, this is done
+        # while combining them with the box orbits
+        mirror = not self.system.is_bar_disk_system()
 
         # read box orbits
-        try:
-            box_orblib, box_density_3D = self.read_orbit_base('orblibbox',
-                                                              pops=pops)
-        except:
-            self.logger.error('Something went seriously wrong when reading '
-                              'the box orbit library. Check disk quota, file '
-                              'integrity, and consistent config files. '
-                              f'Model: {self.mod_dir}.')
-            raise
+        if box_future is not None:
+            box_orblib, box_density_3D = box_future.result()
+        else:
+            box_orblib, box_density_3D = \
+                self._read_orbit_base_checked(
+                    'orblibbox',
+                    'box',
+                    pops=pops,
+                    kin_sets=kin_sets,
+                    read_density=read_intrinsic_masses)
         if n_pops > 0:
             box_pops = []
             for pop_idx, population in enumerate(stars.population_data):
@@ -1150,28 +3112,423 @@ class LegacyOrbitLibrary(OrbitLibrary):
         if n_pops == 0:
             orblib = []
             for (t0, b0) in zip(tube_orblib, box_orblib):
-                orblib0 = self.combine_orblibs(t0, b0)
+                orblib0 = None if t0 is None else \
+                    self.combine_orblibs(t0, b0, mirror_first=mirror)
                 orblib += [orblib0]
+            del tube_orblib, box_orblib
         else:
             pops = []
             for (t0, b0) in zip(tube_pops, box_pops):
-                pops += [self.combine_orblibs(t0, b0)]
+                pops += [self.combine_orblibs(t0, b0, mirror_first=mirror)]
         # combine density_3D arrays
         if n_pops == 0:
-            density_3D = np.vstack((tube_density_3D, box_density_3D))
-            for i in range(n_kins):
-                orblib[i].scale_x_values(self.velocity_scaling_factor)
-            self.losvd_histograms = orblib
-            self.intrinsic_masses = density_3D
-            self.n_orbs = \
-                self.losvd_histograms[0].y.shape[0] if n_kins > 0 else 0
-            proj_mass = [np.sum(self.losvd_histograms[i].y,1)
-                         for i in range(n_kins)]
-            self.projected_masses = proj_mass
+            density_3D = None
+            if tube_density_3D is not None:
+                step = 2 if mirror else 1
+                n_tube = len(tube_density_3D) * step
+                density_3D = np.empty((n_tube + len(box_density_3D),)
+                                      + box_density_3D.shape[1:])
+                for i in range(step):
+                    density_3D[i:n_tube:step] = tube_density_3D
+                density_3D[n_tube:] = box_density_3D
+            proj_mass = [None if orblib0 is None else orblib0.get_sum()
+                         for orblib0 in orblib]
+            if self.settings['cache_losvds'] and not partial:
+                self._write_losvd_cache(orblib, density_3D, proj_mass)
+            if not partial:
+                self._write_losvd_memory_cache(orblib, density_3D, proj_mass)
+            self._set_losvd_histograms(orblib, density_3D, proj_mass)
         else:
-            proj_mass = [np.sum(pops[i].y,1) for i in range(n_pops)]
+            proj_mass = [pops[i].get_sum() for i in range(n_pops)]
             self.pops_projected_masses = proj_mass
 
+    def read_orbit_losvds(self, orbits, kin_set=0, apertures=None):
+        """Read the LOSVDs of selected orbits and apertures
+
+        Provides random access to the combined (mirrored tube and box)
+        orbit library via the uncompressed cache in datfil/losvd_cache/,
+        which serves as the offset index: only the requested orbits'
+        records are read from the memory-mapped cache files. If the cache
+        does not exist yet, it is created by reading the orbit library
+        once. If the orblib setting ``cache_losvds`` is False, the
+        kinematic set is read from the orbit library files instead.
+
+        Parameters
+        ----------
+        orbits : int array
+            indices of the orbits in the combined orbit library, i.e., as
+            for the orbit weights
+        kin_set : int, optional
+            index of the kinematic set. The default is 0.
+        apertures : int array, optional
+            indices of the apertures of the kinematic set. The default is
+            None (all apertures).
+
+        Returns
+        -------
+        ``dyn.kinematics.Histogram``
+            the LOSVDs of shape (len(orbits), n_bins, len(apertures)), with
+            velocities scaled according to the ``ml`` value
+
+        """
+        orbits = np.atleast_1d(orbits)
+        cached = None
+        if self.settings['cache_losvds']:
+            cached = self._load_losvd_cache([kin_set], False, mmap_index=True)
+            if cached is None:  # create the cache
+                self.read_losvd_histograms()
+                cached = self._load_losvd_cache([kin_set],
+                                                False,
+                                                mmap_index=True)
+        if cached is None:
+            self.read_losvd_histograms(kin_sets=[kin_set],
+                                       read_intrinsic_masses=False)
+            losvds = self.losvd_histograms[kin_set]
+        else:
+            losvds = cached[0][kin_set]
+            losvds.scale_x_values(self.velocity_scaling_factor)
+        if losvds.sparse is not None:
+            y = losvds.sparse.take_orbits(orbits, apertures)
+        else:
+            y = np.asarray(losvds.y[orbits])
+            if apertures is not None:
+                y = y[:, :, apertures]
+        return dyn_kin.Histogram(xedg=losvds.xedg, y=y, normalise=False)
+
+    def _read_orbit_base_checked(self, fileroot, orbit_type, **kwargs):
+        """Read an orbit library via ``read_orbit_base``, log failures
+
+        Parameters
+        ----------
+        fileroot : string
+            Either 'orblib' or 'orblibbox'.
+        orbit_type : string
+            Either 'tube' or 'box', used in the error message.
+        **kwargs
+            Passed on to ``read_orbit_base``.
+
+        Returns
+        -------
+        tuple
+            The result of ``read_orbit_base``.
+
+        """
+        try:
+            return self.read_orbit_base(fileroot, **kwargs)
+        except:
+            self.logger.error('Something went seriously wrong when reading '
+                              f'the {orbit_type} orbit library. Check disk '
+                              'quota, file integrity, and consistent config '
+                              f'files. Model: {self.mod_dir}.')
+            raise
+
+    def _set_losvd_histograms(self, orblib, density_3D, proj_mass):
+        """Scale the velocity axis and set the orbit library attributes
+
+        Parameters
+        ----------
+        orblib : list of ``dyn.kinematics.Histogram``
+            the combined orbit library LOSVDs of each kinematic set, with
+            velocities not yet scaled by ``self.velocity_scaling_factor``,
+            None for kinematic sets that were not read
+        density_3D : array or None
+            3D grid/intrinsic masses of the combined orbit library
+        proj_mass : list of arrays
+            aperture/projected masses of each kinematic set, None for
+            kinematic sets that were not read
+
+        """
+        n_orbs = [orblib0.shape[0] for orblib0 in orblib if orblib0 is not None]
+        if density_3D is not None:
+            n_orbs.append(len(density_3D))
+        for orblib0 in orblib:
+            if orblib0 is not None:
+                orblib0.scale_x_values(self.velocity_scaling_factor)
+        self.losvd_histograms = orblib
+        self.intrinsic_masses = density_3D
+        self.n_orbs = n_orbs[0] if n_orbs else 0
+        self.projected_masses = proj_mass
+
+    def _get_losvd_cache_key(self):
+        """Key identifying the orbit library files a LOSVD cache is based on
+
+        Returns
+        -------
+        1d numpy array of int64
+            the number of kinematic sets and the ``sparse_losvds`` setting
+            followed by the sizes and modification times of the (new and
+            legacy) orbit library files, -1 for files that do not exist
+
+        """
+        if self.system.is_bar_disk_system():
+            stars = self.system.get_unique_bar_component()
+        else:
+            stars = self.system.get_unique_triaxial_visible_component()
+        key = [len(stars.kinematic_data), self.settings['sparse_losvds']]
+        return np.append(np.array(key, dtype=np.int64),
+                         self._get_orblib_files_key())
+
+    def _get_orblib_files_key(self):
+        """Key identifying the current orbit library files
+
+        Returns
+        -------
+        1d numpy array of int64
+            the sizes and modification times of the (new and legacy) orbit
+            library files, -1 for files that do not exist
+
+        """
+        key = []
+        for fileroot in 'orblib', 'orblibbox':
+            for f in '_qgrid', '_losvd_hist', '':
+                f_name = find_orblib_file(
+                    f'{self.mod_dir}datfil/{fileroot}{f}.dat')
+                if f_name is None:
+                    key += [-1, -1]
+                else:
+                    stat = os.stat(f_name)
+                    key += [stat.st_size, stat.st_mtime_ns]
+        return np.array(key, dtype=np.int64)
+
+    def _write_losvd_cache(self, orblib, density_3D, proj_mass):
+        """Write the decoded orbit library to datfil/losvd_cache/
+
+        The combined (tube and box) orbit library LOSVDs, 3D grid masses,
+        and projected masses are saved as uncompressed .npy files, so that
+        all ml models of this orbit library can memory-map them instead of
+        decoding the compressed orbit library files again. The velocities
+        are stored unscaled, i.e. independent of ml. Sparse LOSVDs are
+        stored as their values, indptr, first_bin, and shape arrays. The
+        cache key, extended by a sparse/dense flag per kinematic set, is
+        written last and failing to write the cache is not an error.
+
+        Parameters
+        ----------
+        orblib : list of ``dyn.kinematics.Histogram``
+            the combined orbit library LOSVDs of each kinematic set
+        density_3D : array
+            3D grid/intrinsic masses of the combined orbit library
+        proj_mass : list of arrays
+            aperture/projected masses of each kinematic set
+
+        """
+        cache_dir = self.mod_dir + 'datfil/losvd_cache/'
+        arrays = {'density_3D': density_3D}
+        for i, (orblib0, proj_mass0) in enumerate(zip(orblib, proj_mass)):
+            if orblib0.sparse is not None:
+                for attr in 'values', 'indptr', 'first_bin', 'shape':
+                    arrays[f'losvd_{i}_{attr}'] = \
+                        np.asarray(getattr(orblib0.sparse, attr))
+            else:
+                arrays[f'losvd_{i}'] = orblib0.y
+            arrays[f'projected_masses_{i}'] = proj_mass0
+        is_sparse = [orblib0.sparse is not None for orblib0 in orblib]
+        arrays['key'] = np.append(self._get_losvd_cache_key(), is_sparse)
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            if os.path.isfile(cache_dir + 'key.npy'):
+                os.remove(cache_dir + 'key.npy')
+            for name, array in arrays.items():
+                # write to a temporary file first so that concurrent readers
+                # never see incomplete files
+                tmp_file = f'{cache_dir}{name}.{os.getpid()}.tmp'
+                with open(tmp_file, 'wb') as f:
+                    np.save(f, array)
+                os.replace(tmp_file, f'{cache_dir}{name}.npy')
+        except OSError as e:
+            self.logger.warning(f'Could not write LOSVD cache {cache_dir}: '
+                                f'{e}. Continuing without cache.')
+        else:
+            self.logger.debug(f'LOSVD cache {cache_dir} written.')
+
+    def _read_losvd_cache(self, kin_sets, read_intrinsic_masses):
+        """Read the decoded orbit library from datfil/losvd_cache/
+
+        If the cache exists and its key matches the orbit library files,
+        the LOSVDs and 3D grid masses are memory-mapped (copy-on-write, so
+        modifying the arrays in memory never alters the cache) and the
+        attributes are set as in ``read_losvd_histograms``.
+
+        Parameters
+        ----------
+        kin_sets : list of int
+            the kinematic sets to set the LOSVDs and projected masses for
+        read_intrinsic_masses : bool
+            whether to set the 3D grid masses
+
+        Returns
+        -------
+        bool
+            True if the attributes were set from the cache, False otherwise
+
+        """
+        cached = self._load_losvd_cache(kin_sets, read_intrinsic_masses)
+        if cached is None:
+            return False
+        orblib, density_3D, proj_mass = cached
+        if all(o is not None for o in orblib) and read_intrinsic_masses:
+            self._write_losvd_memory_cache(orblib, density_3D, proj_mass)
+        self._set_losvd_histograms(orblib, density_3D, proj_mass)
+        self.logger.debug('LOSVDs read from cache '
+                          f'{self.mod_dir}datfil/losvd_cache/.')
+        return True
+
+    def _load_losvd_cache(self,
+                          kin_sets,
+                          read_intrinsic_masses,
+                          mmap_index=False):
+        """Memory-map the decoded orbit library in datfil/losvd_cache/
+
+        Parameters
+        ----------
+        kin_sets : list of int
+            the kinematic sets to load the LOSVDs and projected masses for
+        read_intrinsic_masses : bool
+            whether to load the 3D grid masses
+        mmap_index : bool, optional
+            If True, also memory-map the ``indptr`` and ``first_bin`` arrays
+            of sparse LOSVDs (read-only), e.g., for random access to a few
+            orbits. The default is False.
+
+        Returns
+        -------
+        None if the cache does not exist or does not match the orbit
+        library files and kinematics, otherwise a tuple (orblib, density_3D,
+        proj_mass) as passed to ``_set_losvd_histograms``
+
+        """
+        if self.system.is_bar_disk_system():
+            stars = self.system.get_unique_bar_component()
+        else:
+            stars = self.system.get_unique_triaxial_visible_component()
+        cache_dir = self.mod_dir + 'datfil/losvd_cache/'
+        if not os.path.isfile(cache_dir + 'key.npy'):
+            return None
+        mmap_index = 'r' if mmap_index else None
+        try:
+            key = np.load(cache_dir + 'key.npy')
+            n_kins = len(stars.kinematic_data)
+            if not np.array_equal(key[:-n_kins or None],
+                                  self._get_losvd_cache_key()):
+                self.logger.debug(f'LOSVD cache {cache_dir} is outdated.')
+                return None
+            density_3D = None
+            if read_intrinsic_masses:
+                density_3D = np.load(cache_dir + 'density_3D.npy',
+                                     mmap_mode='c')
+            orblib, proj_mass = [], []
+            for i, kin in enumerate(stars.kinematic_data):
+                if i not in kin_sets:
+                    orblib.append(None)
+                    proj_mass.append(None)
+                    continue
+                if key[i-n_kins]:  # sparse
+                    f_root = f'{cache_dir}losvd_{i}_'
+                    y = dyn_kin.SparseHistogramValues(
+                        shape=np.load(f_root + 'shape.npy'),
+                        indptr=np.load(f_root + 'indptr.npy',
+                                       mmap_mode=mmap_index),
+                        first_bin=np.load(f_root + 'first_bin.npy',
+                                          mmap_mode=mmap_index),
+                        values=np.load(f_root + 'values.npy', mmap_mode='c'))
+                else:
+                    y = np.load(f'{cache_dir}losvd_{i}.npy', mmap_mode='c')
+                if y.shape[1:] != (kin.hist_bins, kin.n_spatial_bins):
+                    self.logger.debug(f'LOSVD cache {cache_dir} does not '
+                                      'match the kinematics.')
+                    return None
+                vedg = self._get_losvd_bin_edges(kin.hist_width,
+                                                 kin.hist_bins)
+                orblib.append(dyn_kin.Histogram(xedg=vedg,
+                                                y=y,
+                                                normalise=False))
+                proj_mass.append(
+                    np.load(f'{cache_dir}projected_masses_{i}.npy'))
+        except (OSError, ValueError) as e:
+            self.logger.warning(f'Could not read LOSVD cache {cache_dir}: '
+                                f'{e}. Reading orbit library files.')
+            return None
+        return orblib, density_3D, proj_mass
+
+    def _write_losvd_memory_cache(self, orblib, density_3D, proj_mass):
+        """Store the decoded orbit library in ``orblib_cache``
+
+        The process-local cache holds the LOSVDs with unscaled velocities,
+        so that all ml models of this orbit library can use the entry. The
+        LOSVD values are not copied, but shared with ``orblib`` and made
+        read-only (see ``dyn.kinematics.Histogram.share``). The (small)
+        masses are copied.
+
+        Parameters
+        ----------
+        orblib : list of ``dyn.kinematics.Histogram``
+            the combined orbit library LOSVDs of each kinematic set, with
+            velocities not yet scaled by ``self.velocity_scaling_factor``
+        density_3D : array
+            3D grid/intrinsic masses of the combined orbit library
+        proj_mass : list of arrays
+            aperture/projected masses of each kinematic set
+
+        """
+        orblib_cache.set_max_bytes(
+            int(self.settings['losvd_memory_cache_mb'] * 2**20))
+        if orblib_cache.max_bytes == 0:
+            return
+        key = os.path.realpath(self.mod_dir)
+        orblib = [orblib0.share() for orblib0 in orblib]
+        density_3D = np.array(density_3D)
+        proj_mass = [np.array(proj_mass0) for proj_mass0 in proj_mass]
+        n_bytes = density_3D.nbytes + sum(p.nbytes for p in proj_mass)
+        for orblib0 in orblib:
+            if orblib0.sparse is not None:
+                n_bytes += orblib0.sparse.nbytes
+            else:
+                n_bytes += orblib0.y.nbytes
+        orblib_cache.put(key,
+                         self._get_losvd_cache_key(),
+                         (orblib, density_3D, proj_mass),
+                         n_bytes)
+
+    def _read_losvd_memory_cache(self, kin_sets, read_intrinsic_masses):
+        """Read the decoded orbit library from ``orblib_cache``
+
+        If this process has read the (unchanged) orbit library before and
+        the entry has not been evicted, the attributes are set as in
+        ``read_losvd_histograms`` from the entry. The LOSVDs share their
+        read-only values with the entry, see
+        ``dyn.kinematics.Histogram.share``.
+
+        Parameters
+        ----------
+        kin_sets : list of int
+            the kinematic sets to set the LOSVDs and projected masses for
+        read_intrinsic_masses : bool
+            whether to set the 3D grid masses
+
+        Returns
+        -------
+        bool
+            True if the attributes were set from the cache, False otherwise
+
+        """
+        orblib_cache.set_max_bytes(
+            int(self.settings['losvd_memory_cache_mb'] * 2**20))
+        if orblib_cache.max_bytes == 0:
+            return False
+        data = orblib_cache.get(os.path.realpath(self.mod_dir),
+                                self._get_losvd_cache_key())
+        if data is None:
+            return False
+        orblib, density_3D, proj_mass = data
+        self._set_losvd_histograms(
+            [o.share() if i in kin_sets else None
+             for i, o in enumerate(orblib)],
+            density_3D.copy() if read_intrinsic_masses else None,
+            [p.copy() if i in kin_sets else None
+             for i, p in enumerate(proj_mass)])
+        self.logger.debug(f'LOSVDs of {self.mod_dir} read from memory.')
+        return True
+
     def read_orbit_intrinsic_moments(self, cache=True):
         """Read the intrinsic moments of the orbit library.
 
@@ -1183,8 +3540,8 @@ class LegacyOrbitLibrary(OrbitLibrary):
         ----------
         cache : bool, optional
             If True, the intrinsic moments and the bin edges are cached
-            between calls to this method. The cache files are stored in the
-            orbit library's datfil/ directory. The default is True.
+            in the orbit library's datfil/intmoms_cache/ directory, see
+            ``read_intrinsic_moment_groups``. The default is True.
 
         Returns
         -------
@@ -1196,54 +3553,138 @@ class LegacyOrbitLibrary(OrbitLibrary):
             contains grid bin edges over spherical (r, theta, phi).
 
         """
-        mom_file = self.mod_dir + 'datfil/intmoms.npz'
-        grid_file = self.mod_dir + 'datfil/int_grid.npz'
-        mom_file_exists = os.path.isfile(mom_file)
-        grid_file_exists = os.path.isfile(grid_file)
-        if cache and mom_file_exists and grid_file_exists:
-            with np.load(mom_file, allow_pickle=False) as data:
-                intmoms = data['intmoms']
-            with np.load(grid_file, allow_pickle=False) as data:
-                int_grid = [data[x] for x in ('r', 'th', 'ph')]
-        else:
-            intmom_tubes, int_grid = self.read_orbit_base(
-                'orblib',
-                return_intrinsic_moments=True)
-            intmom_tubes = \
-                self.duplicate_flip_and_interlace_intmoms(intmom_tubes)
-            intmom_boxes, _ = self.read_orbit_base(
-                'orblibbox',
-                return_intrinsic_moments=True)
-            intmoms = np.concatenate((intmom_tubes, intmom_boxes), 0)
-            velscale = self.velocity_scaling_factor
-            conversion_factor = self.system.distMPc * 1e6 * \
-                                np.tan(np.pi/648000.0) * PARSEC_KM
-            intmoms[:,:,:,:,1] /= conversion_factor # kpc -> arcsec
-            intmoms[:,:,:,:,2] /= conversion_factor
-            intmoms[:,:,:,:,3] /= conversion_factor
-            intmoms[:,:,:,:,4] *= velscale # for velocity stretching due to M/L
-            intmoms[:,:,:,:,5] *= velscale
-            intmoms[:,:,:,:,6] *= velscale
-            intmoms[:,:,:,:,7] *= velscale**2.
-            intmoms[:,:,:,:,8] *= velscale**2.
-            intmoms[:,:,:,:,9] *= velscale**2.
-            intmoms[:,:,:,:,10] *= velscale**2.
-            intmoms[:,:,:,:,11] *= velscale**2.
-            intmoms[:,:,:,:,12] *= velscale**2.
-            int_grid[0] /= conversion_factor # kpc -> arcsec
-            if cache:
-                if mom_file_exists:
-                    os.remove(mom_file)
-                if grid_file_exists:
-                    os.remove(grid_file)
-                np.savez_compressed(mom_file, intmoms=intmoms)
-                np.savez(grid_file,
-                         r=int_grid[0],
-                         th=int_grid[1],
-                         ph=int_grid[2])
+        groups, int_grid = self.read_intrinsic_moment_groups(cache=cache)
+        intmoms = np.concatenate(
+            (np.asarray(groups['density'], dtype=float)[..., np.newaxis],
+             groups['first_moments'],
+             groups['second_moments'],
+             groups['orbit_types']),
+            axis=-1,
+            dtype=float)
+        velscale = self.velocity_scaling_factor
+        conversion_factor = self._get_kpc_to_arcsec_factor()
+        intmoms[...,1:4] /= conversion_factor # kpc -> arcsec
+        intmoms[...,4:7] *= velscale # for velocity stretching due to M/L
+        intmoms[...,7:13] *= velscale**2.
+        int_grid[0] /= conversion_factor # kpc -> arcsec
+        return intmoms, int_grid
+
+    def _get_kpc_to_arcsec_factor(self):
+        return self.system.distMPc * 1e6 * np.tan(np.pi/648000.0) * PARSEC_KM
+
+    def _get_intrinsic_moment_scales(self):
+        """Factors converting the intrinsic moments x,...,vz*vx
+
+        Converts the spatial moments from kpc to arcsec and scales the
+        velocities for the velocity stretching due to M/L.
+
+        Returns
+        -------
+        array of length 12
+
+        """
+        velscale = self.velocity_scaling_factor
+        return np.array([1/self._get_kpc_to_arcsec_factor()]*3
+                        + [velscale]*3
+                        + [velscale**2.]*6)
+
+    def read_intrinsic_moment_groups(self, cache=True):
+        """Read the raw intrinsic moments of the orbit library, grouped
+
+        The moments of the combined (mirrored tube and box) orbit library
+        are returned as stored by the Fortran programs, i.e., in kpc and
+        km/s without the velocity scaling for M/L, see
+        ``read_orbit_intrinsic_moments`` for converted moments. If cache is
+        True, each group is stored as an uncompressed .npy file in
+        datfil/intmoms_cache/ and returned memory-mapped (read-only), so
+        that only the groups (and pages) needed are read from disk. The
+        cache is shared by all ml models of the orbit library. If the
+        orblib setting ``float32_intrinsic_moments`` is True, the moments
+        are cached with single precision.
+
+        Parameters
+        ----------
+        cache : bool, optional
+            Whether to use and create the cache. The default is True.
+
+        Returns
+        -------
+        (dict, list)
+            The dict holds the arrays ``density`` of shape
+            (n_orb, nr, nth, nph), ``first_moments``, ``second_moments``,
+            and ``orbit_types`` of shape (n_orb, nr, nth, nph, n) where the
+            final dimension indexes over x,y,z,vx,vy,vz (n=6),
+            vx^2,vy^2,vz^2,vx*vy,vy*vz,vz*vx (n=6), and the orbit
+            classification (n=3), respectively. The list contains the grid
+            bin edges over spherical (r [kpc], theta, phi).
+
+        """
+        cache_dir = self.mod_dir + 'datfil/intmoms_cache/'
+        groups = {'density': 0,
+                  'first_moments': slice(1, 7),
+                  'second_moments': slice(7, 13),
+                  'orbit_types': slice(13, 16)}
+        grid_names = ['grid_r', 'grid_th', 'grid_ph']
+        float32 = self.settings['float32_intrinsic_moments']
+        key = np.append(self._get_orblib_files_key(), float32)
+        if cache and os.path.isfile(cache_dir + 'key.npy'):
+            try:
+                if np.array_equal(np.load(cache_dir + 'key.npy'), key):
+                    intmoms = {name: np.load(f'{cache_dir}{name}.npy',
+                                             mmap_mode='r')
+                               for name in groups}
+                    int_grid = [np.load(f'{cache_dir}{name}.npy')
+                                for name in grid_names]
+                    return intmoms, int_grid
+                self.logger.debug(f'Intrinsic moments cache {cache_dir} is '
+                                  'outdated.')
+            except (OSError, ValueError) as e:
+                self.logger.warning('Could not read intrinsic moments cache '
+                                    f'{cache_dir}: {e}.')
+        intmom_tubes, int_grid = self.read_orbit_base(
+            'orblib',
+            return_intrinsic_moments=True)
+        intmom_boxes, _ = self.read_orbit_base(
+            'orblibbox',
+            return_intrinsic_moments=True)
+        # duplicate, flip, and interlace the tube orbits (as in
+        # duplicate_flip_and_interlace_intmoms) and append the box orbits
+        n_tube = 2 * len(intmom_tubes)
+        intmoms = np.empty((n_tube + len(intmom_boxes),)
+                           + intmom_boxes.shape[1:])
+        intmoms[0:n_tube:2] = intmom_tubes
+        intmoms[1:n_tube:2] = intmom_tubes
+        intmoms[1:n_tube:2,:,:,:,4:7] *= -1. # flip sign of vx, vy, vz
+        intmoms[n_tube:] = intmom_boxes
+        del intmom_tubes, intmom_boxes
+        intmoms = {name: intmoms[..., idx] for name, idx in groups.items()}
+        if cache:
+            arrays = dict(zip(grid_names, int_grid))
+            for name, group in intmoms.items():
+                arrays[name] = group.astype(np.float32) if float32 else group
+            arrays['key'] = key
+            try:
+                os.makedirs(cache_dir, exist_ok=True)
+                if os.path.isfile(cache_dir + 'key.npy'):
+                    os.remove(cache_dir + 'key.npy')
+                for name, array in arrays.items():
+                    tmp_file = f'{cache_dir}{name}.{os.getpid()}.tmp'
+                    with open(tmp_file, 'wb') as f:
+                        np.save(f, array)
+                    os.replace(tmp_file, f'{cache_dir}{name}.npy')
+            except OSError as e:
+                self.logger.warning('Could not write intrinsic moments cache '
+                                    f'{cache_dir}: {e}.')
+            else:
+                # remove the cache files of previous DYNAMITE versions
+                for f_name in 'intmoms.npz', 'int_grid.npz':
+                    if os.path.isfile(self.mod_dir + 'datfil/' + f_name):
+                        os.remove(self.mod_dir + 'datfil/' + f_name)
+                if float32:
+                    intmoms = {name: arrays[name] for name in groups}
         return intmoms, int_grid
 
-    def read_orbit_property_file_base(self, file, ncol, nrow):
+    def read_orbit_property_file_base(self, file, ncol, nrow, cache=True):
         """Base method to read in ``*orbclass.out`` files
 
         ...which hold the information of all the orbits stored in the orbit
@@ -1257,17 +3698,51 @@ class LegacyOrbitLibrary(OrbitLibrary):
 
         *** Do not try to replace this with numpy (e.g.** ``np.genfromtext`` **)
         since the output files are sometimes written in non-standard arrays
-        (in a seemingly system dependent way). ***
+        (in a seemingly system dependent way). *** Therefore, the file is
+        split into whitespace separated tokens regardless of the line
+        structure, which are converted at once.
+
+        Parameters
+        ----------
+        file : str
+            the ``*orbclass.out`` file
+        ncol : int
+            ``dithering^3``
+        nrow : int
+            ``nE * nI2 * nI3``
+        cache : bool, optional
+            If True, the parsed values are cached in a binary file next to
+            ``file`` (e.g., ``orblib.dat_orbclass.npz``), which is used as
+            long as ``file`` is unchanged. The default is True.
+
+        Returns
+        -------
+        array of shape (5, ncol, nrow)
 
         """
-        data=[]
-        lines = [line.rstrip('\n').split() for line in open(file)]
-        i = 0
-        while i < len(lines):
-            for x in lines[i]:
-                data.append(np.double(x))
-            i += 1
-        data=np.array(data)
+        cache_file = os.path.splitext(file)[0] + '.npz'
+        stat = os.stat(file)
+        key = np.array([stat.st_size, stat.st_mtime_ns], dtype=np.int64)
+        data = None
+        if cache and os.path.isfile(cache_file):
+            try:
+                with np.load(cache_file, allow_pickle=False) as cached:
+                    if np.array_equal(cached['key'], key):
+                        data = cached['data']
+            except (OSError, ValueError, KeyError) as e:
+                self.logger.warning(f'Could not read {cache_file}: {e}.')
+        if data is None:
+            with open(file, 'rb') as f:
+                data = np.array(f.read().split(), dtype=float)
+            if cache and len(data) == 5*ncol*nrow:
+                tmp_file = f'{cache_file}.{os.getpid()}.tmp'
+                try:
+                    with open(tmp_file, 'wb') as f:
+                        np.savez(f, data=data, key=key)
+                    os.replace(tmp_file, cache_file)
+                except OSError as e:
+                    self.logger.warning(f'Could not write {cache_file}: '
+                                        f'{e}.')
         if len(data) != 5*ncol*nrow:
             txt = f'{file} length mismatch - found {len(data)} entries, ' \
                   f'expected: {5*ncol*nrow}. Correct configuration file used?'
@@ -1309,9 +3784,8 @@ class LegacyOrbitLibrary(OrbitLibrary):
         orbclass=np.dstack((orbclass1,orbclass1,orbclass2))
         orbclass1a=np.copy(orbclass1)
         orbclass1a[0:3,:,:] *= -1
-        for i in range(int(0), norb):
-            orbclass[:,:,i*2]=orbclass1[:, :, i]
-            orbclass[:,:,i*2 + 1]=orbclass1a[:, :, i]
+        orbclass[:,:,0:2*norb:2] = orbclass1
+        orbclass[:,:,1:2*norb:2] = orbclass1a
         orb_properties = table.QTable()
         orb_properties['Lx'] = orbclass[0,:,:].T * u.km * u.km/u.s
         orb_properties['Ly'] = orbclass[1,:,:].T * u.km * u.km/u.s
@@ -1489,14 +3963,80 @@ class LegacyOrbitLibrary(OrbitLibrary):
         }
         self.orb_classification = orb_classification
 
-    def get_projection_tensor(self, minr=None, maxr=None, nr=50, nl=61, force_lambda_z=False, dL=1e17):
+    def get_projection_tensor(self, minr=None, maxr=None, nr=50, nl=61, force_lambda_z=False, dL=1e17, cache=True):
+        """Get the tensor projecting orbit weights into (r, lambda) space
+
+        The tensor only depends on the orbit library (not on ml) and the
+        parameters. If cache is True, it is stored in a compressed sparse
+        file ``datfil/projection_tensor_{hash}.npz``, where the hash is
+        derived from the parameters, and re-used by all models sharing the
+        orbit library as long as the ``*orbclass.out`` files are unchanged.
+
+        Parameters
+        ----------
+        minr, maxr : float, optional
+            the radial range in kpc. The default is None, i.e., the range
+            of the orbits' radii.
+        nr, nl : int, optional
+            the number of radial and circularity bins. The defaults are 50
+            and 61.
+        force_lambda_z : bool, optional
+            passed on to ``classify_orbits``. The default is False.
+        dL : float, optional
+            threshold angular momentum, see ``classify_orbits``. The
+            default is 1e17.
+        cache : bool, optional
+            Whether to use and create the cache file. The default is True.
+
+        Returns
+        -------
+        None
+            sets the attributes ``self.projection_tensor``, a
+            ``sparse.COO`` array of shape (4, nr, nl, n_bundles) for the
+            orbit types x-tube, y-tube, z-tube, and box,
+            ``self.projection_tensor_rng``, and
+            ``self.projection_tensor_pars``
+
+        """
         projection_tensor_pars = {'minr':minr,
                                   'maxr':maxr,
                                   'nr':nr,
                                   'nl':nl,
                                   'dL':dL,
                                   'force_lambda_z':force_lambda_z}
+        if getattr(self, 'projection_tensor_pars', None) == \
+                projection_tensor_pars and \
+                hasattr(self, 'projection_tensor'):
+            return
         self.projection_tensor_pars = projection_tensor_pars
+        pars_hash = hashlib.sha1(
+            repr(sorted(projection_tensor_pars.items())).encode()
+        ).hexdigest()[:16]
+        cache_file = f'{self.mod_dir}datfil/projection_tensor_{pars_hash}.npz'
+        key = []
+        for fileroot in 'orblib', 'orblibbox':
+            f_name = f'{self.mod_dir}datfil/{fileroot}.dat_orbclass.out'
+            stat = os.stat(f_name)
+            key += [stat.st_size, stat.st_mtime_ns]
+        key = np.array(key, dtype=np.int64)
+        if cache and os.path.isfile(cache_file):
+            try:
+                with np.load(cache_file, allow_pickle=False) as data:
+                    if np.array_equal(data['key'], key):
+                        self.projection_tensor = sparse.COO(
+                            data['coords'],
+                            data['data'],
+                            shape=tuple(data['shape']))
+                        self.projection_tensor_rng = {
+                            'log10_r_rng':tuple(data['log10_r_rng']),
+                            'lmd_rng':tuple(data['lmd_rng']),
+                            'tot_lmd_rng':tuple(data['tot_lmd_rng']),
+                        }
+                        self.logger.debug('Projection tensor read from '
+                                          f'{cache_file}.')
+                        return
+            except (OSError, ValueError, KeyError) as e:
+                self.logger.warning(f'Could not read {cache_file}: {e}.')
         # otherwise, continue...
         if hasattr(self, 'orb_properties') == False:
             self.read_orbit_property_file()
@@ -1550,6 +4090,19 @@ class LegacyOrbitLibrary(OrbitLibrary):
         projection = np.stack(projection)
         projection = np.moveaxis(projection, 1, 3)
         self.projection_tensor = projection
+        if cache:
+            tmp_file = f'{cache_file}.{os.getpid()}.tmp'
+            try:
+                with open(tmp_file, 'wb') as f:
+                    np.savez_compressed(f,
+                                        coords=projection.coords,
+                                        data=projection.data,
+                                        shape=projection.shape,
+                                        key=key,
+                                        **self.projection_tensor_rng)
+                os.replace(tmp_file, cache_file)
+            except OSError as e:
+                self.logger.warning(f'Could not write {cache_file}: {e}.')
 
     def get_model_intrinsic_moment_constructor(self):
         """Get a function to constrcut the model's intrinsic moments in 3D grid
@@ -1574,14 +4127,20 @@ class LegacyOrbitLibrary(OrbitLibrary):
             spatial moments in arcseconds, velocities in km/s.
 
         """
-        intmoms, int_grid = self.read_orbit_intrinsic_moments()
-        density = intmoms[:,:,:,:,0]
-        kinmoms = intmoms[:,:,:,:,1:13]
+        intmoms, int_grid = self.read_intrinsic_moment_groups()
+        int_grid[0] /= self._get_kpc_to_arcsec_factor() # kpc -> arcsec
+        density = intmoms['density']
+        # the moments are linear in the raw moments, convert them at the end
+        scales = self._get_intrinsic_moment_scales()
         def model_intrinsic_moment_constructor(weights):
             mod_density = (density.T * weights).T
             # normalise density so model sums to 1 in each (r,th,ph) bin
             mod_dens_nrm = mod_density/np.sum(mod_density, 0)
-            mod_kinmoms = np.einsum('ijklm,ijkl->jklm', kinmoms, mod_dens_nrm)
+            mod_kinmoms = np.concatenate(
+                [np.einsum('ijklm,ijkl->jklm', intmoms[name], mod_dens_nrm)
+                 for name in ('first_moments', 'second_moments')],
+                axis=-1)
+            mod_kinmoms *= scales
             # normalise density that model sums over (r,th,ph) bins to give 1
             mod_density = np.sum(mod_density, 0)
             mod_density /= np.sum(mod_density)
@@ -578,19 +578,23 @@ class ParameterGenerator(object):
         # (i) if iter>1, last iteration did not improve chi2 by min_delta_chi2
         self.status['min_delta_chi2_reached'] = False
         last_iter = np.max(self.current_models.table['which_iter'])
+        # models screened out by low-fidelity screening have no chi2
+        table = self.current_models.table[
+            self.current_models.get_unscreened_rows()]
         if last_iter > 0:
             last_chi2 = np.nan
             while np.isnan(last_chi2): # look for non-nan (kin)chi2 value
                 if last_iter <= 0:
                     return
-                mask = self.current_models.table['which_iter'] == last_iter
-                models0 = self.current_models.table[mask]
-                last_chi2 = np.nanmin(models0[self.chi2])
+                mask = table['which_iter'] == last_iter
+                models0 = table[mask]
+                if len(models0) > 0:
+                    last_chi2 = np.nanmin(models0[self.chi2])
                 last_iter -= 1
             if last_iter < 0:
                 return
-            mask = self.current_models.table['which_iter'] <= last_iter
-            models1 = self.current_models.table[mask]
+            mask = table['which_iter'] <= last_iter
+            models1 = table[mask]
             if len(models1) == 0:
                 return
             previous_chi2 = np.nanmin(models1[self.chi2])
@@ -782,17 +786,20 @@ class LegacyGridSearch(ParameterGenerator):
             # (all parameters at their .raw_value level)
             self.model_list = [[p for p in self.par_space]]
             return ###########################################################
+        # models screened out by low-fidelity screening have no chi2
+        table = self.current_models.table[
+            self.current_models.get_unscreened_rows()]
         if len(self.current_models.table) == 1: # 'first' iteration
             prop_mask = [True]
         else:
-            min_chi2 = np.nanmin(self.current_models.table[self.chi2])
+            min_chi2 = np.nanmin(table[self.chi2]) if len(table) > 0 \
+                else np.nan
             if np.isnan(min_chi2):
                 text = 'All (kin)chi2 values are nan.'
                 self.logger.error(text)
                 raise ValueError(text)
-            prop_mask = \
-                abs(self.current_models.table[self.chi2]-min_chi2)<=self.thresh
-        prop_list = self.current_models.table[prop_mask]
+            prop_mask = abs(table[self.chi2]-min_chi2)<=self.thresh
+        prop_list = table[prop_mask]
         self.model_list = []
         step_ok = True
         while step_ok and len(self.model_list) == 0:
@@ -912,8 +919,10 @@ class GridWalk(ParameterGenerator):
             if len(self.current_models.table) == 1: # 'first' iteration
                 center_idx = 0
             else:
-                # center criterion: min(chi2)
-                center_idx = np.nanargmin(self.current_models.table[self.chi2])
+                # center criterion: min(chi2) of the models not screened
+                # out by low-fidelity screening
+                center_idx = self.current_models.get_best_n_models_idx(
+                    n=1, which_chi2=self.chi2)[0]
             n_par = self.par_space.n_par
             center = list(self.current_models.table[center_idx])[:n_par]
             raw_center = self.par_space.get_raw_value_from_param_value(center)
@@ -1112,8 +1121,10 @@ class FullGrid(ParameterGenerator):
             if len(self.current_models.table) == 1: # 'first' iteration
                 center_idx = 0
             else:
-                # center criterion: min(chi2)
-                center_idx = np.nanargmin(self.current_models.table[self.chi2])
+                # center criterion: min(chi2) of the models not screened
+                # out by low-fidelity screening
+                center_idx = self.current_models.get_best_n_models_idx(
+                    n=1, which_chi2=self.chi2)[0]
             n_par = self.par_space.n_par
             center = list(self.current_models.table[center_idx])[:n_par]
             raw_center = self.par_space.get_raw_value_from_param_value(center)
@@ -607,7 +607,7 @@ class Plotter():
         # get the model LOSVDs
         orblib = model.get_orblib()
         weight_solver = model.get_weights(orblib)
-        orblib.read_losvd_histograms()
+        orblib.read_losvd_histograms(kin_sets=[0], read_intrinsic_masses=False)
         losvd_orblib = kin_set.transform_orblib_to_observables(
             orblib.losvd_histograms[0],
             None)
@@ -6,6 +6,7 @@ from astropy.io import ascii
 import subprocess
 import logging
 from scipy import optimize
+from scipy import linalg
 
 try:
     import cvxopt
@@ -15,6 +16,7 @@ except ModuleNotFoundError:
 from dynamite import analysis
 from dynamite import physical_system as physys
 from dynamite import kinematics as dyn_kin
+from dynamite import orblib as dyn_orblib
 
 
 class WeightSolver(object):
@@ -168,14 +170,10 @@ class LegacyWeightSolver(WeightSolver):
         self.fname_nn_nnls = self.direc_with_ml + 'nn_nnls.out'
         # check the format of the orbit library files
         # check == True means there are 2 orblib_* and 2 orblibbox_* files
-        # check == False means there are only two orblib files,
+        # legacy layout means there are only two orblib files,
         # orblib.dat.bz2 and orbibbox.dat.bz2 (legacy behavior)
         pth = self.direc_no_ml + 'datfil/'
-        check = os.path.isfile(f'{pth}orblib_qgrid.dat.bz2') \
-                and os.path.isfile(f'{pth}orblib_losvd_hist.dat.bz2') \
-                and os.path.isfile(f'{pth}orblibbox_qgrid.dat.bz2') \
-                and os.path.isfile(f'{pth}orblibbox_losvd_hist.dat.bz2')
-        self.legacy_files = False if check else True
+        self.legacy_files = dyn_orblib.get_orblib_layout(pth) != 'new'
         # prepare fortran input file for nnls
         self.copy_kinematic_data()
         self.create_fortran_input_nnls()
@@ -398,13 +396,19 @@ class LegacyWeightSolver(WeightSolver):
         txt_file.write('#!/bin/bash' + '\n')
         txt_file.write('# if the gzipped orbit library exist unzip it' + '\n')
         if self.legacy_files:
-            txt_file.write(f'test -e datfil/orblib_{self.ml}.dat || bunzip2 -c  datfil/orblib.dat.bz2 > datfil/orblib_{self.ml}.dat' + '\n')
-            txt_file.write(f'test -e datfil/orblibbox_{self.ml}.dat || bunzip2 -c  datfil/orblibbox.dat.bz2 > datfil/orblibbox_{self.ml}.dat' + '\n')
+            orblib_files = ['', 'box']
         else:
-            for f in '_qgrid', '_losvd_hist', 'box_qgrid', 'box_losvd_hist':
-                file_name = f'datfil/orblib{f}_{self.ml}.dat'
-                txt_file.write(f'test -e {file_name} || '
-                               f'bunzip2 -c  datfil/orblib{f}.dat.bz2 > {file_name}\n')
+            orblib_files = ['_qgrid', '_losvd_hist', 'box_qgrid', 'box_losvd_hist']
+        for f in orblib_files:
+            file_name = f'datfil/orblib{f}_{self.ml}.dat'
+            # the codec of the orbit library file is detected from its content
+            orblib_file = dyn_orblib.find_orblib_file(
+                f'{self.direc_no_ml}datfil/orblib{f}.dat')
+            codec = dyn_orblib.get_orblib_file_codec(orblib_file)
+            decompress = dyn_orblib.ORBLIB_CODECS[codec]['decompress']
+            orblib_file = 'datfil/' + os.path.basename(orblib_file)
+            txt_file.write(f'test -e {file_name} || '
+                           f'{decompress}  {orblib_file} > {file_name}\n')
         if self.system.is_bar_disk_system():
             txt_file.write(f'test -e {self.legacy_directory}/triaxnnls_bar' +
                            f' || {{ echo "File {self.legacy_directory}/triaxnnls_bar not found." && exit 127; }}\n')
@@ -605,13 +609,14 @@ class LegacyWeightSolver(WeightSolver):
 class NNLS(WeightSolver):
     """Python implementations of NNLS weight solving
 
-    Uses either scipy.optimize.nnls or cvxopt as backends. This constructs the
+    Uses either scipy.optimize.nnls, cvxopt, or an accelerated projected
+    gradient method (``FistaNonNegSolver``) as backends. This constructs the
     NNLS matrix and rhs, solves, and saves the result.
 
     Parameters
     ----------
     nnls_solver : string
-        either ``scipy`` or ``cvxopt``
+        one of ``scipy``, ``cvxopt``, or ``fista``
 
     """
     def __init__(self,
@@ -621,7 +626,8 @@ class NNLS(WeightSolver):
         self.logger = logging.getLogger(f'{__name__}.{__class__.__name__}')
         if nnls_solver is None:
             nnls_solver = self.settings['nnls_solver']
-        assert nnls_solver in ['scipy', 'cvxopt'], 'Unknown nnls_solver'
+        assert nnls_solver in ['scipy', 'cvxopt', 'fista'], \
+            'Unknown nnls_solver'
         self.nnls_solver = nnls_solver
         self.get_observed_mass_constraints()
 
@@ -651,12 +657,23 @@ class NNLS(WeightSolver):
             stars = self.system.get_unique_triaxial_visible_component()
             mge = stars.mge_lum
 
+        # the mass files are the same for all ml models of the orbit library
+        self._set_memory_cache_size()
+        key = ('nnls_observed_masses', os.path.realpath(self.direc_no_ml))
+        file_key = self._get_mass_files_key()
+        masses = dyn_orblib.orblib_cache.get(key, file_key)
+        if masses is None:
+            masses = (mge.get_intrinsic_masses_from_file(self.direc_no_ml),
+                      mge.get_projected_masses_from_file(self.direc_no_ml))
+            dyn_orblib.orblib_cache.put(key,
+                                        file_key,
+                                        masses,
+                                        sum(m.nbytes for m in masses))
+        intrinsic_masses, projected_masses = masses
         # intrinsic mass
-        intrinsic_masses = mge.get_intrinsic_masses_from_file(self.direc_no_ml)
         self.intrinsic_masses = intrinsic_masses
         self.intrinsic_mass_error = self.settings['lum_intr_rel_err']
         # projected
-        projected_masses = mge.get_projected_masses_from_file(self.direc_no_ml)
         self.projected_masses = projected_masses
         self.projected_mass_error = self.settings['sb_proj_rel_err']
         # total mass constraint
@@ -671,31 +688,98 @@ class NNLS(WeightSolver):
         # mass constraints = total mass (1) + intrinsic mass + aperture mass
         self.n_mass_constraints = 1 + n_intrinsic + n_apertures
 
-    def construct_nnls_matrix_and_rhs(self, orblib):
-        """construct nnls matrix_and rhs
+    def _set_memory_cache_size(self):
+        """Set the memory budget of the process-local ``orblib_cache``
+
+        The ml-independent NNLS constraints share the budget given in the
+        orblib setting ``losvd_memory_cache_mb`` with the decoded orbit
+        libraries.
+
+        """
+        max_mb = self.config.settings.orblib_settings['losvd_memory_cache_mb']
+        dyn_orblib.orblib_cache.set_max_bytes(int(max_mb * 2**20))
+
+    def _get_mass_files_key(self):
+        """Key identifying the MGE mass files of the orbit library
+
+        Returns
+        -------
+        1d numpy array of int64
+            the sizes and modification times of ``datfil/mass_qgrid.dat`` and
+            ``datfil/mass_aper.dat``
+
+        """
+        key = []
+        for f_name in 'mass_qgrid.dat', 'mass_aper.dat':
+            stat = os.stat(f'{self.direc_no_ml}datfil/{f_name}')
+            key += [stat.st_size, stat.st_mtime_ns]
+        return np.array(key, dtype=np.int64)
+
+    def get_ml_independent_constraints(self, orblib):
+        """Get the constraints and matrix rows not depending on ml
+
+        The observed constraints and their errors, including the observed
+        kinematics scaled by the projected masses, and the matrix rows of the
+        total, intrinsic, and projected masses, divided by their errors, are
+        the same for all ml models of an orbit library. They are kept in the
+        process-local ``dyn.orblib.orblib_cache`` (see the orblib setting
+        ``losvd_memory_cache_mb``), so that they are calculated once per
+        orbit library and process.
 
         Parameters
         ----------
         orblib : ``dyn.orblib.OrbitLibrary``
-            an orbit library
+            an orbit library with LOSVDs and masses read
 
         Returns
         -------
         tuple
-            (orbmat, rhs)
+            (con, econ, mass_rows) where con and econ are the observed
+            constraints and their errors (all constraints) and mass_rows are
+            the first ``self.n_mass_constraints`` rows of the NNLS matrix.
+            The arrays must not be modified.
 
         """
+        self._set_memory_cache_size()
+        key = ('nnls_constraints',
+               os.path.realpath(self.direc_no_ml),
+               repr(sorted(self.settings.items())))
+        file_key = np.append(self._get_mass_files_key(),
+                             orblib._get_orblib_files_key())
+        constraints = dyn_orblib.orblib_cache.get(key, file_key)
+        if constraints is not None:
+            self.logger.debug('ml-independent constraints of '
+                              f'{self.direc_no_ml} read from memory.')
+            return constraints
+        # observed kinematics and errors of all kinematic sets, scaled by the
+        # projected masses, determine the total number of constraints
+        stars = self.system.get_unique_triaxial_visible_component()
+        obs_kins_all, obs_kins_err_all = [], []
+        idx_ap_start = 0
+        for kins in stars.kinematic_data:
+            # pick out the projected masses for this kinematic set
+            n_ap = kins.n_spatial_bins  # OK for both GaussHermite & BayesLOSVD
+            idx_ap_end = idx_ap_start + n_ap
+            prj_mass_i = self.projected_masses[idx_ap_start:idx_ap_end]
+            idx_ap_start += n_ap
+            # scale observed kinematics and errors by projected masses
+            tmp = kins.get_observed_values_and_uncertainties(self.settings)
+            obs_kins, obs_kins_err = tmp
+            obs_kins_all.append(np.ravel((obs_kins.T * prj_mass_i).T))
+            obs_kins_err_all.append(np.ravel((obs_kins_err.T * prj_mass_i).T))
         # construct vector of observed constraints (con), errors (econ) and
-        # matrix or orbit propertites (orbmat)
-        con = np.zeros(self.n_mass_constraints)
-        econ = np.zeros(self.n_mass_constraints)
-        orbmat = np.zeros((self.n_mass_constraints, orblib.n_orbs))
+        # the mass rows of the matrix or orbit propertites (mass_rows)
+        con = np.concatenate([np.zeros(self.n_mass_constraints)]+obs_kins_all)
+        econ = np.concatenate([np.zeros(self.n_mass_constraints)]
+                              + obs_kins_err_all)
+        mass_rows = np.empty((self.n_mass_constraints, orblib.n_orbs),
+                             order='F')
         # total mass
         con[0] = self.total_mass
         econ[0] = self.total_mass_error
         if econ[0]<=0.0:
             econ[0] = con[0]*0.01
-        orbmat[0,:] = 1.
+        mass_rows[0,:] = 1./econ[0]
         # intrinsic mass
         idx = slice(1,1+self.n_intrinsic)
         con[idx] = np.ravel(self.intrinsic_masses)
@@ -705,47 +789,67 @@ class NNLS(WeightSolver):
         econ[idx] = np.abs(np.ravel(error))
         orb_int_masses = orblib.intrinsic_masses
         orb_int_masses = np.reshape(orb_int_masses, (orblib.n_orbs, -1))
-        orbmat[idx,:] = orb_int_masses.T
+        np.divide(orb_int_masses.T, econ[idx,np.newaxis], out=mass_rows[idx,:])
         # projected mass
         idx = slice(1+self.n_intrinsic, 1+self.n_intrinsic+self.n_apertures)
         con[idx] = self.projected_masses
         econ[idx] = np.abs(self.projected_masses * self.projected_mass_error)
-        orbmat[idx,:] = np.hstack(orblib.projected_masses).T
-        # add kinematics to con, econ, orbmat
+        np.divide(np.hstack(orblib.projected_masses).T,
+                  econ[idx,np.newaxis],
+                  out=mass_rows[idx,:])
+        constraints = con, econ, mass_rows
+        dyn_orblib.orblib_cache.put(key,
+                                    file_key,
+                                    constraints,
+                                    sum(a.nbytes for a in constraints))
+        return constraints
+
+    def construct_nnls_matrix_and_rhs(self, orblib):
+        """construct nnls matrix_and rhs
+
+        The constraints and the matrix rows are divided by the constraints'
+        errors. The matrix is allocated once in Fortran order and each block
+        of constraints is written into it already scaled, so that no copies
+        of the full matrix are made. The constraints and the mass rows are
+        shared by all ml models of the orbit library (see
+        ``get_ml_independent_constraints``), only the kinematic rows are
+        calculated for each model.
+
+        Parameters
+        ----------
+        orblib : ``dyn.orblib.OrbitLibrary``
+            an orbit library
+
+        Returns
+        -------
+        tuple
+            (orbmat, rhs)
+
+        """
+        con, econ, mass_rows = self.get_ml_independent_constraints(orblib)
+        orbmat = np.empty((len(con), orblib.n_orbs), order='F')
+        orbmat[:self.n_mass_constraints,:] = mass_rows
+        # add kinematics to orbmat
         stars = self.system.get_unique_triaxial_visible_component()
-        kins_and_orb_losvds = zip(stars.kinematic_data, orblib.losvd_histograms)
-        idx_ap_start = 0
-        for (kins, orb_losvd) in kins_and_orb_losvds:
-            # pick out the projected masses for this kinematic set
-            n_ap = kins.n_spatial_bins  # OK for both GaussHermite & BayesLOSVD
-            idx_ap_end = idx_ap_start + n_ap
-            prj_mass_i = self.projected_masses[idx_ap_start:idx_ap_end]
-            idx_ap_start += n_ap
-            # scale observed kinematics and errors by projected masses
-            tmp = kins.get_observed_values_and_uncertainties(self.settings)
-            obs_kins, obs_kins_err = tmp
-            obs_kins = (obs_kins.T * prj_mass_i).T
-            obs_kins_err = (obs_kins_err.T * prj_mass_i).T
+        idx_start = self.n_mass_constraints
+        for kins, orb_losvd in zip(stars.kinematic_data,
+                                   orblib.losvd_histograms):
             # set the first and last point in the velocity histograms to zero
             # to mimic what is done in `triaxnnnls_CRcut.f90`
-            orb_losvd.y[:,0,:] = 0.
-            orb_losvd.y[:,-1,:] = 0.
+            orb_losvd.zero_bins([0, -1])
             # transform orblib to same parameterisation as observed kinematics
             orb_kins = kins.transform_orblib_to_observables(orb_losvd,
                                                             self.settings)
             if self.CRcut:
                 # note: this only has an effect if type(kins) is GaussHermite
                 orb_kins = self.apply_CR_cut(kins, orb_losvd, orb_kins)
-            # append constraints/errors/orbits to con/econ/orbmat
-            obs_kins = np.ravel(obs_kins)
-            con = np.concatenate((con, obs_kins))
-            obs_kins_err = np.ravel(obs_kins_err)
-            econ = np.concatenate((econ, obs_kins_err))
+            # write orbits to orbmat, divided by the errors
             orb_kins = np.reshape(orb_kins, (orblib.n_orbs, -1))
-            orbmat = np.vstack((orbmat, orb_kins.T))
-        # divide constraint vector and matrix by errors
+            idx = slice(idx_start, idx_start+orb_kins.shape[1])
+            idx_start += orb_kins.shape[1]
+            np.divide(orb_kins.T, econ[idx,np.newaxis], out=orbmat[idx,:])
+        # divide constraint vector by errors
         rhs = con/econ
-        orbmat = (orbmat.T/econ).T
         return orbmat, rhs
 
     def apply_CR_cut(self, kins, orb_losvd, orb_gh):
@@ -793,6 +897,120 @@ class NNLS(WeightSolver):
         orb_gh[idx_cut[0], idx_cut[1], 0] = 3./dvhist
         return orb_gh
 
+    def get_warm_start_weights(self, n_orbs):
+        """Get the weights of the nearest solved ml model of the orbit library
+
+        Looks for the models in the all_models table which share this
+        model's orbit library and have a weights file, and returns the
+        weights of the model whose ml is closest to this model's ml. If that
+        weights file cannot be read (e.g. while another process writes it),
+        there is no warm start.
+
+        Parameters
+        ----------
+        n_orbs : int
+            The number of orbits, weights of a different length are ignored.
+
+        Returns
+        -------
+        tuple
+            (weights, directory) of the nearest ml model, (None, None) if
+            there is none.
+
+        """
+        all_models = self.config.all_models
+        model_directory = self.config.settings.io_settings['model_directory']
+        directories = [model_directory + d if d != '' else ''
+                       for d in all_models.table['directory']]
+        if self.direc_with_ml not in directories:
+            return None, None
+        model_id = directories.index(self.direc_with_ml)
+        ml = all_models.table['ml']
+        candidates = [row_id for row_id
+                      in all_models.get_orblib_rows(model_id)
+                      if row_id != model_id and directories[row_id] != ''
+                      and os.path.isfile(f'{directories[row_id]}'
+                                         'orbit_weights.ecsv')]
+        if len(candidates) == 0:
+            return None, None
+        row_id = min(candidates, key=lambda r: abs(ml[r] - ml[model_id]))
+        directory = directories[row_id]
+        try:
+            weights = ascii.read(f'{directory}orbit_weights.ecsv',
+                                 format='ecsv')['weights']
+            weights = np.array(weights, dtype=float)
+        except Exception as e:
+            self.logger.warning(f'Cannot read the weights of {directory} '
+                                f'for a warm start: {e}')
+            return None, None
+        if len(weights) != n_orbs or not np.all(np.isfinite(weights)):
+            return None, None
+        return weights, directory
+
+    def solve_warm_started(self, A, b):
+        """Solve the NNLS problem starting from a neighbouring ml model
+
+        If the weight solver setting ``warm_start`` is True, the
+        ``nnls_solver`` is ``scipy``, and a model of the same orbit library
+        with a different ml has been solved (see
+        ``get_warm_start_weights``), the NNLS problem is solved with the
+        ``ActiveSetNonNegSolver`` starting from that model's positive
+        weights. This solver uses the active set method of ``scipy``.
+        Models of the same orbit library and similar ml have similar sets of
+        orbits with positive weights, so that only few iterations are
+        needed. As the solver stores the Gram matrix ``A^T A``, problems
+        whose Gram matrix exceeds the weight solver setting
+        ``warm_start_max_gram_mb`` are left to ``scipy``.
+
+        Parameters
+        ----------
+        A : array (m, n)
+            the NNLS matrix
+        b : array (m,)
+            the NNLS rhs
+
+        Returns
+        -------
+        tuple
+            (weights, meta) where weights are None if the problem has not
+            been solved (no warm start or no convergence), and meta is a
+            dict with the telemetry of the warm start for the weights file:
+            ``warm_start_from`` (the directory of the model providing the
+            starting weights), ``nnls_iterations`` (the number of least
+            squares solves), and ``nnls_iterations_lower_bound_saved`` (an
+            estimate, not a measurement: a start at zero needs at least one
+            iteration per positive weight, so at least this many iterations
+            were saved; negative values mean that the warm start may have
+            needed more iterations than a start at zero).
+
+        """
+        if not self.settings['warm_start'] or self.nnls_solver != 'scipy':
+            return None, {}
+        gram_mb = A.shape[1]**2 * np.dtype(float).itemsize / 2**20
+        if gram_mb > self.settings['warm_start_max_gram_mb']:
+            self.logger.debug(f'No warm start for {self.direc_with_ml}: the '
+                              f'Gram matrix needs {gram_mb:.0f} MB.')
+            return None, {}
+        x0, directory = self.get_warm_start_weights(A.shape[1])
+        if x0 is None:
+            self.logger.debug(f'No warm start for {self.direc_with_ml}.')
+            return None, {}
+        solver = ActiveSetNonNegSolver(A, b, x0=x0)
+        if not solver.success:
+            self.logger.warning(f'Warm-started NNLS for {self.direc_with_ml} '
+                                f'did not converge in {solver.n_iter} '
+                                f'iterations, using {self.nnls_solver}.')
+            return None, {}
+        n_cold = np.count_nonzero(solver.beta)  # lower bound, start at 0
+        n_saved = n_cold - solver.n_iter
+        self.logger.info(f'Warm-started NNLS for {self.direc_with_ml} from '
+                         f'{directory}: {solver.n_iter} iterations, a start '
+                         f'at zero needs at least {n_cold}.')
+        meta = {'warm_start_from': directory,
+                'nnls_iterations': solver.n_iter,
+                'nnls_iterations_lower_bound_saved': int(n_saved)}
+        return solver.beta, meta
+
     def solve(self, orblib, ignore_existing_weights=False):
         """Solve for orbit weights
 
@@ -821,9 +1039,6 @@ class NNLS(WeightSolver):
         """
         self.logger.info(f"Using WeightSolver: {__class__.__name__}/"
                          f"{self.nnls_solver}")
-        orblib.read_losvd_histograms()  # sets orblib.losvd_histograms,
-                                        # orblib.intrinsic_masses, and
-                                        # orblib.projected_masses
         if (not ignore_existing_weights) and self.weight_file_exists():
             results = ascii.read(self.weight_file, format='ecsv')
             self.logger.info("NNLS solution read from existing output "
@@ -833,8 +1048,14 @@ class NNLS(WeightSolver):
             chi2_kin = results.meta['chi2_kin']
             chi2_kinmap = results.meta['chi2_kinmap']
         else:
+            orblib.read_losvd_histograms()  # sets orblib.losvd_histograms,
+                                            # orblib.intrinsic_masses, and
+                                            # orblib.projected_masses
             A, b = self.construct_nnls_matrix_and_rhs(orblib)
-            if self.nnls_solver=='scipy':
+            weights, solver_meta = self.solve_warm_started(A, b)
+            if weights is not None:
+                pass  # solved from the weights of a neighbouring ml model
+            elif self.nnls_solver=='scipy':
                 try:
                     solution = optimize.nnls(A, b)
                     weights = solution[0]
@@ -856,6 +1077,23 @@ class NNLS(WeightSolver):
                         'and chi2 set to nan. Consider trying scipy.'
                     self.logger.warning(txt)
                     weights = np.full(A.shape[1], np.nan)
+            elif self.nnls_solver=='fista':
+                solver = FistaNonNegSolver(
+                    A,
+                    b,
+                    chi2_rtol=self.settings['fista_chi2_rtol'],
+                    kkt_tol=self.settings['fista_kkt_tol'],
+                    max_iter=self.settings['fista_max_iter'])
+                weights = solver.beta
+                solver_meta = {
+                    'nnls_iterations': solver.n_iter,
+                    'nnls_kkt_residual': float(solver.kkt_residual),
+                    'nnls_converged': solver.success}
+                if not solver.success:
+                    self.logger.warning('FISTA NNLS for '
+                                        f'{self.direc_with_ml} stopped '
+                                        'before reaching fista_kkt_tol, '
+                                        'using its last iterate.')
             else:
                 text = 'Unknown nnls_solver'
                 self.logger.error(text)
@@ -873,6 +1111,7 @@ class NNLS(WeightSolver):
                 results.meta = {'chi2_tot': chi2_tot,
                                 'chi2_kin': chi2_kin,
                                 'chi2_kinmap': chi2_kinmap}
+                results.meta.update(solver_meta)
                 results.write(self.weight_file,
                               format='ascii.ecsv',
                               overwrite=True)
@@ -886,6 +1125,316 @@ class NNLS(WeightSolver):
         return weights, chi2_tot, chi2_kin, chi2_kinmap
 
 
+class ActiveSetNonNegSolver():
+    """Active set NNLS solver which can be warm-started
+
+    Solves the NNLS problem:
+        argmin ||A beta - b||
+        subject to (component-wise) beta >= 0
+
+    using the active set method of Lawson & Hanson (1974), which is also
+    used by ``scipy.optimize.nnls``. Starting from zero, the method needs at
+    least one iteration per positive component of the solution. Instead,
+    the passive set (the components allowed to be positive) can be
+    initialised with the positive components of the solution of a similar
+    problem, e.g. of a model with the same orbit library and a similar ml.
+    Each iteration solves the normal equations of the passive set, using a
+    Cholesky factorisation of the passive set's Gram matrix A^T A which is
+    updated when components are added to or removed from the passive set
+    (as in the fast NNLS of Bro & De Jong 1997). The Gram matrix A^T A and
+    A^T b are computed once, so that the solver needs p^2 floats of memory
+    in addition to A, and the iterations do not use A.
+
+    Parameters
+    ----------
+    A : array (m, p)
+        the matrix
+    b : array (m,)
+        the rhs
+    x0 : array (p,), optional
+        non-negative starting solution, its positive components initialise
+        the passive set. If None, start from zero.
+    max_iter : int, optional
+        the maximum number of iterations, default 3p
+
+    Attributes
+    ----------
+    success : bool
+        whether solver was successful
+    beta : array (p,)
+        solution
+    n_iter : int
+        the number of iterations (least squares solves)
+
+    """
+
+    def __init__(self, A=None, b=None, x0=None, max_iter=None):
+        p = A.shape[1]
+        if max_iter is None:
+            max_iter = 3 * p
+        # tolerance of the Lagrange multipliers as in Matlab's lsqnonneg
+        tol = 10 * np.finfo(float).eps * np.max(np.sum(np.abs(A), 0)) \
+              * max(A.shape)
+        self.gram = np.dot(A.T, A)
+        self.atb = np.dot(A.T, b)
+        # the passive set in the order of the columns of the Cholesky factor
+        self.idx = []
+        self.chol = np.zeros((0, 0))
+        if x0 is None:
+            x = np.zeros(p)
+        else:
+            x = np.where(x0 > 0, x0, 0.)
+        for j in np.flatnonzero(x):
+            if not self._add(j):
+                x[j] = 0.  # linearly dependent on the passive set
+        passive = x > 0
+        self.n_iter = 0
+        self.success = False
+        while self.n_iter < max_iter:
+            if np.any(passive):
+                x, passive = self._solve_passive_set(x, passive, max_iter)
+            # Lagrange multipliers of the active (zero) components
+            w = self.atb - np.dot(self.gram, x)
+            w[passive] = -np.inf
+            j = np.argmax(w)
+            if w[j] <= tol:
+                self.success = True
+                break
+            if not self._add(j):
+                break  # no progress possible
+            passive[j] = True
+        self.beta = x
+
+    def _add(self, j):
+        """Add component j to the passive set, updating the Cholesky factor
+
+        Returns False (and leaves the passive set unchanged) if column j of
+        A is numerically linearly dependent on the passive set's columns.
+
+        """
+        n = len(self.idx)
+        r = np.zeros(n)
+        if n > 0:
+            r = linalg.solve_triangular(self.chol, self.gram[self.idx, j],
+                                        trans='T', check_finite=False)
+        d2 = self.gram[j, j] - np.dot(r, r)
+        if d2 <= 100 * np.finfo(float).eps * self.gram[j, j]:
+            return False
+        chol = np.zeros((n + 1, n + 1))
+        chol[:n, :n] = self.chol
+        chol[:n, n] = r
+        chol[n, n] = np.sqrt(d2)
+        self.chol = chol
+        self.idx.append(j)
+        return True
+
+    def _remove(self, j):
+        """Remove component j from the passive set
+
+        Deleting column k of the upper triangular Cholesky factor R leaves
+        R^T R equal to the reduced Gram matrix, Givens rotations (the QR
+        update of ``scipy.linalg.qr_delete``) make it triangular again.
+
+        """
+        k = self.idx.index(j)
+        n = len(self.idx)
+        _, chol = linalg.qr_delete(np.eye(n), self.chol, k, which='col',
+                                   overwrite_qr=True, check_finite=False)
+        self.chol = chol[:n-1]
+        del self.idx[k]
+
+    def _solve_passive_set(self, x, passive, max_iter):
+        """Least squares solution for the passive set, keeping beta >= 0
+
+        Moves from the feasible ``x`` towards the least squares solution
+        ``z`` of the passive set, removing components from the passive set
+        which become zero, until ``z`` is positive.
+
+        """
+        while self.n_iter < max_iter:
+            self.n_iter += 1
+            y = linalg.solve_triangular(self.chol, self.atb[self.idx],
+                                        trans='T', check_finite=False)
+            z = np.zeros_like(x)
+            z[self.idx] = linalg.solve_triangular(self.chol, y,
+                                                  check_finite=False)
+            neg = passive & (z <= 0)
+            if not np.any(neg):
+                return z, passive
+            alpha = x[neg] / (x[neg] - z[neg])
+            x = x + np.min(alpha) * (z - x)
+            x[np.flatnonzero(neg)[np.argmin(alpha)]] = 0.
+            x[x <= 0] = 0.
+            for j in np.flatnonzero(passive & (x <= 0))[::-1]:
+                self._remove(j)
+            passive = passive & (x > 0)
+        return x, passive
+
+
+class FistaNonNegSolver():
+    """Accelerated proximal gradient (FISTA) NNLS solver
+
+    Solves the NNLS problem of ``NNLS.construct_nnls_matrix_and_rhs``:
+        argmin ||A beta - b||
+        subject to (component-wise) beta >= 0
+
+    i.e. the same problem as ``scipy`` and ``cvxopt``, with the accelerated
+    proximal gradient method FISTA (Beck & Teboulle 2009) with adaptive
+    restarts (O'Donoghue & Candes 2015). Each iteration needs one
+    (multi-threaded BLAS) matrix-vector product with the Gram matrix
+    ``A^T A`` if A has at least as many rows as columns, otherwise two
+    products with A. The columns are scaled to unit norm.
+
+    The first row of A must be the total mass constraint, i.e. all its
+    entries are equal. As its error is tiny, this row would dominate the
+    step size of gradient steps and stall the convergence. Instead, its
+    term of chi2 is minimized exactly together with the non-negativity in
+    the proximal step, a projection with a one-dimensional root search
+    (see ``_prox``). Each iterate therefore minimizes the objective of
+    ``scipy`` including the total mass row, and the solution converges to
+    the solution of ``scipy`` with decreasing ``kkt_tol``.
+
+    The solver is successful if the KKT residual falls below ``kkt_tol``.
+    It stops unsuccessfully, logging a warning, if chi2 stalls (see
+    ``chi2_rtol``) or after ``max_iter`` iterations.
+
+    Parameters
+    ----------
+    A : array (m, p)
+        the matrix
+    b : array (m,)
+        the rhs
+    chi2_rtol : float, optional
+        stop unsuccessfully if the relative change of chi2 within 10
+        iterations is smaller (chi2 stalls). The default is 1e-13.
+    kkt_tol : float, optional
+        stop successfully if the KKT residual, the norm of the proximal
+        gradient step relative to the norm of beta, is smaller. The default
+        is 1e-9.
+    max_iter : int, optional
+        the maximum number of iterations. The default is 100000.
+
+    Attributes
+    ----------
+    success : bool
+        whether solver was successful
+    beta : array (p,)
+        solution
+    n_iter : int
+        the number of iterations
+    kkt_residual : float
+        the KKT residual of the solution
+
+    """
+
+    def __init__(self,
+                 A=None,
+                 b=None,
+                 chi2_rtol=1e-13,
+                 kkt_tol=1e-9,
+                 max_iter=100000):
+        self.logger = logging.getLogger(f'{__name__}.{__class__.__name__}')
+        m, p = A.shape
+        # the total mass row, a0 * sum(beta) ~ b0
+        self.a0, self.b0 = A[0,0], b[0]
+        A1, b1 = A[1:], b[1:]  # views, A is not copied
+        self.gram = m - 1 >= p
+        if self.gram:
+            self.P = np.dot(A1.T, A1)
+            col_norm = np.sqrt(np.diag(self.P))
+        else:
+            self.A1 = A1
+            col_norm = np.sqrt(np.einsum('ij,ij->j', A1, A1))
+        # column scaling beta = d * x, columns without constraints keep 1
+        self.d = np.where(col_norm > 0, 1. / np.where(col_norm > 0,
+                                                     col_norm,
+                                                     1.), 1.)
+        if self.gram:
+            self.P *= self.d[:, np.newaxis]
+            self.P *= self.d[np.newaxis, :]
+        self.q = self.d * np.dot(A1.T, b1)
+        self.b1_sq = np.dot(b1, b1)
+        self.step = 1. / (1.05 * self._max_eigenvalue())
+        x = self._prox(np.zeros(p))
+        y = x.copy()
+        t = 1.
+        chi2 = np.inf
+        self.success = False
+        self.kkt_residual = np.inf
+        for self.n_iter in range(1, max_iter + 1):
+            x_new = self._prox(y - self.step * self._gradient(y)[0])
+            t_new = (1. + np.sqrt(1. + 4. * t * t)) / 2.
+            if np.dot(y - x_new, x_new - x) > 0:
+                # restart the momentum if it points uphill
+                t_new = 1.
+                y = x_new.copy()
+            else:
+                y = x_new + (t - 1.) / t_new * (x_new - x)
+            x, t = x_new, t_new
+            if self.n_iter % 10 == 0:
+                gradient, chi2_new = self._gradient(x)
+                chi2_new += (self.a0 * np.dot(self.d, x) - self.b0)**2
+                x_step = self._prox(x - self.step * gradient)
+                self.kkt_residual = np.linalg.norm(x - x_step) \
+                                    / max(np.linalg.norm(x), 1e-300)
+                chi2_change = abs(chi2 - chi2_new) / max(chi2_new, 1e-300)
+                chi2 = chi2_new
+                if self.kkt_residual < kkt_tol:
+                    self.success = True
+                    break
+                if chi2_change < chi2_rtol:
+                    self.logger.warning(f'FISTA: chi2 stalled after '
+                                        f'{self.n_iter} iterations, KKT '
+                                        f'residual {self.kkt_residual} >= '
+                                        f'{kkt_tol}, stopped.')
+                    break
+        else:
+            self.logger.warning(f'FISTA: no convergence in {max_iter} '
+                                f'iterations, KKT residual '
+                                f'{self.kkt_residual} >= {kkt_tol}.')
+        self.beta = self.d * x
+        self.logger.debug(f'FISTA: {self.n_iter} iterations, chi2={chi2}, '
+                          f'KKT residual {self.kkt_residual}.')
+
+    def _gradient(self, x):
+        """Gradient of chi2/2 (scaled variables) and chi2 without 1st row
+        """
+        if self.gram:
+            Px = np.dot(self.P, x)
+        else:
+            Px = self.d * np.dot(self.A1.T, np.dot(self.A1, self.d * x))
+        chi2 = np.dot(x, Px) - 2. * np.dot(self.q, x) + self.b1_sq
+        return Px - self.q, chi2
+
+    def _max_eigenvalue(self, n_iter=100):
+        """Largest eigenvalue of the scaled Gram matrix by power iteration
+        """
+        v = np.random.default_rng(42).random(len(self.d))
+        for _ in range(n_iter):
+            v = self._gradient(v)[0] + self.q
+            v /= np.linalg.norm(v)
+        return np.dot(v, self._gradient(v)[0] + self.q)
+
+    def _prox(self, v):
+        """Proximal step of the total mass row and x >= 0
+
+        Minimizes ||x - v||^2/2 + step/2 (a0 sum(d x) - b0)^2 subject to
+        x >= 0. The solution is x = max(v - lam d, 0) with the root lam of
+        lam = step a0 (a0 sum(d x) - b0), which is found by sorting v/d as
+        for a projection onto the simplex.
+        """
+        d = self.d
+        c = self.step * self.a0 * self.a0
+        ratio = v / d
+        order = np.argsort(-ratio)
+        # the root if the first k components in order are positive
+        lam = (np.cumsum((d * v)[order]) - self.b0 / self.a0) \
+              / (1. / c + np.cumsum((d * d)[order]))
+        k = np.count_nonzero(ratio[order] > lam)  # a prefix of order
+        lam_k = lam[k - 1] if k > 0 else -c * self.b0 / self.a0
+        return np.maximum(v - lam_k * d, 0.)
+
+
 class CvxoptNonNegSolver():
     """Solver for NNLS problem using CVXOPT
 